@@ -1,6 +1,36 @@
-from .base_algorithm import BaseDetectionAlgorithm
-from .five_stage_detection_algorithm import FiveStageDetectionAlgorithm
-from .four_stage_detection_algorithm import FourStageDetectionAlgorithm
-from .majority_based_detector import MajorityBasedDetector
-from .parity_based_detector import ParityBasedDetector
-from .weighted_sum_detector import WeightedSumDetector
\ No newline at end of file
+import importlib
+
+from .registry import AlgorithmRegistry
+
+# Command-line names of the detection algorithms, imported on first use
+ALGORITHMS = AlgorithmRegistry({
+    "five_stage": "algorithms.five_stage_detection_algorithm:FiveStageDetectionAlgorithm",
+    "four_stage": "algorithms.four_stage_detection_algorithm:FourStageDetectionAlgorithm",
+    "weighted_sum": "algorithms.weighted_sum_detector:WeightedSumDetector",
+    "parity_based": "algorithms.parity_based_detector:ParityBasedDetector",
+    "majority_based": "algorithms.majority_based_detector:MajorityBasedDetector",
+})
+
+# Classes importable from the package, loaded on first access
+_CLASS_MODULES = {
+    "BaseDetectionAlgorithm": ".base_algorithm",
+    "CompactedDetectionAlgorithm": ".compacted_algorithm",
+    "FiveStageDetectionAlgorithm": ".five_stage_detection_algorithm",
+    "FourStageDetectionAlgorithm": ".four_stage_detection_algorithm",
+    "MajorityBasedDetector": ".majority_based_detector",
+    "MultiRowDetectionAlgorithm": ".multi_row_detection_algorithm",
+    "ParityBasedDetector": ".parity_based_detector",
+    "WeightedSumDetector": ".weighted_sum_detector",
+}
+
+
+def __getattr__(name):
+    if name not in _CLASS_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    cls = getattr(importlib.import_module(_CLASS_MODULES[name], __name__), name)
+    globals()[name] = cls
+    return cls
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_CLASS_MODULES))
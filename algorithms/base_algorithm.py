@@ -1,15 +1,145 @@
 
+import numpy as np
+
+from utils.bit_ops import bits_to_int
+from utils.weight_patterns.base_patterns import all_zero, all_one
+from utils.weight_patterns.clear_one_patterns import explicit_last_zero
+from config.config import FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE
+
 
 class BaseDetectionAlgorithm:
+    """
+    Base of the single-check detectors (weighted-sum, parity, majority).
+
+    A subclass implements
+      - detect_fault(in_bits, weight_bits, output_sum)     one output
+      - detect_batch(in_bits, weight_values, outputs)      arrays of them
+    and inherits the stage API used by the engines. The detectors assume
+    both rows hold the same weight word, so every stage writes it to both
+    rows and drives the inputs 10, 01 and 11.
+
+    Stages:
+      1. all-zero weights
+      2. all-one weights
+      3. 1...10 weights (LSB cleared)
+    """
+
+    FAULT_TYPES = (FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE)
+
+    STAGE_PATTERNS = [[1, 0], [0, 1], [1, 1]]
+
     def __init__(self, bit_width):
         self.bit_width = bit_width
         self.detected_saf = 0
 
+        self._stage_weights = {
+            1: all_zero(bit_width)[0],
+            2: all_one(bit_width)[0],
+            3: explicit_last_zero(bit_width)[0],
+        }
+
+        self.detected_faults = {fault_type: 0 for fault_type in self.FAULT_TYPES}
+        self.detected_faults["UNKNOWN"] = 0
+
     def detect_fault(self, *args, **kwargs):
         raise NotImplementedError
 
-    def get_required_stages(self):
+    def detect_batch(self, in_bits, weight_values, outputs):
+        """
+        Vectorised detect_fault.
+
+        in_bits:       (N, 2) input bits
+        weight_values: (N,) weight integers (LSB-first weight_bits as int)
+        outputs:       (N,) observed sums
+        Returns an (N,) int array: index into FAULT_TYPES, or -1.
+        """
         raise NotImplementedError
 
     def get_weight_patterns(self):
-        raise NotImplementedError
+        return [self._stage_weights[s] for s in sorted(self._stage_weights)]
+
+    # ------------------------------------------------------------------
+    # Stage control API (used by main_engine)
+    # ------------------------------------------------------------------
+    def get_required_stages(self) -> int:
+        """Total number of stages."""
+        return len(self._stage_weights)
+
+    def get_stage_patterns(self, stage_id: int):
+        """Input patterns [in_R1, in_R2] of a stage (the same for every stage)."""
+        if stage_id not in self._stage_weights:
+            raise ValueError(f"Unknown stage_id {stage_id}")
+        return [list(p) for p in self.STAGE_PATTERNS]
+
+    def get_stage_weights(self, stage_id: int):
+        """(row1_weights, row2_weights) of a stage: one word written to both rows."""
+        if stage_id not in self._stage_weights:
+            raise ValueError(f"Unknown stage_id {stage_id}")
+        weights = self._stage_weights[stage_id]
+        return weights, weights
+
+    def observe(self, stage_id, in_patterns, outputs):
+        result = self.analyze_stage_output(stage_id, in_patterns, outputs)
+
+        if result["detected"]:
+            self._increment_fault_counter(result["fault_type"])
+
+        return result
+
+    def analyze_stage_output(self, stage_id: int, in_patterns, outputs):
+        """detect_fault() on every pattern of the stage; the first detection wins."""
+        weight_bits = self.get_stage_weights(stage_id)[0]
+
+        for p, (in_bits, output_sum) in enumerate(zip(in_patterns, outputs)):
+            result = self.detect_fault(in_bits, weight_bits, output_sum)
+            if result["detected"]:
+                result["reason"] = f"Stage{stage_id} pattern {p}: {result['reason']}"
+                return result
+
+        return self._no_fault(f"Stage{stage_id}: outputs consistent")
+
+    # ------------------------------------------------------------------
+    # Batch analysis API (used by vectorized_engine)
+    # ------------------------------------------------------------------
+    def detect_stage_batch(self, stage_id: int, in_patterns, outputs):
+        """
+        analyze_stage_output for many faults at once.
+
+        outputs: (F, P) sums, one row per fault.
+        Returns an (F,) int array: FAULT_TYPES index of the first detecting
+        pattern of each fault, or -1.
+        """
+        outputs = np.asarray(outputs)
+        num_faults, num_patterns = outputs.shape
+        weight_value = bits_to_int(self.get_stage_weights(stage_id)[0])
+
+        in_bits = np.tile(np.asarray(in_patterns, dtype=np.int64), (num_faults, 1))
+        weights = np.full(num_faults * num_patterns, weight_value, dtype=outputs.dtype)
+        codes = self.detect_batch(in_bits, weights, outputs.reshape(-1)).reshape(num_faults, num_patterns)
+
+        hit = codes >= 0
+        first = np.argmax(hit, axis=1)
+        return np.where(hit.any(axis=1), codes[np.arange(num_faults), first], -1)
+
+    def observe_batch(self, stage_id, codes):
+        """Update detected_faults for a batch of detect_stage_batch codes (>= 0)."""
+        counts = np.bincount(np.asarray(codes, dtype=np.int64), minlength=len(self.FAULT_TYPES))
+        for code, count in enumerate(counts.tolist()):
+            if count:
+                self._increment_fault_counter(self.FAULT_TYPES[code], count)
+
+    # ------------------------------------------------------------------
+    # Utility
+    # ------------------------------------------------------------------
+    def _increment_fault_counter(self, key, count=1):
+        if key not in self.detected_faults:
+            self.detected_faults[key] = 0
+        self.detected_faults[key] += count
+
+    def _no_fault(self, reason: str):
+        return {
+            "detected": False,
+            "fault_type": None,
+            "location": None,
+            "reason": reason,
+        }
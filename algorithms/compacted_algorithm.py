@@ -0,0 +1,152 @@
+import numpy as np
+
+from utils.bit_ops import bits_to_int
+
+
+class CompactedDetectionAlgorithm:
+    """
+    Detection algorithm driven by a fixed stage table.
+
+    Subclasses (written by main.compaction) set:
+      BIT_WIDTH  the weight width the table was compacted for
+      STAGES     list of (in_patterns, row1_weights, row2_weights)
+
+    A stage flags a fault when any output differs from the fault-free sum;
+    the first deviating pattern is classified as
+      SA1     some row active, sum too high by a power of two
+      SA0     some row active, sum too low by a power of two
+      BRIDGE  anything else
+    A single stuck bit moves the sum by 2^k whether one or both rows are
+    driven (a bridge never changes the inputs 11), so the [1, 1] patterns
+    compaction favours still diagnose SAFs.
+    """
+
+    BIT_WIDTH = None
+    STAGES = []
+
+    FAULT_TYPES = ("SA1", "SA0", "BRIDGE")
+
+    def __init__(self, bit_width: int):
+        if self.BIT_WIDTH is not None and bit_width != self.BIT_WIDTH:
+            raise ValueError(
+                f"{self.__class__.__name__} was compacted for bit_width={self.BIT_WIDTH}, got {bit_width}"
+            )
+        self.bit_width = bit_width
+
+        self._expected = [
+            [x1 * bits_to_int(w1) + x2 * bits_to_int(w2) for x1, x2 in patterns]
+            for patterns, w1, w2 in self.STAGES
+        ]
+
+        self.detected_faults = {
+            "SA1": 0,
+            "SA0": 0,
+            "BRIDGE": 0,
+            "UNKNOWN": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Stage control API (used by main_engine)
+    # ------------------------------------------------------------------
+    def get_required_stages(self) -> int:
+        """Total number of stages."""
+        return len(self.STAGES)
+
+    def get_stage_patterns(self, stage_id: int):
+        """Return list of input patterns (each [in_R1, in_R2]) for a stage."""
+        return [list(p) for p in self._stage(stage_id)[0]]
+
+    def get_stage_weights(self, stage_id: int):
+        """Return (row1_weights, row2_weights) bit-vectors for a stage."""
+        _, row1, row2 = self._stage(stage_id)
+        return list(row1), list(row2)
+
+    def observe(self, stage_id, in_patterns, outputs):
+        result = self.analyze_stage_output(stage_id, in_patterns, outputs)
+
+        if result["detected"]:
+            self._increment_fault_counter(result["fault_type"])
+
+        return result
+
+    def analyze_stage_output(self, stage_id: int, in_patterns, outputs):
+        expected = self._expected[stage_id - 1]
+
+        for p, (in_bits, observed) in enumerate(zip(in_patterns, outputs)):
+            if observed != expected[p]:
+                ftype = self.FAULT_TYPES[self._classify(sum(in_bits), observed - expected[p])]
+                return self._yes(
+                    ftype,
+                    f"stage{stage_id} pattern {p}",
+                    f"Stage{stage_id}: pattern {p} sum={observed}, expected {expected[p]}"
+                )
+
+        return self._no_fault(f"Stage{stage_id}: outputs match")
+
+    # ------------------------------------------------------------------
+    # Batch analysis API (used by vectorized_engine)
+    # ------------------------------------------------------------------
+    def detect_stage_batch(self, stage_id: int, in_patterns, outputs):
+        """
+        analyze_stage_output for an (F, P) array of sums.
+        Returns an (F,) int array: FAULT_TYPES index, or -1.
+        """
+        outputs = np.asarray(outputs)
+        expected = np.array(self._expected[stage_id - 1], dtype=outputs.dtype)
+        deviation = outputs - expected
+        hit = deviation != 0
+
+        num_faults = len(outputs)
+        first = np.argmax(hit, axis=1)
+        detected = hit.any(axis=1)
+        diff = deviation[np.arange(num_faults), first]
+        active = np.asarray(in_patterns, dtype=np.int64).sum(axis=1)[first]
+
+        codes = np.full(num_faults, -1, dtype=np.int64)
+        for k in np.flatnonzero(detected).tolist():
+            codes[k] = self._classify(int(active[k]), int(diff[k]))
+        return codes
+
+    def observe_batch(self, stage_id, codes):
+        """Update detected_faults for a batch of detect_stage_batch codes (>= 0)."""
+        counts = np.bincount(np.asarray(codes, dtype=np.int64), minlength=len(self.FAULT_TYPES))
+        for code, count in enumerate(counts.tolist()):
+            if count:
+                self._increment_fault_counter(self.FAULT_TYPES[code], count)
+
+    # ------------------------------------------------------------------
+    # Utility
+    # ------------------------------------------------------------------
+    def _stage(self, stage_id):
+        if not 1 <= stage_id <= len(self.STAGES):
+            raise ValueError(f"Unknown stage_id {stage_id}")
+        return self.STAGES[stage_id - 1]
+
+    @staticmethod
+    def _classify(active_rows, diff):
+        """FAULT_TYPES index of a deviating output."""
+        magnitude = abs(diff)
+        if active_rows and magnitude & (magnitude - 1) == 0:
+            return 0 if diff > 0 else 1
+        return 2
+
+    def _increment_fault_counter(self, key, count=1):
+        if key not in self.detected_faults:
+            self.detected_faults[key] = 0
+        self.detected_faults[key] += count
+
+    def _no_fault(self, reason: str):
+        return {
+            "detected": False,
+            "fault_type": None,
+            "location": None,
+            "reason": reason,
+        }
+
+    def _yes(self, fault_type, location, reason):
+        return {
+            "detected": True,
+            "fault_type": fault_type,
+            "location": location,
+            "reason": reason
+        }
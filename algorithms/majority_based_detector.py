@@ -1,3 +1,6 @@
+import numpy as np
+
+from utils.bit_ops import popcount, bit_length
 from .base_algorithm import BaseDetectionAlgorithm
 from config.config import FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE
 
@@ -22,3 +25,24 @@ class MajorityBasedDetector(BaseDetectionAlgorithm):
             }
 
         return {"detected": False, "fault_type": None, "location": None, "reason": "Majority consistent"}
+
+    def detect_batch(self, in_bits, weight_values, outputs):
+        """
+        Same comparison as detect_fault without string formatting: the
+        zfill'ed binary strings are MSB-aligned and zip() stops at the
+        shorter one, so the top min(len) bits of both sums are compared.
+        """
+        in_bits = np.asarray(in_bits)
+        outputs = np.asarray(outputs)
+        expected = (in_bits[:, 0] + in_bits[:, 1]) * np.asarray(weight_values)
+
+        expected_len = np.maximum(bit_length(expected), self.bit_width)
+        output_len = np.maximum(bit_length(outputs), self.bit_width)
+        common = np.minimum(expected_len, output_len)
+
+        mismatches = popcount((expected >> (expected_len - common)) ^ (outputs >> (output_len - common)))
+
+        codes = np.where(in_bits[:, 0] != in_bits[:, 1],
+                         self.FAULT_TYPES.index(FAULT_TYPE_BRIDGE),
+                         self.FAULT_TYPES.index(FAULT_TYPE_SAF))
+        return np.where(mismatches > self.bit_width // 2, codes, -1)
@@ -0,0 +1,198 @@
+import numpy as np
+from math import log2
+from utils.bit_ops import bits_to_int
+from utils.weight_patterns.base_patterns import all_zero, all_one
+from utils.weight_patterns.clear_one_patterns import clear_one, explicit_last_zero
+from config.config import NUM_ROW, NUM_COL
+
+
+class MultiRowDetectionAlgorithm:
+    """
+    N-row x M-column generalisation of the five-stage algorithm.
+
+    Stages:
+      1. SA1 on every row   (one-hot inputs, all-zero weights)
+      2. SA0 on every row   (one-hot inputs, all-one weights)
+      3. Bridging r<->r+1   (inputs 01, 10, 11 on each adjacent pair,
+                             rows alternating the five-stage bridge weights)
+
+    Every column stores the same weights and is observed separately, so a
+    weight fault is located by the (pattern, column) that shows it.
+
+    Two interfaces are offered:
+      - observe / analyze_stage_output  (single column, used by main_engine)
+      - get_stage_active_rows / analyze_stage_batch / observe_batch
+        (sparse, used by macro_engine)
+    """
+
+    FAULT_TYPES = ("SA1", "SA0", "BRIDGE")
+
+    def __init__(self, bit_width: int, num_rows: int = NUM_ROW, num_cols: int = NUM_COL):
+        self.bit_width = bit_width
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        # cache base patterns (single vectors)
+        self._all_zero = all_zero(bit_width)[0]
+        self._all_one = all_one(bit_width)[0]
+        self._bridge_r1 = clear_one(bit_width)[0]
+        self._bridge_r2 = explicit_last_zero(bit_width)[0]
+
+        self.detected_faults = {
+            "SA1": 0,
+            "SA0": 0,
+            "BRIDGE": 0,
+            "UNKNOWN": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Stage control API
+    # ------------------------------------------------------------------
+    def get_required_stages(self) -> int:
+        """Total number of stages."""
+        return 3
+
+    def get_stage_active_rows(self, stage_id: int):
+        """
+        Input patterns of a stage, each given as the tuple of rows driven
+        to 1 (sparse form of get_stage_patterns).
+        """
+        if stage_id in (1, 2):
+            return [(r,) for r in range(self.num_rows)]
+        if stage_id == 3:
+            rows = []
+            for r in range(self.num_rows - 1):
+                rows += [(r + 1,), (r,), (r, r + 1)]     # 01, 10, 11
+            return rows
+        raise ValueError(f"Unknown stage_id {stage_id}")
+
+    def get_stage_patterns(self, stage_id: int):
+        """
+        Return list of input patterns (each [in_R1, ..., in_RN]) for a stage.
+        """
+        patterns = []
+        for rows in self.get_stage_active_rows(stage_id):
+            in_bits = [0] * self.num_rows
+            for r in rows:
+                in_bits[r] = 1
+            patterns.append(in_bits)
+        return patterns
+
+    def get_stage_weights(self, stage_id: int):
+        """
+        Return one *logical* weight bit-vector per row (same in every column).
+        """
+        if stage_id == 1:
+            return [self._all_zero] * self.num_rows
+        if stage_id == 2:
+            return [self._all_one] * self.num_rows
+        if stage_id == 3:
+            return [
+                self._bridge_r1 if r % 2 == 0 else self._bridge_r2
+                for r in range(self.num_rows)
+            ]
+        raise ValueError(f"Unknown stage_id {stage_id}")
+
+    # ------------------------------------------------------------------
+    # Batch analysis API (used by macro_engine)
+    #
+    # observed / expected: one entry per (fault, pattern, column) whose
+    # sum deviates from the fault-free value.
+    #
+    # Returns an int array: index into FAULT_TYPES, or -1 if the entry
+    # does not flag a fault.
+    # ------------------------------------------------------------------
+    def analyze_stage_batch(self, stage_id: int, observed, expected):
+        observed = np.asarray(observed)
+        expected = np.asarray(expected)
+        codes = np.full(len(observed), -1, dtype=np.int64)
+        deviates = observed != expected
+
+        if stage_id == 1:
+            # all-zero weights: a single SA1 at bit k adds 2^k
+            single = (observed > 0) & ((observed & (observed - 1)) == 0)
+            codes[deviates & single] = self.FAULT_TYPES.index("SA1")
+        elif stage_id == 2:
+            # all-one weights: a single SA0 at bit k removes 2^k
+            missing = expected - observed
+            single = (missing > 0) & ((missing & (missing - 1)) == 0)
+            codes[deviates & single] = self.FAULT_TYPES.index("SA0")
+        elif stage_id == 3:
+            codes[deviates] = self.FAULT_TYPES.index("BRIDGE")
+
+        return codes
+
+    def observe_batch(self, stage_id, codes):
+        """
+        Update detected_faults for a batch of newly detected faults,
+        given their analyze_stage_batch codes.
+        """
+        counts = np.bincount(np.asarray(codes, dtype=np.int64), minlength=len(self.FAULT_TYPES))
+        for code, count in enumerate(counts.tolist()):
+            if count:
+                self._increment_fault_counter(self.FAULT_TYPES[code], count)
+
+    # ------------------------------------------------------------------
+    # Single-column API (used by main_engine)
+    # ------------------------------------------------------------------
+    def observe(self, stage_id, in_patterns, outputs):
+        result = self.analyze_stage_output(stage_id, in_patterns, outputs)
+
+        if result["detected"]:
+            self._increment_fault_counter(result["fault_type"])
+
+        return result
+
+    def analyze_stage_output(self, stage_id: int, in_patterns, outputs):
+        weights = [bits_to_int(w) for w in self.get_stage_weights(stage_id)]
+        expected = [
+            sum(w for x, w in zip(in_bits, weights) if x) for in_bits in in_patterns
+        ]
+
+        codes = self.analyze_stage_batch(
+            stage_id, np.array(outputs, dtype=object), np.array(expected, dtype=object)
+        )
+        hits = np.flatnonzero(codes >= 0)
+        if hits.size == 0:
+            return self._no_fault(f"Stage{stage_id}: outputs match")
+
+        p = int(hits[0])
+        ftype = self.FAULT_TYPES[codes[p]]
+        return self._yes(
+            ftype,
+            self.locate(stage_id, p, outputs[p], expected[p]),
+            f"Stage{stage_id}: pattern {p} sum={outputs[p]}, expected {expected[p]}"
+        )
+
+    def locate(self, stage_id, pattern_idx, observed, expected, col=0):
+        """Human-readable location of a flagged (pattern, column) entry."""
+        if stage_id == 1:
+            return f"R{pattern_idx + 1} C{col} weight[{int(log2(observed))}]"
+        if stage_id == 2:
+            return f"R{pattern_idx + 1} C{col} weight[{int(log2(expected - observed))}]"
+        pair = pattern_idx // 3          # three bridging patterns per pair
+        return f"R{pair + 1}-R{pair + 2}"
+
+    # ------------------------------------------------------------------
+    # Utility
+    # ------------------------------------------------------------------
+    def _increment_fault_counter(self, key, count=1):
+        if key not in self.detected_faults:
+            self.detected_faults[key] = 0
+        self.detected_faults[key] += count
+
+    def _no_fault(self, reason: str):
+        return {
+            "detected": False,
+            "fault_type": None,
+            "location": None,
+            "reason": reason,
+        }
+
+    def _yes(self, fault_type, location, reason):
+        return {
+            "detected": True,
+            "fault_type": fault_type,
+            "location": location,
+            "reason": reason
+        }
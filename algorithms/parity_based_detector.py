@@ -1,3 +1,6 @@
+import numpy as np
+
+from utils.bit_ops import popcount
 from .base_algorithm import BaseDetectionAlgorithm
 from config.config import FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE
 
@@ -16,3 +19,14 @@ class ParityBasedDetector(BaseDetectionAlgorithm):
             }
 
         return {"detected": False, "fault_type": None, "location": None, "reason": "Parity consistent"}
+
+    def detect_batch(self, in_bits, weight_values, outputs):
+        in_bits = np.asarray(in_bits)
+        input_parity = (in_bits[:, 0] ^ in_bits[:, 1]).astype(np.int64)
+        weight_parity = popcount(weight_values) % 2
+        output_parity = (np.asarray(outputs) % 2).astype(np.int64)
+
+        codes = np.where(input_parity == 1,
+                         self.FAULT_TYPES.index(FAULT_TYPE_BRIDGE),
+                         self.FAULT_TYPES.index(FAULT_TYPE_SAF))
+        return np.where(output_parity != (input_parity ^ weight_parity), codes, -1)
@@ -0,0 +1,51 @@
+import importlib
+from collections.abc import Mapping
+
+
+class AlgorithmRegistry(Mapping):
+    """
+    Name -> detection algorithm class, imported on first use.
+
+    Entries are "package.module:ClassName" specs (or classes). Iterating
+    the names (argparse choices, listings) imports nothing; looking one up
+    imports just that module.
+    """
+
+    def __init__(self, specs=None):
+        self._specs = dict(specs or {})
+        self._classes = {}
+        self._plans = {}
+
+    def register(self, name, spec):
+        """Add or replace an entry; spec is "module:Class" or a class."""
+        self._specs[name] = spec
+        self._classes.pop(name, None)
+        self._plans = {key: plan for key, plan in self._plans.items() if key[0] != name}
+
+    def __getitem__(self, name):
+        if name not in self._classes:
+            spec = self._specs[name]
+            if isinstance(spec, str):
+                module_name, _, class_name = spec.partition(":")
+                spec = getattr(importlib.import_module(module_name), class_name)
+            self._classes[name] = spec
+        return self._classes[name]
+
+    def __iter__(self):
+        return iter(self._specs)
+
+    def __len__(self):
+        return len(self._specs)
+
+    def stage_plan(self, name, bit_width):
+        """
+        Golden table (patterns, weights, weight integers and expected sums
+        per stage) of an algorithm at bit_width. Built or loaded from the
+        on-disk golden cache once, then served from memory without
+        re-deriving the plan or its key.
+        """
+        key = (name, bit_width)
+        if key not in self._plans:
+            from main.golden_cache import get_golden_table
+            self._plans[key] = get_golden_table(self[name](bit_width), bit_width)
+        return self._plans[key]
@@ -1,3 +1,5 @@
+import numpy as np
+
 from .base_algorithm import BaseDetectionAlgorithm
 from config.config import FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE
 
@@ -22,3 +24,13 @@ class WeightedSumDetector(BaseDetectionAlgorithm):
             }
 
         return {"detected": False, "fault_type": None, "location": None, "reason": "No mismatch"}
+
+    def detect_batch(self, in_bits, weight_values, outputs):
+        in_bits = np.asarray(in_bits)
+        weight_values = np.asarray(weight_values)
+        diff = np.asarray(outputs) - (in_bits[:, 0] + in_bits[:, 1]) * weight_values
+
+        codes = np.where(abs(diff) > weight_values // 2,
+                         self.FAULT_TYPES.index(FAULT_TYPE_BRIDGE),
+                         self.FAULT_TYPES.index(FAULT_TYPE_SAF))
+        return np.where(diff != 0, codes, -1).astype(np.int64)
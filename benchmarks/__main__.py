@@ -0,0 +1,53 @@
+import argparse
+import json
+import sys
+
+from algorithms import ALGORITHMS
+from benchmarks.suite import (
+    BENCH_FAULT_MODES, BENCH_OUTPUT, BENCH_WIDTHS, compare_results, print_comparison, run_benchmarks
+)
+from config.config import FAULT_MODES
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Fault-simulation throughput benchmarks, or comparison of two saved runs."
+    )
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two result files instead of running; exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown counted as a regression (default: 0.10)")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--widths", nargs="+", type=int, default=list(BENCH_WIDTHS))
+    parser.add_argument("--fault-modes", nargs="+", choices=FAULT_MODES, default=list(BENCH_FAULT_MODES))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, best is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory runs")
+    parser.add_argument("--no-campaigns", action="store_true")
+    parser.add_argument("--no-micro", action="store_true")
+    parser.add_argument("--output", default=BENCH_OUTPUT, help=f"results JSON (default: {BENCH_OUTPUT})")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as fh:
+            baseline = json.load(fh)
+        with open(args.compare[1]) as fh:
+            current = json.load(fh)
+        rows = compare_results(baseline, current, args.threshold)
+        print_comparison(rows)
+        sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+    run_benchmarks(
+        {name: ALGORITHMS[name] for name in args.algorithms},
+        args.widths,
+        args.fault_modes,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        campaigns=not args.no_campaigns,
+        micro=not args.no_micro,
+        output=args.output,
+    )
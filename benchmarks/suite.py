@@ -0,0 +1,256 @@
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+
+from algorithms import ALGORITHMS
+from config.config import FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE, FAULT_TYPE_COUPLING
+from main.fault_classes import Fault
+from main.fault_injection import inject_fault
+from main.golden_cache import build_golden_table
+from main.main_engine import generate_fault_list, main_engine, row_value
+from utils.weight_patterns import WeightPatternGenerator
+
+BENCH_FORMAT_VERSION = 1
+BENCH_WIDTHS = (4, 8, 16, 32, 64)
+BENCH_FAULT_MODES = ("SAF", "BRIDGE", "COUPLING")
+BENCH_OUTPUT = "benchmark_results.json"
+
+# Metrics compared between runs, and whether higher is better
+COMPARED_METRICS = {
+    "faults_per_sec": True,
+    "peak_memory_bytes": False,
+    "ns_per_call": False,
+}
+
+
+def has_stage_api(algo):
+    try:
+        algo.get_required_stages()
+    except (AttributeError, NotImplementedError):
+        return False
+    return True
+
+
+# ----------------------------------------------------------------------
+# Campaign benchmarks
+# ----------------------------------------------------------------------
+class StageTimer:
+    """
+    Transparent algorithm wrapper that times main_engine's stage loop.
+
+    simulate_fault asks for a stage's patterns first and hands the outputs
+    to observe() last, so everything in between (fault injection, sums,
+    analysis) is charged to that stage.
+    """
+
+    def __init__(self, algo):
+        self._algo = algo
+        self._start = None
+        self.stage_seconds = {}
+        self.stage_faults = {}
+
+    def __getattr__(self, name):
+        return getattr(self._algo, name)
+
+    def get_stage_patterns(self, stage_id):
+        self._start = time.perf_counter()
+        return self._algo.get_stage_patterns(stage_id)
+
+    def observe(self, stage_id, in_patterns, outputs):
+        result = self._algo.observe(stage_id, in_patterns, outputs)
+        elapsed = time.perf_counter() - self._start
+        self.stage_seconds[stage_id] = self.stage_seconds.get(stage_id, 0.0) + elapsed
+        self.stage_faults[stage_id] = self.stage_faults.get(stage_id, 0) + 1
+        return result
+
+
+def bench_campaign(algo_cls, bit_width, fault_mode, repeat=3, memory=True):
+    """
+    Best-of-`repeat` main_engine run (reference path, quiet) on one universe.
+    Peak memory comes from a separate tracemalloc run, so it does not
+    slow down the timed ones.
+    """
+    best = None
+
+    for _ in range(repeat):
+        timer = StageTimer(algo_cls(bit_width))
+        fault_list = generate_fault_list(bit_width, fault_mode=fault_mode)
+
+        start = time.perf_counter()
+        main_engine(bit_width, timer, fault_list=fault_list, silent=True)
+        seconds = time.perf_counter() - start
+
+        if best is None or seconds < best[0]:
+            best = (seconds, timer, len(fault_list))
+
+    seconds, timer, num_faults = best
+    result = {
+        "num_faults": num_faults,
+        "seconds": seconds,
+        "faults_per_sec": num_faults / seconds if seconds > 0 else None,
+        "stage_seconds": {str(k): v for k, v in sorted(timer.stage_seconds.items())},
+        "stage_faults": {str(k): v for k, v in sorted(timer.stage_faults.items())},
+        "detected_faults": dict(timer.detected_faults),
+    }
+
+    if memory:
+        tracemalloc.start()
+        main_engine(bit_width, algo_cls(bit_width), fault_list=generate_fault_list(bit_width, fault_mode=fault_mode),
+                    silent=True)
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result
+
+
+# ----------------------------------------------------------------------
+# Microbenchmarks
+# ----------------------------------------------------------------------
+def time_call(fn, repeat=3):
+    """Nanoseconds per call of fn(), best of `repeat` autoranged loops."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def micro_cases(bit_width, algorithms):
+    """(name, fn) pairs for the hot-path helpers at one bit_width."""
+    zeros = [0] * bit_width
+    ones = [1] * bit_width
+    saf = Fault(FAULT_TYPE_SAF, (1, bit_width - 1), 0)
+    bridge = Fault(FAULT_TYPE_BRIDGE, i=0, j=1, bridge_type=0)
+    coupling = Fault(FAULT_TYPE_COUPLING, aggr_row=1, aggr_bit=0, victim_bit=bit_width - 1,
+                     transition="0->1", prev_bits=zeros, curr_bits=ones)
+    generator = WeightPatternGenerator(bit_width)
+
+    cases = [
+        ("inject_fault[SAF]", lambda: inject_fault([1, 0], ones, saf, row_id=1)),
+        ("inject_fault[BRIDGE]", lambda: inject_fault([1, 0], ones, bridge, row_id=1)),
+        ("inject_fault[COUPLING]", lambda: inject_fault([1, 0], ones, coupling, row_id=2)),
+        ("row_value", lambda: row_value(ones, bit_width)),
+        ("WeightPatternGenerator.generate", generator.generate),
+    ]
+
+    for name, algo_cls in algorithms.items():
+        algo = algo_cls(bit_width)
+        if not has_stage_api(algo):
+            continue
+        stages = build_golden_table(algo, bit_width)["stages"]
+
+        def analyze_all(algo=algo, stages=stages):
+            for stage_id, stage in stages.items():
+                algo.analyze_stage_output(stage_id, stage["patterns"], stage["expected"])
+
+        cases.append((f"analyze_stage_output[{name}]", analyze_all))
+
+    return cases
+
+
+# ----------------------------------------------------------------------
+# Suite
+# ----------------------------------------------------------------------
+def run_benchmarks(algorithms=None, bit_widths=BENCH_WIDTHS, fault_modes=BENCH_FAULT_MODES,
+                   repeat=3, memory=True, campaigns=True, micro=True, output=BENCH_OUTPUT):
+    """
+    Run the campaign and micro benchmarks and return the results dict,
+    also written as JSON to `output` (None = not written).
+
+    algorithms: {name: class}, default every entry of algorithms.ALGORITHMS;
+                those without the stage API are listed under "skipped".
+    """
+    algorithms = algorithms or ALGORITHMS
+    results = {
+        "format": BENCH_FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "campaigns": [],
+        "micro": [],
+        "skipped": [],
+    }
+
+    if campaigns:
+        for name, algo_cls in algorithms.items():
+            if not has_stage_api(algo_cls(bit_widths[0])):
+                results["skipped"].append(name)
+                continue
+            for bit_width in bit_widths:
+                for fault_mode in fault_modes:
+                    entry = {"algorithm": name, "bit_width": bit_width, "fault_mode": fault_mode}
+                    entry.update(bench_campaign(algo_cls, bit_width, fault_mode, repeat, memory))
+                    results["campaigns"].append(entry)
+                    print(f"  {name:<16} w={bit_width:<4} {fault_mode:<8} "
+                          f"{entry['num_faults']:>7} faults  {entry['faults_per_sec']:>12,.0f} faults/s")
+
+    if micro:
+        for bit_width in bit_widths:
+            for name, fn in micro_cases(bit_width, algorithms):
+                ns = time_call(fn, repeat)
+                results["micro"].append({"name": name, "bit_width": bit_width, "ns_per_call": ns})
+                print(f"  {name:<40} w={bit_width:<4} {ns:>12,.0f} ns/call")
+
+    if output:
+        with open(output, "w") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"Results written to {output}")
+
+    return results
+
+
+# ----------------------------------------------------------------------
+# Comparison
+# ----------------------------------------------------------------------
+def _entries(results):
+    """{(kind, key...): entry} of a results dict."""
+    entries = {}
+    for e in results.get("campaigns", []):
+        entries[("campaign", e["algorithm"], e["bit_width"], e["fault_mode"])] = e
+    for e in results.get("micro", []):
+        entries[("micro", e["name"], e["bit_width"])] = e
+    return entries
+
+
+def compare_results(baseline, current, threshold=0.10):
+    """
+    Metric-by-metric comparison of two run_benchmarks() results.
+
+    Returns a list of rows {"key", "metric", "baseline", "current",
+    "change", "regression"}; change is the relative improvement (positive
+    = better), and a row is a regression when it got worse by more than
+    `threshold`. Entries missing from either run are left out.
+    """
+    base_entries = _entries(baseline)
+    rows = []
+
+    for key, entry in _entries(current).items():
+        base = base_entries.get(key)
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base.get(metric), entry.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old if higher_is_better else (old - new) / old
+            rows.append({
+                "key": "/".join(str(k) for k in key[1:]),
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change": change,
+                "regression": change < -threshold,
+            })
+
+    return rows
+
+
+def print_comparison(rows):
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"  {row['key']:<48} {row['metric']:<18} {row['baseline']:>14,.1f} -> "
+              f"{row['current']:>14,.1f}  {row['change']*100:+7.1f}%  {flag}")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"\n{len(rows)} metrics compared, {regressions} regressions")
@@ -1,3 +1,7 @@
+import os
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # --- Simulation Parameters ---
 NUM_INPUTS       = 2
 NUM_WEIGHTS      = 1
@@ -11,13 +15,27 @@ FAULT_TYPE_BRIDGE = "BRIDGE"
 # --- General Options ---
 VERBOSE_DEFAULT   = True
 SAVE_CSV_FILENAME = "fault_sim_results.csv"
+SAVE_NPY_FILENAME = "fault_sim_results.npy"   # Same per-fault results as a NumPy structured array
+SWEEP_CSV_FILENAME = "sweep_results.csv"      # One row per batch-sweep configuration
+RESULT_CHUNK_SIZE = 65536                     # Faults buffered per result-file write
+GOLDEN_CACHE_DIR  = os.path.join(_REPO_ROOT, ".golden_cache")   # Fault-free stage responses, whatever the cwd (None = memory only)
+CHECKPOINT_INTERVAL = 60.0            # Seconds between campaign checkpoint writes
 
 FAULT_MODE = "BOTH"   # Controls which fault classes are generated (SAF, BRIDGE, or BOTH)
+FAULT_MODES = ("SAF", "BRIDGE", "BOTH", "COUPLING", "ALL")   # BOTH = SAF + BRIDGE, ALL adds COUPLING
 
 BRIDGE_TYPES_ACTIVE = list(range(8))  # Lets you limit specific bridge types for targeted experiments
 
 NUM_ROW = 2           # Keeps future scalability in mind
+NUM_COL = 1           # Output columns (adder trees) sharing the row inputs
 
 RANDOM_SEED = None
+RANDOM_PATTERN_COUNT = 64   # Words in the "random" weight-pattern group
+PATTERN_MEMO_LIMIT = 1 << 16   # Largest (group, bit_width) pattern list kept in memory
+SAMPLE_PRECISION = 0.005       # Sampling campaign: target CI half-width of the coverage
+SAMPLE_CONFIDENCE = 0.95       # Sampling campaign: confidence level of the intervals
+SAMPLE_BATCH_SIZE = 256        # Sampling campaign: faults simulated between precision checks
+ACTIVATION_BITS = 4            # Bit-serial input width (main.bit_serial)
 
 FAULT_TYPE_COUPLING = "COUPLING"
+FAULT_TYPE_TREE = "TREE"   # Stuck-at bit on an adder-tree node (main.adder_tree)
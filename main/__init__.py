@@ -1,4 +1,39 @@
-from .main_engine import main_engine
-from .fault_classes import Fault
-from .fault_injection import inject_fault
-from .fault_coverage_calculator import calculate_fault_coverage
+import importlib
+
+# Public name -> submodule defining it, imported on first access.
+# Engines defined in a module of the same name (main_engine,
+# vectorized_engine, bit_parallel_engine, macro_engine, parallel_engine,
+# streaming_engine, coupling_engine) are not re-exported: main.<name> is
+# that submodule, e.g. `from main.main_engine import main_engine`.
+_EXPORTS = {
+    "Fault": ".fault_classes",
+    "inject_fault": ".fault_injection",
+    "CoverageAccumulator": ".fault_coverage_calculator",
+    "calculate_fault_coverage": ".fault_coverage_calculator",
+    "FaultSet": ".fault_set",
+    "FaultView": ".fault_set",
+    "collapsed_engine": ".fault_collapsing",
+    "SimulationProfiler": ".profiler",
+    "ResultWriter": ".result_writer",
+    "load_results": ".result_writer",
+    "FaultDictionary": ".fault_dictionary",
+    "multi_fault_campaign": ".multi_fault",
+    "sampling_campaign": ".sampling",
+    "adder_tree_engine": ".adder_tree",
+    "SharedUniverse": ".shared_universe",
+    "shared_engine": ".shared_universe",
+    "bit_serial_engine": ".bit_serial",
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
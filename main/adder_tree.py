@@ -0,0 +1,193 @@
+from config.config import FAULT_TYPE_TREE
+from main.fault_classes import Fault
+from main.fault_coverage_calculator import CoverageAccumulator
+from main.golden_cache import get_golden_table
+
+
+# ----------------------------------------------------------------------
+# Tree structure
+#
+# The macro's out_sum = sum_r in[r] * row_value(w[r]) is built level by
+# level:
+#   level 0   product bits   p[k*R + r] = in[r] & w[r][k]          (1 bit)
+#   level 1   column sums    c[k] = sum_r p[k*R + r]
+#   level 2+  binary tree over the columns: a node covering columns
+#             [lo, hi) holds sum_k c[k] << (k - lo); its parent adds
+#             left + (right << span(left))
+# The single node of the top level is out_sum. Every node value is a
+# register of fixed width (enough for its fault-free maximum).
+# ----------------------------------------------------------------------
+class AdderTree:
+    """Shape of the adder tree of one column: bit_width bits x num_rows rows."""
+
+    def __init__(self, bit_width, num_rows=2):
+        self.bit_width = bit_width
+        self.num_rows = num_rows
+
+        # per level: number of nodes and the columns each node covers
+        self.spans = [[1] * (bit_width * num_rows), [1] * bit_width]
+        while len(self.spans[-1]) > 1:
+            below = self.spans[-1]
+            self.spans.append([sum(below[i:i + 2]) for i in range(0, len(below), 2)])
+
+        max_leaf = [1] * (bit_width * num_rows)
+        max_column = [num_rows] * bit_width
+        self.widths = [
+            [m.bit_length() for m in max_leaf],
+            [m.bit_length() for m in max_column],
+        ] + [
+            [(num_rows * ((1 << span) - 1)).bit_length() for span in level]
+            for level in self.spans[2:]
+        ]
+
+    @property
+    def num_levels(self):
+        return len(self.spans)
+
+    def parent(self, level, index):
+        """(parent index, shift of this child inside the parent)."""
+        if level == 0:
+            return index // self.num_rows, 0
+        if index % 2 == 0:
+            return index // 2, 0
+        return index // 2, self.spans[level][index - 1]
+
+    def evaluate(self, in_bits, weight_rows):
+        """Fault-free value of every node, as one list per level."""
+        leaves = [
+            in_bits[r] & weight_rows[r][k]
+            for k in range(self.bit_width) for r in range(self.num_rows)
+        ]
+        levels = [leaves]
+        columns = [sum(leaves[k * self.num_rows:(k + 1) * self.num_rows]) for k in range(self.bit_width)]
+        levels.append(columns)
+
+        for level in range(1, self.num_levels - 1):
+            below = levels[-1]
+            spans = self.spans[level]
+            levels.append([
+                below[i] + (below[i + 1] << spans[i] if i + 1 < len(below) else 0)
+                for i in range(0, len(below), 2)
+            ])
+        return levels
+
+    def faulty_root(self, levels, level, index, bit, forced):
+        """
+        out_sum with bit `bit` of node (level, index) stuck at `forced`.
+
+        Event-driven: only the nodes on the path to the root are
+        recomputed, each as its cached value plus the shifted change of the
+        child below (sums are linear), masked to the node's width. The walk
+        stops as soon as a node comes out unchanged.
+        """
+        old = levels[level][index]
+        new = (old & ~(1 << bit)) | (forced << bit)
+
+        while new != old and level < self.num_levels - 1:
+            index, shift = self.parent(level, index)
+            level += 1
+            old_parent = levels[level][index]
+            mask = (1 << self.widths[level][index]) - 1
+            new = (old_parent + ((new - old) << shift)) & mask
+            old = old_parent
+
+        if new == old:
+            return levels[-1][0]
+        return new
+
+
+# ----------------------------------------------------------------------
+# Fault universe
+# ----------------------------------------------------------------------
+def iter_tree_faults(bit_width, num_rows=2, levels=None):
+    """SA0/SA1 on every bit of every node, ordered (level, index, bit, forced)."""
+    tree = AdderTree(bit_width, num_rows)
+    for level in range(tree.num_levels):
+        if levels is not None and level not in levels:
+            continue
+        for index, width in enumerate(tree.widths[level]):
+            for bit in range(width):
+                for forced in (0, 1):
+                    yield Fault(FAULT_TYPE_TREE, forced_value=forced, node=(level, index), node_bit=bit)
+
+
+def generate_tree_fault_list(bit_width, num_rows=2, levels=None):
+    return list(iter_tree_faults(bit_width, num_rows, levels))
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+def golden_tree(tree, golden):
+    """Node values per stage and pattern, from the golden table's stage plan."""
+    return {
+        stage_id: [tree.evaluate(in_bits, stage["weights"]) for in_bits in stage["patterns"]]
+        for stage_id, stage in golden["stages"].items()
+    }
+
+
+def adder_tree_engine(bit_width, algo, verbose=True, golden=None, fault_list=None, silent=False):
+    """
+    main_engine for adder-tree node faults.
+
+    The golden node values of every stage and pattern are computed once;
+    each fault then costs one root-ward walk per (stage, pattern), stopping
+    at the first detecting stage as main_engine does.
+
+    silent:     print nothing at all (overrides verbose), as in main_engine.
+
+    Returns the coverage dict: "total" and one "L<level>" entry per tree
+    level present in the fault list.
+    """
+    verbose = verbose and not silent
+    golden = golden if golden is not None else get_golden_table(algo, bit_width)
+    num_rows = len(golden["stages"][min(golden["stages"])]["weights"])
+    tree = AdderTree(bit_width, num_rows)
+    if fault_list is None:
+        fault_list = generate_tree_fault_list(bit_width, num_rows)
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width}, adder-tree faults)...")
+
+    node_values = golden_tree(tree, golden)
+    stage_ids = sorted(golden["stages"])
+    accumulator = CoverageAccumulator()
+    by_level = {}           # tree level -> [total, detected]
+
+    for f in fault_list:
+        level, index = f.node
+        for stage_id in stage_ids:
+            in_patterns = golden["stages"][stage_id]["patterns"]
+            outputs = [
+                tree.faulty_root(levels, level, index, f.node_bit, f.forced_value)
+                for levels in node_values[stage_id]
+            ]
+            result = algo.observe(stage_id, in_patterns, outputs)
+            if result["detected"]:
+                f.detected = True
+                f.detect_pattern = {
+                    "stage": stage_id,
+                    "patterns": in_patterns,
+                    "fault_type": result["fault_type"],
+                    "location": result["location"],
+                }
+                break
+
+        accumulator.update(f)
+        counts = by_level.setdefault(level, [0, 0])
+        counts[0] += 1
+        counts[1] += f.detected
+        if verbose:
+            print(f"→ {'Detected' if f.detected else 'Undetected'} {f}")
+
+    coverage = {"total": accumulator.detected / accumulator.total if accumulator.total else 0}
+    for level, (total, detected) in sorted(by_level.items()):
+        coverage[f"L{level}"] = detected / total
+
+    if not silent:
+        print("\n=== Adder-Tree Fault Coverage ===")
+        print(f"  total: {coverage['total'] * 100:.2f}% ({accumulator.detected}/{accumulator.total})")
+        for level, (total, detected) in sorted(by_level.items()):
+            name = f"L{level}"
+            print(f"  {name:<5}: {coverage[name] * 100:.2f}% ({detected}/{total})")
+    return coverage
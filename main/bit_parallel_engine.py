@@ -0,0 +1,216 @@
+import numpy as np
+
+from main.fault_coverage_calculator import calculate_fault_coverage
+from main.main_engine import generate_fault_list
+from main.vectorized_engine import (
+    BRIDGE_TABLE, FAULT_FIELDS, KIND_SAF,
+    apply_detect_stages, encode_faults, group_responses, observe_group, select_faults,
+)
+from utils.bit_ops import bits_to_int, sum_dtype
+
+DEFAULT_LANES = 1024
+
+
+# ----------------------------------------------------------------------
+# Word-packed hardware model
+#
+# Every fault owns one bit lane of a Python int.  A "slice" list holds
+# one such word per bit position (LSB first), so slice[k] >> lane & 1 is
+# bit k of the value seen by that lane's faulty circuit.
+# ----------------------------------------------------------------------
+def _lane_masks(faults):
+    """
+    Lane masks per fault site:
+      sa0[(row, bit)], sa1[(row, bit)]  -> lanes with that SAF
+      bridges[(i, j, bridge_type)]      -> lanes with that bridge
+    """
+    sa0, sa1, bridges = {}, {}, {}
+    columns = (faults[name].tolist() for name in FAULT_FIELDS)
+
+    for lane, (kind, row, bit, forced, i, j, bt) in enumerate(zip(*columns)):
+        if kind == KIND_SAF:
+            target = sa1 if forced else sa0
+            key = (row, bit)
+        else:
+            target = bridges
+            key = (i, j, bt)
+        target[key] = target.get(key, 0) | (1 << lane)
+
+    return sa0, sa1, bridges
+
+
+def _weight_slices(nominal_bits, row, sa0, sa1, ones, bit_width):
+    """Bit slices of one row's faulty weights."""
+    slices = []
+    for bit in range(bit_width):
+        word = ones if nominal_bits[bit] else 0
+        word |= sa1.get((row, bit), 0)
+        word &= ~sa0.get((row, bit), 0)
+        slices.append(word)
+    return slices
+
+
+def _input_words(in_bits, bridges, ones):
+    """One word per input line, bridged lanes replaced by their faulty value."""
+    words = [ones if b else 0 for b in in_bits]
+    for (i, j, bt), mask in bridges.items():
+        a_faulty, b_faulty = BRIDGE_TABLE[bt, in_bits[i], in_bits[j]]
+        words[i] = (words[i] & ~mask) | (mask if a_faulty else 0)
+        words[j] = (words[j] & ~mask) | (mask if b_faulty else 0)
+    return words
+
+
+def _add_slices(x, y):
+    """Bit-sliced ripple-carry adder; the result is one slice wider."""
+    out = []
+    carry = 0
+    for xb, yb in zip(x, y):
+        t = xb ^ yb
+        out.append(t ^ carry)
+        carry = (xb & yb) | (carry & t)
+    out.append(carry)
+    return out
+
+
+def _lane_bits(words, lanes):
+    """(len(words), lanes) uint8 bit matrix of a list of lane words."""
+    nbytes = (lanes + 7) // 8
+    raw = b"".join(w.to_bytes(nbytes, "little") for w in words)
+    packed = np.frombuffer(raw, dtype=np.uint8).reshape(len(words), nbytes)
+    return np.unpackbits(packed, axis=1, bitorder="little")[:, :lanes]
+
+
+def _unpack_outputs(out_slices, lanes, dtype, select):
+    """(P, bits) slices -> (len(select), P) integer outputs of the selected lanes."""
+    bits = np.stack([_lane_bits(slices, lanes) for slices in out_slices])[:, :, select]
+    nbits = bits.shape[1]
+
+    if dtype is not object:
+        place = np.left_shift(1, np.arange(nbits, dtype=np.int64))
+        return np.einsum("pkl,k->lp", bits.astype(np.int64), place)
+
+    # too wide for int64: repack each lane's bits into bytes instead
+    packed = np.packbits(bits, axis=1, bitorder="little")          # (P, bytes, L)
+    outputs = np.empty((len(select), len(out_slices)), dtype=object)
+    for p in range(len(out_slices)):
+        for k, raw in enumerate(packed[p].T):
+            outputs[k, p] = int.from_bytes(raw.tobytes(), "little")
+    return outputs
+
+
+def simulate_lanes(faults, algo, stages, bit_width, results):
+    """
+    Run the full stage plan for one word of faults.
+
+    stages:  [(stage_id, in_patterns, (row1_nom, row2_nom)), ...]
+    results: list the algorithm's observe() result dicts are appended to
+    Returns the detecting stage per lane (0 = undetected) and, per lane,
+    the index of its detecting result in `results` (-1 = undetected).
+    """
+    lanes = len(faults["kind"])
+    ones = (1 << lanes) - 1
+    dtype = sum_dtype(bit_width, 2)
+    sa0, sa1, bridges = _lane_masks(faults)
+
+    detect_stage = np.zeros(lanes, dtype=np.int64)
+    result_index = np.full(lanes, -1, dtype=np.int64)
+
+    for stage_id, in_patterns, (row1_nom, row2_nom) in stages:
+
+        active = np.flatnonzero(detect_stage == 0)
+        if active.size == 0:
+            break
+
+        w1 = _weight_slices(row1_nom, 1, sa0, sa1, ones, bit_width)
+        w2 = _weight_slices(row2_nom, 2, sa0, sa1, ones, bit_width)
+        val1, val2 = bits_to_int(row1_nom[:bit_width]), bits_to_int(row2_nom[:bit_width])
+
+        # lanes whose output differs from the fault-free one on any pattern
+        diff = 0
+        golden = []
+        out_slices = []
+        for in_bits in in_patterns:
+            x0, x1 = _input_words(in_bits, bridges, ones)
+            total = _add_slices([x0 & b for b in w1], [x1 & b for b in w2])
+            expected = in_bits[0] * val1 + in_bits[1] * val2
+            for k, word in enumerate(total):
+                diff |= word ^ (ones if expected >> k & 1 else 0)
+            golden.append(expected)
+            out_slices.append(total)
+
+        changed = _lane_bits([diff], lanes)[0].astype(bool)[active]
+        hit = np.zeros(lanes, dtype=bool)
+        stage_result = np.full(lanes, -1, dtype=np.int64)
+
+        # unaffected lanes all see the golden response
+        num_golden = int(np.count_nonzero(~changed))
+        if num_golden:
+            result = observe_group(algo, stage_id, in_patterns, golden, num_golden)
+            results.append(result)
+            hit[active[~changed]] = result["detected"]
+            stage_result[active[~changed]] = len(results) - 1
+
+        # affected lanes are unpacked and grouped by response
+        faulty = active[changed]
+        if faulty.size:
+            outputs = _unpack_outputs(out_slices, lanes, dtype, faulty)
+            responses, inverse = group_responses(outputs)
+            counts = np.bincount(inverse, minlength=len(responses))
+            detected = np.zeros(len(responses), dtype=bool)
+            base = len(results)
+
+            for u, response in enumerate(responses):
+                result = observe_group(algo, stage_id, in_patterns, response, int(counts[u]))
+                results.append(result)
+                detected[u] = result["detected"]
+
+            hit[faulty] = detected[inverse]
+            stage_result[faulty] = base + inverse
+
+        detect_stage[hit] = stage_id
+        result_index[hit] = stage_result[hit]
+
+    return detect_stage, result_index
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+def bit_parallel_engine(bit_width, algo, verbose=True, lanes=DEFAULT_LANES, fault_list=None, silent=False):
+    """
+    Parallel-fault variant of main_engine.
+
+    Faults are packed `lanes` per word; each pass evaluates every stage
+    pattern for all of them with a handful of bitwise operations per
+    weight bit, independent of how many faults share the word.
+
+    fault_list: optional list of Faults or FaultSet to simulate instead of
+                generate_fault_list(bit_width).
+    silent:     print nothing at all (overrides verbose), as in main_engine.
+    """
+    verbose = verbose and not silent
+    if fault_list is None:
+        fault_list = generate_fault_list(bit_width)
+    faults = encode_faults(fault_list)
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width}, bit-parallel x{lanes})...")
+
+    stages = [
+        (stage_id, algo.get_stage_patterns(stage_id), algo.get_stage_weights(stage_id))
+        for stage_id in range(1, algo.get_required_stages() + 1)
+    ]
+    stage_patterns = {stage_id: in_patterns for stage_id, in_patterns, _ in stages}
+
+    detect_stage = np.zeros(len(fault_list), dtype=np.int64)
+    result_index = np.full(len(fault_list), -1, dtype=np.int64)
+    results = []
+    for start in range(0, len(fault_list), lanes):
+        idx = np.arange(start, min(start + lanes, len(fault_list)))
+        detect_stage[idx], result_index[idx] = simulate_lanes(
+            select_faults(faults, idx), algo, stages, bit_width, results
+        )
+
+    apply_detect_stages(fault_list, detect_stage, stage_patterns, verbose, result_index, results)
+
+    return calculate_fault_coverage(fault_list, silent=silent)
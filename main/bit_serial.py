@@ -0,0 +1,398 @@
+import numpy as np
+
+from config.config import ACTIVATION_BITS, FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE, FAULT_TYPE_COUPLING
+from main.fault_coverage_calculator import calculate_fault_coverage
+from main.fault_injection import inject_fault
+from main.fault_set import FaultSet
+from main.golden_cache import get_golden_table
+from main.main_engine import generate_fault_list, set_write_transition, weight_delta
+from main.vectorized_engine import apply_detect_stages, classify_responses, group_responses, observe_group
+from utils.bit_ops import sum_dtype
+
+FAULT_BATCH = 4096      # faults whose (P, act_bits) partial sums are held at once
+
+
+# ----------------------------------------------------------------------
+# Bit-serial model
+#
+# Each row input is an act_bits-bit activation a[r], fed LSB first: in
+# cycle c the macro drives bit c of every activation and produces the
+# partial sum
+#     psum[c] = sum_r ((a[r] >> c) & 1) * w[r]
+# which the shift-accumulator adds up as out = sum_c psum[c] << c.
+#
+# A stage's inputs are held as one (R, P, act_bits) bit array, so the
+# partial sums of all cycles of all patterns are a single product with
+# the row values. Weight faults (SAF, COUPLING) are the same in every
+# cycle and only shift the faulty row's term; bridges combine the two
+# input wires bit by bit, so inject_fault applies them to the whole array
+# at once. There is no Python loop over cycles or patterns per fault.
+#
+# Every cycle is an ordinary single-bit response (cycle input patterns,
+# partial sums), which the algorithm judges like any stage response:
+# through detect_stage_batch() for all faults and cycles sharing the
+# same cycle inputs at once, or else through observe() once per distinct
+# response of each cycle.
+# ----------------------------------------------------------------------
+def lift_patterns(in_patterns, act_bits):
+    """Single-bit input patterns as full-scale activations (every cycle drives the bit)."""
+    full = (1 << act_bits) - 1
+    return [[x * full for x in in_bits] for in_bits in in_patterns]
+
+
+def cycle_bits(activations, act_bits):
+    """(R, P, act_bits) input bit driven on each row, per pattern and cycle."""
+    acts = np.array(activations, dtype=np.int64 if act_bits < 63 else object).T
+    shifts = np.arange(act_bits, dtype=acts.dtype)
+    return ((acts[:, :, None] >> shifts) & 1).astype(np.int64)
+
+
+def partial_sums(bits, weight_values, bit_width):
+    """(P, act_bits) partial sums of an (R, P, act_bits) bit array."""
+    dtype = sum_dtype(bit_width, len(weight_values))
+    return np.tensordot(np.array(weight_values, dtype=dtype), bits.astype(dtype), axes=(0, 0))
+
+
+def cycle_groups(bits):
+    """
+    Cycles of an (R, P, act_bits) bit array grouped by their input
+    patterns: [(in_patterns, cycles), ...] in order of first appearance,
+    plus, per cycle, the first cycle driving the same inputs.
+    """
+    groups = {}
+    first = np.empty(bits.shape[2], dtype=np.int64)
+    for cycle in range(bits.shape[2]):
+        key = tuple(map(tuple, bits[:, :, cycle].T.tolist()))
+        groups.setdefault(key, []).append(cycle)
+        first[cycle] = groups[key][0]
+    return [([list(p) for p in key], np.array(cycles)) for key, cycles in groups.items()], first
+
+
+def shift_accumulate(psums):
+    """(P,) accumulated outputs sum_c psum[c] << c of (P, act_bits) partial sums."""
+    psums = np.asarray(psums, dtype=object)
+    weights = np.array([1 << c for c in range(psums.shape[1])], dtype=object)
+    return (psums * weights).sum(axis=1)
+
+
+# ----------------------------------------------------------------------
+# Stage plan
+# ----------------------------------------------------------------------
+_plans = {}
+
+
+def stage_activations(algo, stage_id, act_bits, in_patterns):
+    """
+    Activations of a stage: algo.get_stage_activations(stage_id, act_bits)
+    when the algorithm defines it, otherwise its single-bit patterns lifted
+    to full scale.
+    """
+    if hasattr(algo, "get_stage_activations"):
+        activations = [list(a) for a in algo.get_stage_activations(stage_id, act_bits)]
+    else:
+        activations = lift_patterns(in_patterns, act_bits)
+
+    limit = 1 << act_bits
+    for acts in activations:
+        if any(not 0 <= a < limit for a in acts):
+            raise ValueError(f"Stage{stage_id}: activation {acts} does not fit in {act_bits} bits")
+    return activations
+
+
+def bit_serial_plan(algo, bit_width, act_bits=ACTIVATION_BITS, golden=None):
+    """
+    Golden table of the bit-serial stages, built once per (stage plan,
+    act_bits):
+
+      plan["stages"][stage_id] = {
+          "activations":   activation per row, per pattern,
+          "weights":       nominal weight bits per row,
+          "weight_values": row_value() of each row,
+          "cycle_bits":    (R, P, act_bits) input bits,
+          "cycle_groups":  [(in_patterns, cycles), ...] cycles sharing inputs,
+          "cycle_first":   per cycle, the first cycle with the same inputs,
+          "partial_sums":  (P, act_bits) fault-free partial sums,
+          "expected":      fault-free accumulated output per pattern,
+      }
+    """
+    golden = golden if golden is not None else get_golden_table(algo, bit_width)
+    key = (golden["key"], act_bits)
+    if key in _plans:
+        return _plans[key]
+
+    stages = {}
+    for stage_id, stage in golden["stages"].items():
+        activations = stage_activations(algo, stage_id, act_bits, stage["patterns"])
+        bits = cycle_bits(activations, act_bits)
+        psums = partial_sums(bits, stage["weight_values"], bit_width)
+        groups, first = cycle_groups(bits)
+        stages[stage_id] = {
+            "activations": activations,
+            "weights": stage["weights"],
+            "weight_values": stage["weight_values"],
+            "cycle_bits": bits,
+            "cycle_groups": groups,
+            "cycle_first": first,
+            "partial_sums": psums,
+            "expected": shift_accumulate(psums).tolist(),
+        }
+
+    plan = {"key": golden["key"], "bit_width": bit_width, "act_bits": act_bits, "stages": stages}
+    _plans[key] = plan
+    return plan
+
+
+# ----------------------------------------------------------------------
+# Fault simulation
+# ----------------------------------------------------------------------
+def faulty_partial_sums(f, stage, bit_width):
+    """(P, act_bits) partial sums of a stage under fault f, all cycles at once."""
+    bits = stage["cycle_bits"]
+    psums = stage["partial_sums"]
+
+    if f.fault_type in (FAULT_TYPE_SAF, FAULT_TYPE_COUPLING):
+        row, delta = weight_delta(f, stage, bit_width)
+        if delta == 0:
+            return psums
+        return psums + bits[row - 1].astype(psums.dtype) * delta
+
+    if f.fault_type == FAULT_TYPE_BRIDGE:
+        bits_f, _ = inject_fault(bits, [], f)
+        return partial_sums(bits_f, stage["weight_values"], bit_width)
+
+    raise ValueError(f"Bit-serial simulation supports SAF, BRIDGE and COUPLING faults, not {f.fault_type}")
+
+
+def observe_cycles(algo, stage_id, bits, psums):
+    """
+    algo.observe() on the single-bit response of each cycle (the nominal
+    cycle inputs and the observed partial sums), in cycle order, until one
+    detects. Cycles repeating an earlier (inputs, partial
+    sums) response are skipped, so full-scale activations cost one call.
+    Returns (cycle, result); cycle is None when nothing is detected.
+    """
+    seen = set()
+    result = None
+    for cycle in range(psums.shape[1]):
+        in_patterns = bits[:, :, cycle].T.tolist()
+        outputs = psums[:, cycle].tolist()
+        key = (tuple(map(tuple, in_patterns)), tuple(outputs))
+        if key in seen:
+            continue
+        seen.add(key)
+
+        result = algo.observe(stage_id, in_patterns, outputs)
+        if result["detected"]:
+            return cycle, result
+    return None, result
+
+
+def simulate_fault_bit_serial(f, algo, bit_width, plan):
+    """
+    simulate_fault over the bit-serial stages of `plan`.
+
+    The algorithm judges each cycle's partial sums through observe(). An
+    algorithm defining observe_activations(stage_id, activations, outputs)
+    is given the accumulated outputs of the stage instead.
+    """
+    prev_weights = None
+
+    for stage_id in sorted(plan["stages"]):
+        stage = plan["stages"][stage_id]
+
+        if f.fault_type == FAULT_TYPE_COUPLING:
+            set_write_transition(f, prev_weights, stage["weights"], bit_width)
+            prev_weights = stage["weights"]
+
+        psums = faulty_partial_sums(f, stage, bit_width)
+
+        if hasattr(algo, "observe_activations"):
+            cycle = None
+            result = algo.observe_activations(stage_id, stage["activations"], shift_accumulate(psums).tolist())
+        else:
+            cycle, result = observe_cycles(algo, stage_id, stage["cycle_bits"], psums)
+
+        if result["detected"]:
+            f.detected = True
+            f.detect_pattern = {
+                "stage": stage_id,
+                "patterns": stage["activations"],
+                "cycle": cycle,
+                "fault_type": result["fault_type"],
+                "location": result["location"],
+            }
+            return stage_id
+
+    return 0
+
+
+# ----------------------------------------------------------------------
+# Batched simulation: all faults of a batch, all cycles of a stage
+# ----------------------------------------------------------------------
+def detect_cycles_batch(algo, stage_id, stage, psums):
+    """
+    First detecting cycle of each row of an (F, P, act_bits) partial-sum
+    array, through one algo.detect_stage_batch() call per cycle group.
+    Returns (cycle, code) arrays; cycle is -1 where no cycle detects.
+    """
+    num_faults, num_patterns, act_bits = psums.shape
+    cycle = np.full(num_faults, act_bits, dtype=np.int64)
+    code = np.full(num_faults, -1, dtype=np.int64)
+
+    for in_patterns, cycles in stage["cycle_groups"]:
+        outputs = psums[:, :, cycles].transpose(0, 2, 1).reshape(-1, num_patterns)
+        codes = algo.detect_stage_batch(stage_id, in_patterns, outputs).reshape(num_faults, len(cycles))
+
+        hit = codes >= 0
+        pos = np.argmax(hit, axis=1)
+        earlier = hit.any(axis=1) & (cycles[pos] < cycle)
+        cycle[earlier] = cycles[pos[earlier]]
+        code[earlier] = codes[earlier, pos[earlier]]
+
+    cycle[cycle == act_bits] = -1
+    return cycle, code
+
+
+def observe_cycles_batch(algo, stage_id, stage, psums, results):
+    """
+    First detecting cycle of each row of an (F, P, act_bits) partial-sum
+    array through algo.observe(), cycle by cycle over the rows still
+    undetected, once per distinct response (counters scaled to the number
+    of faults sharing it). A row repeating the response it gave on an
+    earlier cycle with the same inputs is not observed again.
+    Returns (cycle, result index into `results`); -1 where undetected.
+    """
+    num_faults, _, act_bits = psums.shape
+    cycle = np.full(num_faults, -1, dtype=np.int64)
+    index = np.full(num_faults, -1, dtype=np.int64)
+    in_patterns = {int(c): p for p, cycles in stage["cycle_groups"] for c in cycles.tolist()}
+
+    for c in range(act_bits):
+        rows = np.flatnonzero(cycle < 0)
+        first = stage["cycle_first"][c]
+        if first != c:
+            rows = rows[(psums[rows, :, c] != psums[rows, :, first]).any(axis=1)]
+        if rows.size == 0:
+            continue
+
+        responses, inverse = group_responses(psums[rows, :, c])
+        counts = np.bincount(inverse, minlength=len(responses))
+        hit = np.zeros(len(responses), dtype=bool)
+        base = len(results)
+        for u, response in enumerate(responses):
+            result = observe_group(algo, stage_id, in_patterns[c], response, int(counts[u]))
+            results.append(result)
+            hit[u] = result["detected"]
+
+        detected = hit[inverse]
+        cycle[rows[detected]] = c
+        index[rows[detected]] = base + inverse[detected]
+
+    return cycle, index
+
+
+def simulate_bit_serial_batch(faults, algo, bit_width, plan, results, classify=True):
+    """
+    The stage loop of simulate_fault_bit_serial for a batch of faults at
+    once, with fault dropping between stages.
+
+    Returns per fault the detecting stage (0 = undetected), the detecting
+    cycle and the index of the algorithm's result dict in `results` (-1
+    when undetected or classify is False).
+    """
+    num_faults = len(faults)
+    detect_stage = np.zeros(num_faults, dtype=np.int64)
+    detect_cycle = np.full(num_faults, -1, dtype=np.int64)
+    result_index = np.full(num_faults, -1, dtype=np.int64)
+    prev_weights = None
+
+    for stage_id in sorted(plan["stages"]):
+        stage = plan["stages"][stage_id]
+        active = np.flatnonzero(detect_stage == 0)
+
+        for k in active.tolist():
+            if faults[k].fault_type == FAULT_TYPE_COUPLING:
+                set_write_transition(faults[k], prev_weights, stage["weights"], bit_width)
+        prev_weights = stage["weights"]
+        if active.size == 0:
+            break
+
+        psums = np.stack([faulty_partial_sums(faults[k], stage, bit_width) for k in active.tolist()])
+
+        if hasattr(algo, "detect_stage_batch"):
+            cycle, code = detect_cycles_batch(algo, stage_id, stage, psums)
+            hit = cycle >= 0
+            algo.observe_batch(stage_id, code[hit])
+            if classify:
+                rows = np.flatnonzero(hit)
+                for in_patterns, cycles in stage["cycle_groups"]:
+                    mine = rows[np.isin(cycle[rows], cycles)]
+                    if mine.size:
+                        result_index[active[mine]] = classify_responses(
+                            algo, stage_id, in_patterns, psums[mine, :, cycle[mine]], results
+                        )
+        else:
+            cycle, index = observe_cycles_batch(algo, stage_id, stage, psums, results)
+            hit = cycle >= 0
+            result_index[active[hit]] = index[hit]
+
+        detect_stage[active[hit]] = stage_id
+        detect_cycle[active[hit]] = cycle[hit]
+
+    return detect_stage, detect_cycle, result_index
+
+
+def bit_serial_engine(bit_width, algo, act_bits=ACTIVATION_BITS, verbose=True, golden=None, fault_list=None,
+                      silent=False):
+    """
+    main_engine with act_bits-bit activations fed bit-serially.
+
+    Faults are simulated FAULT_BATCH at a time (simulate_bit_serial_batch).
+    An algorithm defining observe_activations() is run fault by fault
+    through simulate_fault_bit_serial instead.
+
+    golden:     optional golden table of algo (single-bit plan the
+                activations are derived from)
+    fault_list: optional list of Faults or FaultSet (default:
+                generate_fault_list(bit_width))
+    silent:     print nothing at all (overrides verbose)
+
+    Returns the coverage dict.
+    """
+    verbose = verbose and not silent
+    plan = bit_serial_plan(algo, bit_width, act_bits, golden)
+    if fault_list is None:
+        fault_list = generate_fault_list(bit_width)
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width}, "
+              f"{act_bits}-bit bit-serial activations)...")
+
+    if hasattr(algo, "observe_activations"):
+        for f in fault_list:
+            stage_id = simulate_fault_bit_serial(f, algo, bit_width, plan)
+            if verbose:
+                print(f"→ {'Detected' if stage_id else 'Undetected'} {f}")
+        return calculate_fault_coverage(fault_list, silent=silent)
+
+    # a FaultSet keeps only the detecting stage, so its faults are not classified
+    classify = not isinstance(fault_list, FaultSet)
+    detect_stage = np.zeros(len(fault_list), dtype=np.int64)
+    detect_cycle = np.full(len(fault_list), -1, dtype=np.int64)
+    result_index = np.full(len(fault_list), -1, dtype=np.int64)
+    results = []
+
+    for start in range(0, len(fault_list), FAULT_BATCH):
+        stop = min(start + FAULT_BATCH, len(fault_list))
+        batch = [fault_list[k] for k in range(start, stop)]
+        detect_stage[start:stop], detect_cycle[start:stop], result_index[start:stop] = \
+            simulate_bit_serial_batch(batch, algo, bit_width, plan, results, classify)
+
+    stage_activations = {stage_id: stage["activations"] for stage_id, stage in plan["stages"].items()}
+    apply_detect_stages(fault_list, detect_stage, stage_activations, verbose, result_index, results)
+    if classify:
+        for f, cycle in zip(fault_list, detect_cycle.tolist()):
+            if f.detected:
+                f.detect_pattern["cycle"] = cycle
+
+    return calculate_fault_coverage(fault_list, silent=silent)
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import time
+
+from config.config import CHECKPOINT_INTERVAL
+from main.golden_cache import golden_key
+
+# Bump when the checkpoint layout changes
+CHECKPOINT_FORMAT_VERSION = 2
+
+# Per-fault results live next to the header, one JSON value per line
+RESULTS_SUFFIX = ".results.jsonl"
+
+
+def campaign_key(algo, bit_width, fault_list):
+    """
+    Identity of a campaign: the algorithm's stage plan at bit_width and the
+    exact fault universe (content and order). A checkpoint only resumes a
+    run with the same key.
+    """
+    h = hashlib.sha256(golden_key(algo, bit_width).encode())
+    if hasattr(fault_list, "records"):         # FaultSet: hash the raw records
+        fields = [name for name in fault_list.records.dtype.names if name != "detect_stage"]
+        h.update(fault_list.records[fields].tobytes())
+    else:
+        for f in fault_list:
+            h.update(repr(f).encode())
+    h.update(str(len(fault_list)).encode())
+    return h.hexdigest()
+
+
+class CampaignCheckpoint:
+    """
+    Periodic on-disk snapshot of a main_engine run.
+
+    Per processed fault the detecting stage and the algorithm's verdict are
+    kept (0 for undetected), together with the algorithm's detected_faults
+    counters. The results are appended to `<path>.results.jsonl`, so a save
+    writes only the faults finished since the previous one; the small
+    header at `path` (key, counters, number of committed results) is then
+    rewritten atomically. Saves happen at most once per `interval` seconds
+    and once more when the campaign ends, so a killed run loses at most
+    `interval` seconds of work. Result lines beyond the header's count
+    (a save cut short) are dropped on resume.
+    """
+
+    def __init__(self, path, algo, bit_width, fault_list, interval=CHECKPOINT_INTERVAL):
+        self.path = path
+        self.results_path = path + RESULTS_SUFFIX
+        self.algo = algo
+        self.bit_width = bit_width
+        self.interval = interval
+        self.key = campaign_key(algo, bit_width, fault_list)
+        self.num_faults = len(fault_list)
+
+        self.committed = 0          # results already in the results file
+        self.pending = []           # per fault since then: 0 or [stage, fault_type, location]
+        self._next_save = time.monotonic() + interval
+
+    # ------------------------------------------------------------------
+    # Resume
+    # ------------------------------------------------------------------
+    def restore(self, fault_list, stage_patterns):
+        """
+        Load the checkpoint (if any) into the faults and the algorithm.
+        Returns the index of the first fault still to simulate.
+        """
+        if not os.path.exists(self.path):
+            return 0
+
+        with open(self.path) as fh:
+            state = json.load(fh)
+
+        if state.get("format") != CHECKPOINT_FORMAT_VERSION or state.get("key") != self.key:
+            raise ValueError(f"Checkpoint {self.path} belongs to a different campaign")
+
+        count = state["next_index"]
+        self.algo.detected_faults = dict(state["detected_faults"])
+
+        with open(self.results_path, "r+b") as fh:
+            for f, _ in zip(fault_list, range(count)):
+                entry = json.loads(fh.readline())
+                if entry:
+                    stage_id, fault_type, location = entry
+                    f.detected = True
+                    f.detect_pattern = {
+                        "stage": stage_id,
+                        "patterns": stage_patterns(stage_id),
+                        "fault_type": fault_type,
+                        "location": location,
+                    }
+            fh.truncate(fh.tell())
+
+        self.committed = count
+        return count
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def record(self, f, stage_id):
+        """Note one finished fault; saves when the interval has elapsed."""
+        if stage_id:
+            pattern = f.detect_pattern or {}
+            self.pending.append([stage_id, pattern.get("fault_type"), pattern.get("location")])
+        else:
+            self.pending.append(0)
+
+        if time.monotonic() >= self._next_save:
+            self.save()
+
+    def save(self):
+        # a run that did not resume starts a new results file
+        with open(self.results_path, "a" if self.committed else "w") as fh:
+            fh.writelines(json.dumps(entry, separators=(",", ":")) + "\n" for entry in self.pending)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.committed += len(self.pending)
+        self.pending = []
+
+        state = {
+            "format": CHECKPOINT_FORMAT_VERSION,
+            "key": self.key,
+            "algorithm": self.algo.__class__.__name__,
+            "bit_width": self.bit_width,
+            "num_faults": self.num_faults,
+            "next_index": self.committed,
+            "complete": self.committed == self.num_faults,
+            "detected_faults": self.algo.detected_faults,
+        }
+
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(state, fh, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+        self._next_save = time.monotonic() + self.interval
@@ -0,0 +1,247 @@
+import argparse
+import contextlib
+import io
+import itertools
+
+import numpy as np
+
+from algorithms.compacted_algorithm import CompactedDetectionAlgorithm
+from main.fault_set import FaultSet
+from main.main_engine import generate_fault_list
+from main.vectorized_engine import encode_faults, vectorized_engine, simulate_stage_outputs
+from utils.bit_ops import bits_to_int, popcount
+from utils.weight_patterns.generator import PATTERN_GROUPS, WeightPatternGenerator
+
+# Input patterns a candidate stage may drive (00 never shows a weight fault)
+CANDIDATE_INPUTS = ([1, 0], [0, 1], [1, 1])
+
+
+# ----------------------------------------------------------------------
+# Candidates
+# ----------------------------------------------------------------------
+def candidate_stages(bit_width, groups=None, same_weights_only=False):
+    """
+    Candidate (in_patterns, row1_weights, row2_weights) stages: every
+    ordered pair of weight words from the enabled WeightPatternGenerator
+    groups, driving all of CANDIDATE_INPUTS (pruned after selection).
+    """
+    words = WeightPatternGenerator(bit_width, list(groups) if groups else None).generate()
+    if same_weights_only:
+        pairs = [(w, w) for w in words]
+    else:
+        pairs = itertools.product(words, repeat=2)
+    return [([list(p) for p in CANDIDATE_INPUTS], row1, row2) for row1, row2 in pairs]
+
+
+def detection_matrix(candidates, fault_list, bit_width):
+    """
+    (C, P, F) bool array: candidate c's pattern p shows a deviation from
+    the fault-free sum for fault f. Only SAF and BRIDGE faults are supported
+    (coupling faults depend on the write history, i.e. on stage order).
+    """
+    faults = encode_faults(fault_list)
+    num_patterns = len(CANDIDATE_INPUTS)
+    detects = np.zeros((len(candidates), num_patterns, len(fault_list)), dtype=bool)
+
+    for c, (patterns, row1, row2) in enumerate(candidates):
+        outputs = simulate_stage_outputs(faults, patterns, row1, row2, bit_width)
+        expected = np.array(
+            [x1 * bits_to_int(row1) + x2 * bits_to_int(row2) for x1, x2 in patterns],
+            dtype=outputs.dtype,
+        )
+        detects[c] = (outputs != expected).T
+
+    return detects
+
+
+# ----------------------------------------------------------------------
+# Set cover
+# ----------------------------------------------------------------------
+def greedy_cover(stage_detects, target):
+    """
+    Greedy set cover: repeatedly take the candidate detecting the most
+    still-uncovered faults of `target` (ties: lowest index), then drop
+    chosen stages made redundant by later picks.
+
+    stage_detects: (C, F) bool, target: (F,) bool. Returns candidate indices.
+    """
+    packed = np.packbits(stage_detects, axis=1)
+    uncovered = np.packbits(target)
+    chosen = []
+
+    while uncovered.any():
+        gain = popcount(packed & uncovered).sum(axis=1)
+        best = int(np.argmax(gain))
+        if gain[best] == 0:
+            break
+        chosen.append(best)
+        uncovered &= ~packed[best]
+
+    for c in list(reversed(chosen)):
+        others = [o for o in chosen if o != c]
+        if others and not (target & ~stage_detects[others].any(axis=0)).any():
+            chosen.remove(c)
+
+    return chosen
+
+
+def prune_patterns(detects, chosen, target):
+    """
+    Per chosen stage, the input patterns still needed: a pattern is dropped
+    when the remaining patterns of all chosen stages keep covering `target`.
+    Returns {candidate: [pattern indices]}.
+    """
+    keep = {c: list(range(detects.shape[1])) for c in chosen}
+
+    def covered():
+        return np.any([detects[c, p] for c in chosen for p in keep[c]], axis=0)
+
+    for c in chosen:
+        for p in list(keep[c]):
+            if len(keep[c]) == 1:
+                break
+            keep[c].remove(p)
+            if (target & ~covered()).any():
+                keep[c].append(p)
+        keep[c].sort()
+
+    return keep
+
+
+# ----------------------------------------------------------------------
+# Driver
+# ----------------------------------------------------------------------
+def reference_cost(algo):
+    """(stages, input patterns) applied by an algorithm per die."""
+    stages = algo.get_required_stages()
+    patterns = sum(len(algo.get_stage_patterns(s)) for s in range(1, stages + 1))
+    return stages, patterns
+
+
+def compact_stages(bit_width, reference=None, fault_list=None, groups=None, same_weights_only=False):
+    """
+    Smallest stage table (greedy) detecting every fault the candidates can
+    detect, which includes every fault `reference` (an algorithm instance)
+    detects when its weight words are among the candidates.
+
+    Returns a dict:
+      stages             list of (in_patterns, row1_weights, row2_weights)
+      num_faults         size of the fault universe
+      detected           faults the compacted table detects
+      reference_detected faults the reference detects (None without one)
+      cost / reference_cost  (stages, input patterns) per die
+    """
+    if fault_list is None:
+        fault_list = generate_fault_list(bit_width)
+
+    candidates = candidate_stages(bit_width, groups, same_weights_only)
+    detects = detection_matrix(candidates, fault_list, bit_width)
+    stage_detects = detects.any(axis=1)
+    target = stage_detects.any(axis=0)
+
+    reference_detected = None
+    if reference is not None:
+        faults = FaultSet.from_faults(fault_list) if not isinstance(fault_list, FaultSet) \
+            else FaultSet(fault_list.records.copy())
+        with contextlib.redirect_stdout(io.StringIO()):
+            vectorized_engine(bit_width, reference, verbose=False, fault_list=faults)
+        reference_hit = faults.detect_stage > 0
+        reference_detected = int(reference_hit.sum())
+        if (reference_hit & ~target).any():
+            raise ValueError(
+                "Reference detects faults no candidate stage detects; enable more pattern groups"
+            )
+
+    chosen = greedy_cover(stage_detects, target)
+    keep = prune_patterns(detects, chosen, target)
+
+    stages = []
+    for c in chosen:
+        patterns, row1, row2 = candidates[c]
+        stages.append(([patterns[p] for p in keep[c]], row1, row2))
+
+    return {
+        "stages": stages,
+        "num_faults": len(fault_list),
+        "detected": int(target.sum()),
+        "reference_detected": reference_detected,
+        "cost": (len(stages), sum(len(s[0]) for s in stages)),
+        "reference_cost": reference_cost(reference) if reference is not None else None,
+    }
+
+
+# ----------------------------------------------------------------------
+# Output
+# ----------------------------------------------------------------------
+def compacted_algorithm_class(stages, bit_width, name="CompactedAlgorithm"):
+    """Algorithm class (CompactedDetectionAlgorithm subclass) running `stages`."""
+    return type(name, (CompactedDetectionAlgorithm,), {"BIT_WIDTH": bit_width, "STAGES": stages})
+
+
+def algorithm_source(stages, bit_width, name="CompactedAlgorithm", note=""):
+    """Python module text defining the compacted algorithm class."""
+    lines = [
+        "from algorithms.compacted_algorithm import CompactedDetectionAlgorithm",
+        "",
+        "",
+        f"class {name}(CompactedDetectionAlgorithm):",
+        '    """',
+        f"    Compacted stage table for bit_width={bit_width} (generated by main.compaction).",
+    ]
+    if note:
+        lines.append(f"    {note}")
+    lines += [
+        '    """',
+        "",
+        f"    BIT_WIDTH = {bit_width}",
+        "",
+        "    STAGES = [",
+    ]
+    for patterns, row1, row2 in stages:
+        lines.append(f"        ({patterns!r},")
+        lines.append(f"         {list(row1)!r},")
+        lines.append(f"         {list(row2)!r}),")
+    lines += ["    ]", ""]
+    return "\n".join(lines)
+
+
+def write_algorithm(path, stages, bit_width, name="CompactedAlgorithm", note=""):
+    with open(path, "w") as fh:
+        fh.write(algorithm_source(stages, bit_width, name, note))
+
+
+def main():
+    from algorithms import ALGORITHMS
+
+    parser = argparse.ArgumentParser(
+        prog="python -m main.compaction",
+        description="Greedy stage/pattern compaction; writes the result as an algorithm class."
+    )
+    parser.add_argument("--width", type=int, required=True, help="weight bit width")
+    parser.add_argument("--reference", choices=ALGORITHMS, default="five_stage",
+                        help="algorithm whose coverage must be matched (default: five_stage)")
+    parser.add_argument("--groups", nargs="+", choices=PATTERN_GROUPS, default=None,
+                        help="WeightPatternGenerator groups to draw weight words from (default: all)")
+    parser.add_argument("--same-weights", action="store_true",
+                        help="only candidates writing the same word to both rows")
+    parser.add_argument("--name", default="CompactedAlgorithm", help="generated class name")
+    parser.add_argument("--output", help="write the class to this .py file (default: print it)")
+    args = parser.parse_args()
+
+    reference = ALGORITHMS[args.reference](args.width)
+    result = compact_stages(args.width, reference, groups=args.groups, same_weights_only=args.same_weights)
+
+    note = (f"{result['detected']}/{result['num_faults']} faults in {result['cost'][0]} stages, "
+            f"{result['cost'][1]} patterns ({args.reference}: {result['reference_detected']} faults, "
+            f"{result['reference_cost'][0]} stages, {result['reference_cost'][1]} patterns).")
+    print(note)
+
+    if args.output:
+        write_algorithm(args.output, result["stages"], args.width, args.name, note)
+        print(f"Wrote {args.name} to {args.output}")
+    else:
+        print(algorithm_source(result["stages"], args.width, args.name, note))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import numpy as np
+
+from main.fault_coverage_calculator import report_fault_coverage
+from main.fault_set import FaultSet, KIND_COUPLING
+from main.golden_cache import build_golden_table
+from main.vectorized_engine import apply_detect_stages, observe_group
+
+
+# ----------------------------------------------------------------------
+# Write-sequence model
+#
+# Every stage writes its weights into both rows, so the row contents
+# move through the sequence  0...0 -> W(1) -> W(2) -> ...  The state is
+# the same for every fault (a triggered victim flip is overwritten by the
+# next write), so each stage's 0->1 / 1->0 bit edges are computed once
+# and looked up by all coupling faults.
+# ----------------------------------------------------------------------
+def write_edges(prev_bits, curr_bits):
+    """Boolean (transition, row, bit) array of the edges one write causes."""
+    rise = (prev_bits == 0) & (curr_bits == 1)      # "0->1"
+    fall = (prev_bits == 1) & (curr_bits == 0)      # "1->0"
+    return np.stack([rise, fall])
+
+
+def victim_outputs(stage, row, bit):
+    """Stage outputs with weight bit `bit` of 0-based `row` inverted."""
+    nominal = stage["weight_values"][row]
+    delta = (nominal ^ (1 << bit)) - nominal
+    return [e + in_bits[row] * delta for in_bits, e in zip(stage["patterns"], stage["expected"])]
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+def coupling_engine(bit_width, algo, verbose=True, fault_list=None, golden=None, silent=False):
+    """
+    Batched campaign over the R1<->R2 coupling-fault universe.
+
+    Per stage, the write edges are computed once; a fault is triggered
+    when its aggressor bit has the matching edge, and then inverts its
+    victim bit in the other row. All faults with the same victim cell
+    share one response, so the algorithm analyses at most 2*bit_width+1
+    responses per stage however many faults are still active.
+
+    fault_list: FaultSet or list of COUPLING faults
+                (default: FaultSet.generate_coupling(bit_width))
+    golden:     golden table of (algo, bit_width); built in memory if omitted
+    silent:     print nothing at all (overrides verbose), as in main_engine.
+    """
+    verbose = verbose and not silent
+    if fault_list is None:
+        fault_list = FaultSet.generate_coupling(bit_width)
+    fault_set = fault_list if isinstance(fault_list, FaultSet) else FaultSet.from_faults(fault_list)
+
+    rec = fault_set.records
+    if not (rec["kind"] == KIND_COUPLING).all():
+        raise ValueError("coupling_engine only simulates COUPLING faults")
+
+    golden = golden if golden is not None else build_golden_table(algo, bit_width)
+    num_faults = len(rec)
+
+    aggr_row = rec["aggr_row"].astype(np.int64) - 1
+    victim_row = 1 - aggr_row                        # the other row
+    aggr_bit = rec["aggr_bit"].astype(np.int64)
+    victim_cell = victim_row * bit_width + rec["victim_bit"].astype(np.int64)
+    transition = rec["transition"].astype(np.int64)
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' "
+              f"(bit_width={bit_width}, coupling, {num_faults} faults)...")
+
+    detect_stage = np.zeros(num_faults, dtype=np.int64)
+    result_index = np.full(num_faults, -1, dtype=np.int64)
+    results = []
+    prev_bits = np.zeros((2, bit_width), dtype=np.int64)
+
+    for stage_id in range(1, algo.get_required_stages() + 1):
+
+        stage = golden["stages"][stage_id]
+        curr_bits = np.array([w[:bit_width] for w in stage["weights"]], dtype=np.int64)
+        edges = write_edges(prev_bits, curr_bits)
+        prev_bits = curr_bits
+
+        active = np.flatnonzero(detect_stage == 0)
+        if active.size == 0:
+            break
+
+        triggered = edges[transition[active], aggr_row[active], aggr_bit[active]]
+        cell = np.where(triggered, victim_cell[active], -1)      # -1 = fault-free response
+        cells, inverse, counts = np.unique(cell, return_inverse=True, return_counts=True)
+
+        hit = np.zeros(len(cells), dtype=bool)
+        base = len(results)
+        for c, key in enumerate(cells.tolist()):
+            if key < 0:
+                outputs = stage["expected"]
+            else:
+                outputs = victim_outputs(stage, *divmod(key, bit_width))
+            result = observe_group(algo, stage_id, stage["patterns"], outputs, int(counts[c]))
+            results.append(result)
+            hit[c] = result["detected"]
+
+        inverse = inverse.reshape(-1)
+        detected = hit[inverse]
+        detect_stage[active[detected]] = stage_id
+        result_index[active[detected]] = base + inverse[detected]
+
+    stage_patterns = {sid: stage["patterns"] for sid, stage in golden["stages"].items()}
+    apply_detect_stages(fault_list, detect_stage, stage_patterns, verbose, result_index, results)
+
+    detected = int((detect_stage > 0).sum())
+    return report_fault_coverage(num_faults, detected, 0, 0, 0, 0, num_faults, detected, silent=silent)
@@ -1,4 +1,4 @@
-from config.config import NUM_INPUTS, FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE, FAULT_TYPE_COUPLING
+from config.config import NUM_INPUTS, FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE, FAULT_TYPE_COUPLING, FAULT_TYPE_TREE
 
 class Fault:
     def __init__(self,
@@ -7,7 +7,8 @@ class Fault:
         i=None, j=None, bridge_type=None,   # BRIDGE
         aggr_row=None, aggr_bit=None,       # COUPLING
         victim_bit=None, transition=None,   # COUPLING
-        prev_bits=None, curr_bits=None      # COUPLING
+        prev_bits=None, curr_bits=None,     # COUPLING
+        node=None, node_bit=None            # TREE (forced_value shared with SAF)
     ):
         
         # Common
@@ -32,6 +33,10 @@ class Fault:
         self.prev_bits = prev_bits        # full row bits BEFORE
         self.curr_bits = curr_bits        # full row bits AFTER
 
+        # TREE fields
+        self.node = node                  # (level, index) in the adder tree
+        self.node_bit = node_bit          # stuck bit of that node's value
+
 
     def __repr__(self):
         if self.fault_type == FAULT_TYPE_SAF:
@@ -47,4 +52,7 @@ class Fault:
                 f"transition='{self.transition}')"
             )
 
+        if self.fault_type == FAULT_TYPE_TREE:
+            return f"TREE(node={self.node}, bit={self.node_bit}, forced={self.forced_value})"
+
         return f"Fault(type={self.fault_type})"
@@ -0,0 +1,133 @@
+from config.config import FAULT_TYPE_SAF, FAULT_TYPE_COUPLING
+from main.fault_coverage_calculator import calculate_fault_coverage
+from main.golden_cache import build_golden_table
+from main.main_engine import (
+    generate_fault_list, golden_stage_outputs, set_write_transition, simulate_fault, weight_delta
+)
+from main.vectorized_engine import scale_counters
+
+
+# ----------------------------------------------------------------------
+# Deviation signatures
+#
+# A fault's signature is, per stage, the vector out_sum - expected over
+# the stage's patterns (None when nothing deviates). Faults with equal
+# signatures produce identical responses in every stage, so the stage
+# loop detects them at the same stage with the same algorithm verdict:
+# they are equivalent under this stage plan and one simulation per class
+# is enough.
+# ----------------------------------------------------------------------
+def stage_deviation(f, stage, bit_width):
+    """Per-pattern deviation of one stage from the golden sums, or None."""
+    in_patterns = stage["patterns"]
+
+    if f.fault_type in (FAULT_TYPE_SAF, FAULT_TYPE_COUPLING):
+        row, delta = weight_delta(f, stage, bit_width)
+        if delta == 0:
+            return None
+        deviation = tuple(in_bits[row - 1] * delta for in_bits in in_patterns)
+    else:
+        outputs = golden_stage_outputs(f, stage, bit_width)
+        deviation = tuple(o - e for o, e in zip(outputs, stage["expected"]))
+
+    return deviation if any(deviation) else None
+
+
+def fault_signature(f, golden, bit_width):
+    """Tuple of stage_deviation() over every stage of the golden table."""
+    signature = []
+    prev_weights = None
+
+    for stage_id in sorted(golden["stages"]):
+        stage = golden["stages"][stage_id]
+        if f.fault_type == FAULT_TYPE_COUPLING:
+            set_write_transition(f, prev_weights, stage["weights"], bit_width)
+            prev_weights = stage["weights"]
+        signature.append(stage_deviation(f, stage, bit_width))
+
+    return tuple(signature)
+
+
+# Fault types worth collapsing. Coupling faults fall into large classes
+# (many aggressor / transition combinations corrupt the same victim bit the
+# same way), while every SAF and BRIDGE fault of the standard universes has
+# a signature of its own, so computing theirs is pure overhead.
+COLLAPSE_TYPES = (FAULT_TYPE_COUPLING,)
+
+
+def collapse_faults(fault_list, golden, bit_width, fault_types=COLLAPSE_TYPES):
+    """
+    Group a fault list into equivalence classes.
+
+    Only faults of `fault_types` (None: all types) get a signature; every
+    other fault is a class of its own.
+
+    Returns a list of classes, each a list of fault indices in list order;
+    the first index of a class is its representative.
+    """
+    classes = {}
+    for k, f in enumerate(fault_list):
+        if fault_types is None or f.fault_type in fault_types:
+            key = fault_signature(f, golden, bit_width)
+        else:
+            key = k
+        classes.setdefault(key, []).append(k)
+    return list(classes.values())
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+def collapsed_engine(bit_width, algo, verbose=True, fault_list=None, golden=None,
+                     fault_types=COLLAPSE_TYPES, silent=False):
+    """
+    main_engine over one representative per equivalence class.
+
+    The representative runs through the unchanged stage loop; its result
+    is copied to the rest of the class and the algorithm's counters are
+    scaled by the class size, so faults, detected_faults and coverage are
+    reported over the full (uncollapsed) list.
+
+    Trade-off: a signature costs a pass over every stage with no fault
+    dropping, while simulate_fault stops at the first detecting stage. It
+    pays off only where classes are large, i.e. for COUPLING faults; SAF /
+    BRIDGE faults (the default SAF+BRIDGE universe collapses 1.00x) are
+    simulated directly unless fault_types asks for them.
+
+    fault_list:  optional list of Faults or FaultSet (any fault types)
+    golden:      golden table of (algo, bit_width); built in memory if omitted
+    fault_types: fault types to collapse (None: all)
+    silent:      print nothing at all (overrides verbose), as in main_engine.
+    """
+    verbose = verbose and not silent
+    if fault_list is None:
+        fault_list = generate_fault_list(bit_width)
+    golden = golden if golden is not None else build_golden_table(algo, bit_width)
+
+    classes = collapse_faults(fault_list, golden, bit_width, fault_types)
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width}, collapsed)...")
+        print(f"Collapsed {len(fault_list)} faults into {len(classes)} classes "
+              f"(ratio {len(fault_list) / max(len(classes), 1):.2f}x)")
+
+    for members in classes:
+        rep = fault_list[members[0]]
+
+        before = dict(algo.detected_faults)
+        simulate_fault(rep, algo, bit_width, golden)
+        scale_counters(algo, before, len(members))
+
+        for k in members[1:]:
+            f = fault_list[k]
+            f.detected = rep.detected
+            f.detect_pattern = dict(rep.detect_pattern) if rep.detect_pattern else None
+
+    if verbose:
+        for f in fault_list:
+            if f.detected:
+                print(f"→ Detected {f}")
+            else:
+                print(f"→ Undetected {f}")
+
+    return calculate_fault_coverage(fault_list, silent=silent)
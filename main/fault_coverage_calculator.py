@@ -1,21 +1,206 @@
-def calculate_fault_coverage(fault_list):
-    total = len(fault_list)
-    detected = sum(1 for f in fault_list if f.detected)
-    coverage = detected / total if total > 0 else 0
+from config.config import FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE, FAULT_TYPE_COUPLING
 
-    saf_faults = [f for f in fault_list if f.fault_type == "SAF"]
-    bridge_faults = [f for f in fault_list if f.fault_type == "BRIDGE"]
+# Fault types always present in the coverage dict; others appear when seen
+_BASE_TYPES = (FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE)
 
-    saf_cov = sum(1 for f in saf_faults if f.detected) / len(saf_faults) if saf_faults else 0
-    bridge_cov = sum(1 for f in bridge_faults if f.detected) / len(bridge_faults) if bridge_faults else 0
+_LABELS = {
+    FAULT_TYPE_SAF: "SAF coverage:   ",
+    FAULT_TYPE_BRIDGE: "Bridge coverage:",
+    FAULT_TYPE_COUPLING: "Coupling cov.:  ",
+}
 
+
+def calculate_fault_coverage(fault_list, silent=False):
+    accumulator = CoverageAccumulator()
+    for f in fault_list:
+        accumulator.update(f)
+    return accumulator.report(silent)
+
+
+def fault_location(f):
+    """
+    (row, bit) of the weight cell a fault corrupts, None when it has none
+    (bridges sit on the input wires, tree faults on adder nodes).
+    """
+    if f.fault_type == FAULT_TYPE_SAF:
+        return f.index
+    if f.fault_type == FAULT_TYPE_COUPLING:
+        return 3 - f.aggr_row, f.victim_bit       # the victim is in the other row
+    return None
+
+
+class CoverageAccumulator:
+    """
+    Running coverage counters, updated as each fault finishes.
+
+    Holds only counts, so memory does not grow with the universe, and
+    every breakdown can be read at any point of a long campaign:
+      coverage()        total and per fault type
+      row_coverage()    per weight row    (faults with a cell location)
+      bit_coverage()    per bit position  (faults with a cell location)
+      stage_histogram() detections per detecting stage
+      curve()           cumulative coverage after each stage
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.detected = 0
+        self.by_type = {}       # fault_type -> [total, detected]
+        self.by_row = {}        # row -> [total, detected]
+        self.by_bit = {}        # bit -> [total, detected]
+        self.by_stage = {}      # detecting stage -> detections
+        self.stage_patterns = {}    # stage -> number of input patterns (record_stage_plan)
+
+    def record_stage_plan(self, stage_patterns):
+        """
+        Number of input patterns of every stage of the plan (stage_id ->
+        count), as the engine applies it; curve() reads its pattern axis
+        from here when no golden table is given.
+        """
+        self.stage_patterns = dict(stage_patterns)
+
+    def add(self, fault_type, detected, stage=0, location=None):
+        counts = self.by_type.setdefault(fault_type, [0, 0])
+        counts[0] += 1
+        self.total += 1
+        if detected:
+            counts[1] += 1
+            self.detected += 1
+            if stage:
+                self.by_stage[stage] = self.by_stage.get(stage, 0) + 1
+
+        if location is not None:
+            row, bit = location
+            for table, key in ((self.by_row, row), (self.by_bit, bit)):
+                counts = table.setdefault(key, [0, 0])
+                counts[0] += 1
+                counts[1] += bool(detected)
+
+    def update(self, fault):
+        stage = None
+        if fault.detected and fault.detect_pattern:
+            stage = fault.detect_pattern.get("stage")
+        self.add(fault.fault_type, fault.detected, stage, fault_location(fault))
+
+    def counts(self, fault_type):
+        """(total, detected) for one fault type."""
+        return tuple(self.by_type.get(fault_type, (0, 0)))
+
+    def coverage(self):
+        """Current coverage dict, same keys as calculate_fault_coverage."""
+        return type_coverage(self.total, self.detected, self.by_type)
+
+    def row_coverage(self):
+        return {row: d / t for row, (t, d) in sorted(self.by_row.items())}
+
+    def bit_coverage(self):
+        return {bit: d / t for bit, (t, d) in sorted(self.by_bit.items())}
+
+    def stage_histogram(self):
+        """Detecting stage -> number of faults it detected first."""
+        return dict(sorted(self.by_stage.items()))
+
+    def curve(self, golden=None):
+        """
+        Cumulative coverage after each stage, from the stage histogram.
+
+        Each point is {"stage", "patterns", "detected", "coverage"} where
+        patterns counts the input patterns applied up to that stage. Every
+        stage of the plan is listed (including ones that detect nothing),
+        with its pattern count taken from the golden table or, without
+        one, from the plan the engine recorded (record_stage_plan); with
+        neither the pattern axis is unknown and ValueError is raised.
+        """
+        if golden is not None:
+            stage_patterns = {sid: len(stage["patterns"]) for sid, stage in golden["stages"].items()}
+        elif self.stage_patterns:
+            stage_patterns = self.stage_patterns
+        else:
+            raise ValueError("curve() needs the stage plan: pass golden, or fill the accumulator "
+                             "through an engine (which records it)")
+
+        points = []
+        patterns = detected = 0
+        for stage_id in sorted(set(stage_patterns) | set(self.by_stage)):
+            patterns += stage_patterns.get(stage_id, 0)
+            detected += self.by_stage.get(stage_id, 0)
+            points.append({
+                "stage": stage_id,
+                "patterns": patterns,
+                "detected": detected,
+                "coverage": detected / self.total if self.total else 0,
+            })
+        return points
+
+    def breakdown(self, golden=None):
+        """All of the above in one dict."""
+        return {
+            "coverage": self.coverage(),
+            "by_type": {name: tuple(c) for name, c in self.by_type.items()},
+            "by_row": self.row_coverage(),
+            "by_bit": self.bit_coverage(),
+            "stage_histogram": self.stage_histogram(),
+            "curve": self.curve(golden),
+        }
+
+    def report(self, silent=False):
+        """Print the summary (unless silent) and return coverage()."""
+        if not silent:
+            print_type_coverage(self.total, self.detected, self.by_type)
+        return self.coverage()
+
+    def report_breakdown(self, golden=None):
+        """Print per-row, per-bit and per-stage tables."""
+        if self.by_row:
+            print("\n=== Coverage per Row ===")
+            for row, (t, d) in sorted(self.by_row.items()):
+                print(f"  row {row}: {d / t * 100:.2f}% ({d}/{t})")
+        if self.by_bit:
+            print("\n=== Coverage per Bit ===")
+            for bit, (t, d) in sorted(self.by_bit.items()):
+                print(f"  bit {bit:>4}: {d / t * 100:.2f}% ({d}/{t})")
+        print("\n=== Detections per Stage (cumulative coverage) ===")
+        for point in self.curve(golden):
+            stage_id = point["stage"]
+            print(f"  stage {stage_id}: {self.by_stage.get(stage_id, 0):>6} detected, "
+                  f"{point['patterns']:>3} patterns -> {point['coverage'] * 100:.2f}%")
+
+
+def type_coverage(total, detected, by_type):
+    """Coverage dict from counts: total, SAF and BRIDGE, then any other type present."""
+    coverage = {"total": detected / total if total > 0 else 0}
+    for name in _BASE_TYPES + tuple(n for n in by_type if n not in _BASE_TYPES):
+        t, d = by_type.get(name, (0, 0))
+        if t or name in _BASE_TYPES:
+            coverage[name] = d / t if t else 0
+    return coverage
+
+
+def print_type_coverage(total, detected, by_type):
+    coverage = type_coverage(total, detected, by_type)
     print(f"\n=== Fault Coverage Summary ===")
-    print(f"  Total coverage: {coverage*100:.2f}% ({detected}/{total})")
-    print(f"  SAF coverage:   {saf_cov*100:.2f}% ({sum(1 for f in saf_faults if f.detected)}/{len(saf_faults)})")
-    print(f"  Bridge coverage:{bridge_cov*100:.2f}% ({sum(1 for f in bridge_faults if f.detected)}/{len(bridge_faults)})")
-
-    return {
-        "total": coverage,
-        "SAF": saf_cov,
-        "BRIDGE": bridge_cov
+    print(f"  Total coverage: {coverage['total']*100:.2f}% ({detected}/{total})")
+    for name in coverage:
+        if name == "total":
+            continue
+        t, d = by_type.get(name, (0, 0))
+        label = _LABELS.get(name, f"{name} cov.:".ljust(16))
+        print(f"  {label}{coverage[name]*100:.2f}% ({d}/{t})")
+
+
+def report_fault_coverage(total, detected, saf_total, saf_detected, bridge_total, bridge_detected,
+                          coupling_total=0, coupling_detected=0, silent=False):
+    """
+    Print the coverage summary and return the coverage dict from counts,
+    for engines that track detection in arrays instead of Fault objects.
+    COUPLING is only reported when the universe contains coupling faults.
+    silent=True skips the printout.
+    """
+    by_type = {
+        FAULT_TYPE_SAF: (saf_total, saf_detected),
+        FAULT_TYPE_BRIDGE: (bridge_total, bridge_detected),
+        FAULT_TYPE_COUPLING: (coupling_total, coupling_detected),
     }
+    if not silent:
+        print_type_coverage(total, detected, by_type)
+    return type_coverage(total, detected, by_type)
@@ -0,0 +1,173 @@
+import hashlib
+import json
+
+import numpy as np
+
+from main.fault_collapsing import fault_signature
+from main.fault_set import FaultSet
+from main.golden_cache import build_golden_table
+from main.main_engine import generate_fault_list
+
+# Bump when the on-disk layout changes
+DICTIONARY_FORMAT_VERSION = 2
+
+
+# ----------------------------------------------------------------------
+# Signatures
+#
+# A fault's full response (every stage, no fault dropping) is stored as
+# its deviation signature from main.fault_collapsing: per stage, the
+# tuple out_sum - expected, or None when the stage matches the golden
+# sums. The dictionary stores each class's signature as its repr() and
+# searches a 64-bit hash of it; a hash hit only counts when the stored
+# signature matches too, so colliding classes are never merged.
+# ----------------------------------------------------------------------
+def signature_key(signature):
+    return repr(signature)
+
+
+def signature_hash(key):
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def response_signature(observed, golden):
+    """
+    Deviation signature of measured stage outputs.
+
+    observed: per stage (in stage order) the list of sums read from the
+              die for that stage's input patterns.
+    """
+    stage_ids = sorted(golden["stages"])
+    if len(observed) != len(stage_ids):
+        raise ValueError(f"Expected outputs for {len(stage_ids)} stages, got {len(observed)}")
+
+    signature = []
+    for stage_id, outputs in zip(stage_ids, observed):
+        expected = golden["stages"][stage_id]["expected"]
+        if len(outputs) != len(expected):
+            raise ValueError(f"Stage {stage_id}: expected {len(expected)} outputs, got {len(outputs)}")
+        deviation = tuple(o - e for o, e in zip(outputs, expected))
+        signature.append(deviation if any(deviation) else None)
+    return tuple(signature)
+
+
+# ----------------------------------------------------------------------
+# Dictionary
+# ----------------------------------------------------------------------
+class FaultDictionary:
+    """
+    Full-response fault dictionary: response signature -> candidate faults.
+
+    Stored as the classes' signatures (signature_key strings) with their
+    hashes, sorted by hash, and CSR offsets into the fault indices of each
+    class, plus the fault universe itself (FaultSet records) and the
+    golden table needed to turn measured sums into a signature. Lookups
+    are a dict hit on the signature for one die and a single
+    np.searchsorted on the hashes for a batch, confirmed against the
+    stored signatures.
+    """
+
+    def __init__(self, hashes, signatures, offsets, members, faults, golden):
+        self.hashes = hashes            # (C,) uint64, sorted
+        self.signatures = signatures    # (C,) str, signature_key of each class
+        self.offsets = offsets          # (C+1,) start of each class in members
+        self.members = members          # (F,) fault indices grouped by class
+        self.faults = faults            # FaultSet of the whole universe
+        self.golden = golden
+        self._index = None
+
+    def __len__(self):
+        """Number of distinguishable response classes."""
+        return len(self.hashes)
+
+    # ------------------------------------------------------------------
+    # Construction / storage
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, algo, bit_width, fault_list=None, golden=None):
+        """Simulate every fault through every stage of `algo` and index the responses."""
+        if fault_list is None:
+            fault_list = generate_fault_list(bit_width)
+        golden = golden if golden is not None else build_golden_table(algo, bit_width)
+
+        index = {}
+        class_ids = np.fromiter(
+            (index.setdefault(signature_key(fault_signature(f, golden, bit_width)), len(index)) for f in fault_list),
+            dtype=np.int64, count=len(fault_list),
+        )
+        signatures = np.array(list(index), dtype=str)
+        hashes = np.fromiter((signature_hash(k) for k in index), dtype=np.uint64, count=len(index))
+
+        # classes in (hash, signature) order; faults grouped by class
+        class_order = np.lexsort((signatures, hashes))
+        rank = np.empty(len(index), dtype=np.int64)
+        rank[class_order] = np.arange(len(index))
+        class_ids = rank[class_ids]
+        order = np.argsort(class_ids, kind="stable")
+        offsets = np.append(0, np.cumsum(np.bincount(class_ids, minlength=len(index)))).astype(np.int64)
+
+        faults = fault_list if isinstance(fault_list, FaultSet) else FaultSet.from_faults(fault_list)
+        faults = FaultSet(faults.records.copy())
+        faults.detect_stage[:] = 0
+
+        return cls(hashes[class_order], signatures[class_order], offsets, order.astype(np.int64), faults, golden)
+
+    def save(self, path):
+        meta = {"format": DICTIONARY_FORMAT_VERSION, "golden": self.golden}
+        np.savez_compressed(
+            path,
+            hashes=self.hashes, signatures=self.signatures, offsets=self.offsets, members=self.members,
+            faults=self.faults.records, meta=np.array(json.dumps(meta)),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format") != DICTIONARY_FORMAT_VERSION:
+                raise ValueError(f"{path}: unsupported fault dictionary format {meta.get('format')}")
+            golden = meta["golden"]
+            golden["stages"] = {int(s): stage for s, stage in golden["stages"].items()}
+            return cls(
+                data["hashes"], data["signatures"], data["offsets"], data["members"],
+                FaultSet(data["faults"]), golden,
+            )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _class_of(self, key):
+        if self._index is None:
+            self._index = {k: c for c, k in enumerate(self.signatures.tolist())}
+        return self._index.get(key)
+
+    def candidate_indices(self, observed):
+        """Indices (into self.faults) of the faults explaining one die's sums."""
+        c = self._class_of(signature_key(response_signature(observed, self.golden)))
+        if c is None:
+            return np.zeros(0, dtype=np.int64)
+        return self.members[self.offsets[c]:self.offsets[c + 1]]
+
+    def diagnose(self, observed):
+        """Candidate faults of one die, as a FaultSet (empty: no modelled fault matches)."""
+        return FaultSet(self.faults.records[self.candidate_indices(observed)])
+
+    def diagnose_batch(self, observed_list):
+        """candidate_indices() for many dies, with one vectorised lookup."""
+        keys = [signature_key(response_signature(obs, self.golden)) for obs in observed_list]
+        hashes = np.fromiter((signature_hash(k) for k in keys), dtype=np.uint64, count=len(keys))
+        lo = np.searchsorted(self.hashes, hashes, side="left")
+        hi = np.searchsorted(self.hashes, hashes, side="right")
+
+        candidates = []
+        for key, first, last in zip(keys, lo.tolist(), hi.tolist()):
+            # every class with this hash; the stored signature decides
+            c = next((c for c in range(first, last) if self.signatures[c] == key), None)
+            candidates.append(
+                np.zeros(0, dtype=np.int64) if c is None else self.members[self.offsets[c]:self.offsets[c + 1]]
+            )
+        return candidates
+
+    def class_sizes(self):
+        return np.diff(self.offsets)
@@ -0,0 +1,294 @@
+import numpy as np
+
+from config.config import (
+    FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE, FAULT_TYPE_COUPLING, FAULT_TYPE_TREE, BRIDGE_TYPES_ACTIVE
+)
+from main.fault_classes import Fault
+
+# Fault type codes stored in the "kind" column
+KIND_SAF      = 0
+KIND_BRIDGE   = 1
+KIND_COUPLING = 2
+KIND_TREE     = 3
+
+FAULT_TYPES = (FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE, FAULT_TYPE_COUPLING, FAULT_TYPE_TREE)
+TRANSITIONS = ("0->1", "1->0")
+
+# One fixed-size record per fault (~30 bytes instead of a Fault __dict__)
+FAULT_DTYPE = np.dtype([
+    ("kind",         np.int8),
+    ("row",          np.int32),    # SAF row (1-based) / TREE node level
+    ("col",          np.int32),    # SAF column (macro universes) / TREE node index
+    ("bit",          np.int16),    # SAF bit / TREE node bit
+    ("forced",       np.int8),     # SAF / TREE stuck value
+    ("i",            np.int32),    # BRIDGE input i
+    ("j",            np.int32),    # BRIDGE input j
+    ("bridge_type",  np.int8),
+    ("aggr_row",     np.int8),     # COUPLING aggressor row (1 or 2)
+    ("aggr_bit",     np.int16),
+    ("victim_bit",   np.int16),
+    ("transition",   np.int8),     # index into TRANSITIONS
+    ("detect_stage", np.int16),    # 0 = undetected
+])
+
+
+def fault_record(f):
+    """FAULT_DTYPE record (as a tuple) of a Fault or FaultView."""
+    kind = row = col = bit = forced = i = j = bridge_type = 0
+    aggr_row = aggr_bit = victim_bit = transition = 0
+
+    if f.fault_type == FAULT_TYPE_SAF:
+        kind = KIND_SAF
+        (row, bit), forced = f.index, f.forced_value
+        col = getattr(f, "col", None) or 0
+    elif f.fault_type == FAULT_TYPE_BRIDGE:
+        kind = KIND_BRIDGE
+        i, j, bridge_type = f.i, f.j, f.bridge_type
+    elif f.fault_type == FAULT_TYPE_COUPLING:
+        kind = KIND_COUPLING
+        aggr_row, aggr_bit, victim_bit = f.aggr_row, f.aggr_bit, f.victim_bit
+        transition = TRANSITIONS.index(f.transition)
+    elif f.fault_type == FAULT_TYPE_TREE:
+        kind = KIND_TREE
+        (row, col), bit, forced = f.node, f.node_bit, f.forced_value
+    else:
+        raise ValueError(f"Unknown fault type {f.fault_type}")
+
+    detect_stage = 0
+    if f.detected:
+        detect_stage = f.detect_pattern["stage"] if f.detect_pattern else -1
+
+    return (kind, row, col, bit, forced, i, j, bridge_type,
+            aggr_row, aggr_bit, victim_bit, transition, detect_stage)
+
+
+class FaultView:
+    """
+    Lightweight stand-in for a Fault, backed by one FaultSet record.
+
+    Exposes the Fault attributes read by inject_fault, simulate_fault and
+    calculate_fault_coverage. Writing detected / detect_pattern updates the
+    record; only the detecting stage is kept, not the pattern list.
+    """
+
+    __slots__ = ("_records", "_k", "prev_bits", "curr_bits")
+
+    def __init__(self, records, k):
+        self._records = records
+        self._k = k
+        self.prev_bits = None     # COUPLING: set per stage by the simulator
+        self.curr_bits = None
+
+    def _field(self, name, kind):
+        rec = self._records[self._k]
+        return int(rec[name]) if rec["kind"] == kind else None
+
+    @property
+    def fault_type(self):
+        return FAULT_TYPES[self._records["kind"][self._k]]
+
+    # SAF fields
+    @property
+    def index(self):
+        rec = self._records[self._k]
+        return (int(rec["row"]), int(rec["bit"])) if rec["kind"] == KIND_SAF else None
+
+    @property
+    def col(self):
+        return self._field("col", KIND_SAF)
+
+    @property
+    def forced_value(self):
+        rec = self._records[self._k]
+        return int(rec["forced"]) if rec["kind"] in (KIND_SAF, KIND_TREE) else None
+
+    # BRIDGE fields
+    @property
+    def i(self):
+        return self._field("i", KIND_BRIDGE)
+
+    @property
+    def j(self):
+        return self._field("j", KIND_BRIDGE)
+
+    @property
+    def bridge_type(self):
+        return self._field("bridge_type", KIND_BRIDGE)
+
+    # COUPLING fields
+    @property
+    def aggr_row(self):
+        return self._field("aggr_row", KIND_COUPLING)
+
+    @property
+    def aggr_bit(self):
+        return self._field("aggr_bit", KIND_COUPLING)
+
+    @property
+    def victim_bit(self):
+        return self._field("victim_bit", KIND_COUPLING)
+
+    @property
+    def transition(self):
+        code = self._field("transition", KIND_COUPLING)
+        return None if code is None else TRANSITIONS[code]
+
+    # TREE fields
+    @property
+    def node(self):
+        rec = self._records[self._k]
+        return (int(rec["row"]), int(rec["col"])) if rec["kind"] == KIND_TREE else None
+
+    @property
+    def node_bit(self):
+        return self._field("bit", KIND_TREE)
+
+    # Detection state
+    @property
+    def detected(self):
+        return bool(self._records["detect_stage"][self._k])
+
+    @detected.setter
+    def detected(self, value):
+        if not value:
+            self._records["detect_stage"][self._k] = 0
+        elif not self._records["detect_stage"][self._k]:
+            self._records["detect_stage"][self._k] = -1     # detected, stage unknown
+
+    @property
+    def detect_pattern(self):
+        stage = int(self._records["detect_stage"][self._k])
+        return {"stage": stage} if stage > 0 else None
+
+    @detect_pattern.setter
+    def detect_pattern(self, value):
+        self._records["detect_stage"][self._k] = value["stage"] if value else 0
+
+    __repr__ = Fault.__repr__
+
+
+class FaultSet:
+    """
+    Compact fault universe: a structured array of FAULT_DTYPE records.
+
+    Iterating / indexing yields FaultView objects, so the set can be used
+    wherever a fault_list is expected (simulate_fault, calculate_fault_coverage),
+    while engines read the columns directly.
+    """
+
+    def __init__(self, records):
+        self.records = records
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def empty(cls, size):
+        return cls(np.zeros(size, dtype=FAULT_DTYPE))
+
+    @classmethod
+    def from_columns(cls, columns):
+        """From a dict of equal-length arrays named after FAULT_DTYPE fields."""
+        size = len(next(iter(columns.values())))
+        fault_set = cls.empty(size)
+        for name, values in columns.items():
+            fault_set.records[name] = values
+        return fault_set
+
+    @classmethod
+    def from_faults(cls, fault_list):
+        fault_set = cls.empty(len(fault_list))
+        for k, f in enumerate(fault_list):
+            fault_set.records[k] = fault_record(f)
+        return fault_set
+
+    @classmethod
+    def generate(cls, bit_width, bridge_types=BRIDGE_TYPES_ACTIVE):
+        """Same universe and order as generate_fault_list, built with NumPy."""
+        num_saf = 2 * 2 * bit_width
+        fault_set = cls.empty(num_saf + len(bridge_types))
+        rec = fault_set.records
+
+        saf = rec[:num_saf]
+        saf["kind"] = KIND_SAF
+        saf["row"] = np.repeat([1, 2], 2 * bit_width)
+        saf["bit"] = np.tile(np.repeat(np.arange(bit_width), 2), 2)
+        saf["forced"] = np.tile([0, 1], 2 * bit_width)
+
+        bridge = rec[num_saf:]
+        bridge["kind"] = KIND_BRIDGE
+        bridge["i"], bridge["j"] = 0, 1
+        bridge["bridge_type"] = bridge_types
+
+        return fault_set
+
+    @classmethod
+    def generate_coupling(cls, bit_width):
+        """Same universe and order as iter_coupling_faults, built with NumPy."""
+        n = bit_width
+        fault_set = cls.empty(2 * n * n * 2)
+        rec = fault_set.records
+
+        rec["kind"] = KIND_COUPLING
+        rec["aggr_row"] = np.repeat([1, 2], n * n * 2)
+        rec["aggr_bit"] = np.tile(np.repeat(np.arange(n), n * 2), 2)
+        rec["victim_bit"] = np.tile(np.repeat(np.arange(n), 2), 2 * n)
+        rec["transition"] = np.tile([0, 1], 2 * n * n)
+
+        return fault_set
+
+    # ------------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return FaultSet(self.records[k])
+        if k < 0:
+            k += len(self.records)
+        if not 0 <= k < len(self.records):
+            raise IndexError(k)
+        return FaultView(self.records, k)
+
+    def __iter__(self):
+        for k in range(len(self.records)):
+            yield FaultView(self.records, k)
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+    def columns(self, names=None):
+        """Dict of int64 column arrays (the encode_faults layout by default)."""
+        names = names or ("kind", "row", "bit", "forced", "i", "j", "bridge_type")
+        return {name: self.records[name].astype(np.int64) for name in names}
+
+    @property
+    def detect_stage(self):
+        return self.records["detect_stage"]
+
+    @property
+    def detected(self):
+        return self.records["detect_stage"] != 0
+
+    def to_faults(self):
+        """Expand back into regular Fault objects."""
+        fault_list = []
+        for view in self:
+            kind = self.records["kind"][view._k]
+            if kind == KIND_SAF:
+                f = Fault(FAULT_TYPE_SAF, view.index, view.forced_value)
+            elif kind == KIND_BRIDGE:
+                f = Fault(FAULT_TYPE_BRIDGE, i=view.i, j=view.j, bridge_type=view.bridge_type)
+            elif kind == KIND_COUPLING:
+                f = Fault(FAULT_TYPE_COUPLING, aggr_row=view.aggr_row, aggr_bit=view.aggr_bit,
+                          victim_bit=view.victim_bit, transition=view.transition)
+            elif kind == KIND_TREE:
+                f = Fault(FAULT_TYPE_TREE, forced_value=view.forced_value, node=view.node, node_bit=view.node_bit)
+            else:
+                raise ValueError(f"Unknown fault kind {kind} in record {view._k}")
+            f.detected = view.detected
+            f.detect_pattern = view.detect_pattern
+            fault_list.append(f)
+        return fault_list
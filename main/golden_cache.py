@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+
+from config.config import GOLDEN_CACHE_DIR
+from utils.bit_ops import bits_to_int
+
+# Bump when the layout or the hardware model behind "expected" changes
+GOLDEN_FORMAT_VERSION = 1
+
+_memory_cache = {}
+
+
+# ----------------------------------------------------------------------
+# Table construction
+# ----------------------------------------------------------------------
+def _stage_definitions(algo):
+    """[(stage_id, in_patterns, row_weights), ...] straight from the algorithm."""
+    return [
+        (stage_id, algo.get_stage_patterns(stage_id), [list(w) for w in algo.get_stage_weights(stage_id)])
+        for stage_id in range(1, algo.get_required_stages() + 1)
+    ]
+
+
+def golden_key(algo, bit_width, definitions=None):
+    """
+    Content hash of an algorithm's stage plan at one bit_width.
+    Any change to a stage's patterns or weights gives a new key.
+    """
+    definitions = definitions if definitions is not None else _stage_definitions(algo)
+    payload = json.dumps(
+        [GOLDEN_FORMAT_VERSION, algo.__class__.__qualname__, bit_width, definitions],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def build_golden_table(algo, bit_width, definitions=None):
+    """
+    Fault-free ("golden") response of every stage:
+
+      table["stages"][stage_id] = {
+          "patterns":      input patterns,
+          "weights":       nominal weight bits per row,
+          "weight_values": row_value() of each row,
+          "expected":      fault-free out_sum per pattern,
+      }
+    """
+    definitions = definitions if definitions is not None else _stage_definitions(algo)
+    stages = {}
+
+    for stage_id, in_patterns, row_weights in definitions:
+        values = [bits_to_int(w[:bit_width]) for w in row_weights]
+        stages[stage_id] = {
+            "patterns": in_patterns,
+            "weights": row_weights,
+            "weight_values": values,
+            "expected": [sum(x * v for x, v in zip(in_bits, values)) for in_bits in in_patterns],
+        }
+
+    return {
+        "key": golden_key(algo, bit_width, definitions),
+        "algorithm": algo.__class__.__name__,
+        "bit_width": bit_width,
+        "stages": stages,
+    }
+
+
+# ----------------------------------------------------------------------
+# Cache
+# ----------------------------------------------------------------------
+def get_golden_table(algo, bit_width, cache_dir=GOLDEN_CACHE_DIR):
+    """
+    Golden table for (algorithm, bit_width), built at most once.
+
+    Tables are memoised in-process and, unless cache_dir is None, stored
+    as JSON under cache_dir so later runs reuse them. The file name holds
+    the content key, so an edited stage plan simply misses the cache.
+    """
+    definitions = _stage_definitions(algo)
+    key = golden_key(algo, bit_width, definitions)
+
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    table = None
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"{algo.__class__.__name__}_w{bit_width}_{key[:16]}.json")
+        if os.path.exists(path):
+            with open(path) as fh:
+                loaded = json.load(fh)
+            if loaded.get("key") == key:
+                loaded["stages"] = {int(s): stage for s, stage in loaded["stages"].items()}
+                table = loaded
+
+    if table is None:
+        table = build_golden_table(algo, bit_width, definitions)
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as fh:
+                json.dump(table, fh)
+            os.replace(tmp, path)
+
+    _memory_cache[key] = table
+    return table
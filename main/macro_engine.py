@@ -0,0 +1,249 @@
+import numpy as np
+from itertools import chain
+
+from config.config import NUM_ROW, NUM_COL, BRIDGE_TYPES_ACTIVE
+from main.fault_coverage_calculator import report_fault_coverage
+from main.vectorized_engine import BRIDGE_TABLE, KIND_SAF, KIND_BRIDGE, select_faults
+from utils.bit_ops import bits_to_int, sum_dtype
+
+MACRO_FIELDS = ("kind", "row", "col", "bit", "forced", "i", "j", "bridge_type")
+
+
+# ----------------------------------------------------------------------
+# Fault universe
+# ----------------------------------------------------------------------
+def macro_fault_universe(bit_width, num_rows=NUM_ROW, num_cols=NUM_COL,
+                         bridge_types=BRIDGE_TYPES_ACTIVE):
+    """
+    Columnar fault universe of a num_rows x num_cols macro:
+      - SA0/SA1 on every weight bit of every (row, column) cell
+      - a bridge per active type between each pair of adjacent input rows
+
+    2*R*C*N SAFs + (R-1)*len(bridge_types) bridges, built without any
+    per-fault Python objects. Same conventions as generate_fault_list:
+    SAF rows are 1-based, bridge inputs i/j are 0-based.
+    """
+    bridge_types = np.asarray(bridge_types, dtype=np.int64)
+    num_saf = 2 * num_rows * num_cols * bit_width
+    num_bridge = max(num_rows - 1, 0) * len(bridge_types)
+
+    faults = {name: np.zeros(num_saf + num_bridge, dtype=np.int64) for name in MACRO_FIELDS}
+
+    # SAF faults, ordered (row, col, bit, forced)
+    saf = slice(0, num_saf)
+    faults["kind"][saf] = KIND_SAF
+    faults["row"][saf] = np.repeat(np.arange(1, num_rows + 1), num_cols * bit_width * 2)
+    faults["col"][saf] = np.tile(np.repeat(np.arange(num_cols), bit_width * 2), num_rows)
+    faults["bit"][saf] = np.tile(np.repeat(np.arange(bit_width), 2), num_rows * num_cols)
+    faults["forced"][saf] = np.tile([0, 1], num_rows * num_cols * bit_width)
+
+    # Bridging faults between rows r and r+1
+    bridge = slice(num_saf, num_saf + num_bridge)
+    faults["kind"][bridge] = KIND_BRIDGE
+    faults["i"][bridge] = np.repeat(np.arange(num_rows - 1), len(bridge_types))
+    faults["j"][bridge] = faults["i"][bridge] + 1
+    faults["bridge_type"][bridge] = np.tile(bridge_types, max(num_rows - 1, 0))
+
+    return faults
+
+
+def describe_macro_fault(faults, k):
+    """Fault.__repr__-style description of entry k of a macro universe."""
+    if faults["kind"][k] == KIND_SAF:
+        return (f"SAF(row={faults['row'][k]}, col={faults['col'][k]}, "
+                f"bit={faults['bit'][k]}, forced={faults['forced'][k]})")
+    return f"BRIDGE(i={faults['i'][k]}, j={faults['j'][k]}, type={faults['bridge_type'][k]})"
+
+
+# ----------------------------------------------------------------------
+# Sparse stage model
+#
+# A stage only needs, per fault, the (pattern, column) sums that differ
+# from the fault-free ones.  A weight SAF can only change the patterns
+# that drive its row; a bridge only those driving one of its two rows.
+# Enumerating exactly those keeps the work at O(nnz(patterns) * C * N).
+# ----------------------------------------------------------------------
+def _rows_to_patterns(active_rows, num_rows):
+    """
+    CSR views of the stage patterns:
+      pattern_of, driven -> (pattern, row) pairs driven to 1
+      row_ptr, row_patterns -> patterns driving each row
+    """
+    lengths = np.fromiter((len(rows) for rows in active_rows), dtype=np.int64, count=len(active_rows))
+    driven = np.fromiter(chain.from_iterable(active_rows), dtype=np.int64, count=int(lengths.sum()))
+    pattern_of = np.repeat(np.arange(len(active_rows)), lengths)
+
+    order = np.argsort(driven, kind="stable")
+    row_ptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(driven, minlength=num_rows), out=row_ptr[1:])
+
+    return pattern_of, driven, row_ptr, pattern_of[order]
+
+
+def _expand(row_ptr, row_patterns, rows):
+    """(owner, pattern) for every pattern driving rows[owner]."""
+    starts = row_ptr[rows]
+    lengths = row_ptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows)), lengths)
+    offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, row_patterns[np.repeat(starts, lengths) + offsets]
+
+
+def stage_deviations(faults, active_rows, row_weights, bit_width, num_cols, dtype):
+    """
+    All (fault, pattern, column) sums of one stage that deviate from the
+    fault-free macro.
+
+    Returns (fault, pattern, col, observed, expected) arrays sorted by
+    fault, pattern, column. `fault` indexes into `faults`.
+    """
+    num_rows = len(row_weights)
+    num_patterns = len(active_rows)
+
+    values = np.array([bits_to_int(w[:bit_width]) for w in row_weights], dtype=dtype)
+    bits = np.asarray(row_weights, dtype=np.int64)[:, :bit_width]
+
+    pattern_of, driven, row_ptr, row_patterns = _rows_to_patterns(active_rows, num_rows)
+    golden = np.zeros(num_patterns, dtype=dtype)
+    np.add.at(golden, pattern_of, values[driven])
+    driven_keys = np.append(np.sort(pattern_of * num_rows + driven), -1)
+
+    def is_driven(pattern, row):
+        keys = pattern * num_rows + row
+        pos = np.searchsorted(driven_keys[:-1], keys)
+        return (driven_keys[pos] == keys).astype(np.int64)
+
+    parts = []
+
+    # -----------------------------
+    # SAF: +/- 2^bit on the patterns driving the faulty row
+    # -----------------------------
+    saf = np.flatnonzero(faults["kind"] == KIND_SAF)
+    row = faults["row"][saf] - 1
+    bit = faults["bit"][saf]
+    sign = faults["forced"][saf] - bits[row, bit]
+    saf, row, bit, sign = saf[sign != 0], row[sign != 0], bit[sign != 0], sign[sign != 0]
+
+    owner, pattern = _expand(row_ptr, row_patterns, row)
+    delta = sign.astype(dtype) * np.left_shift(np.ones(len(bit), dtype=dtype), bit.astype(dtype))
+    parts.append((saf[owner], pattern, faults["col"][saf][owner], golden[pattern] + delta[owner]))
+
+    # -----------------------------
+    # BRIDGE: faulty input pair on the patterns driving either row
+    # -----------------------------
+    bridge = np.flatnonzero(faults["kind"] == KIND_BRIDGE)
+    bi, bj = faults["i"][bridge], faults["j"][bridge]
+
+    owner_i, pattern_i = _expand(row_ptr, row_patterns, bi)
+    owner_j, pattern_j = _expand(row_ptr, row_patterns, bj)
+    keys = np.unique(np.concatenate([owner_i, owner_j]) * num_patterns +
+                     np.concatenate([pattern_i, pattern_j]))
+    owner, pattern = keys // num_patterns, keys % num_patterns
+
+    a = is_driven(pattern, bi[owner])
+    b = is_driven(pattern, bj[owner])
+    faulty = BRIDGE_TABLE[faults["bridge_type"][bridge][owner], a, b]
+    delta = ((faulty[:, 0] - a).astype(dtype) * values[bi[owner]] +
+             (faulty[:, 1] - b).astype(dtype) * values[bj[owner]])
+    keep = delta != 0
+    owner, pattern, delta = owner[keep], pattern[keep], delta[keep]
+
+    # inputs are shared, so every column sees the same deviation
+    parts.append((
+        np.repeat(bridge[owner], num_cols),
+        np.repeat(pattern, num_cols),
+        np.tile(np.arange(num_cols), len(owner)),
+        np.repeat(golden[pattern] + delta, num_cols),
+    ))
+
+    fault = np.concatenate([p[0] for p in parts])
+    pattern = np.concatenate([p[1] for p in parts])
+    col = np.concatenate([p[2] for p in parts])
+    observed = np.concatenate([p[3] for p in parts])
+
+    order = np.lexsort((col, pattern, fault))
+    fault, pattern, col, observed = fault[order], pattern[order], col[order], observed[order]
+    return fault, pattern, col, observed, golden[pattern]
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+def _macro_size(algo, name, value):
+    """algo's num_rows / num_cols, checked against an explicitly given one."""
+    expected = getattr(algo, name, None)
+    if value is None:
+        if expected is not None:
+            return expected
+        return NUM_ROW if name == "num_rows" else NUM_COL
+    if expected is not None and value != expected:
+        raise ValueError(f"macro_engine: {name}={value} but {algo.__class__.__name__} "
+                         f"was built for {name}={expected}")
+    return value
+
+
+def macro_engine(bit_width, algo, num_rows=None, num_cols=None, verbose=True, silent=False):
+    """
+    Fault simulation of a num_rows x num_cols macro.
+
+    `algo` must provide the sparse stage API of MultiRowDetectionAlgorithm
+    (get_stage_active_rows, get_stage_weights with one vector per row,
+    analyze_stage_batch, observe_batch). A fault is detected at the first
+    stage where any of its deviating (pattern, column) sums is flagged,
+    and classified by the first such entry.
+
+    num_rows / num_cols default to the macro size `algo` was built for;
+    a different size raises ValueError, since the stage plan would not
+    cover the macro.
+    silent: print nothing at all (overrides verbose), as in main_engine.
+    """
+    verbose = verbose and not silent
+    num_rows = _macro_size(algo, "num_rows", num_rows)
+    num_cols = _macro_size(algo, "num_cols", num_cols)
+
+    faults = macro_fault_universe(bit_width, num_rows, num_cols)
+    num_faults = len(faults["kind"])
+    dtype = sum_dtype(bit_width, num_rows)
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' "
+              f"(bit_width={bit_width}, macro {num_rows}x{num_cols}, {num_faults} faults)...")
+
+    detect_stage = np.zeros(num_faults, dtype=np.int64)
+
+    for stage_id in range(1, algo.get_required_stages() + 1):
+
+        active = np.flatnonzero(detect_stage == 0)
+        if active.size == 0:
+            break
+
+        fault, pattern, col, observed, expected = stage_deviations(
+            select_faults(faults, active),
+            algo.get_stage_active_rows(stage_id),
+            algo.get_stage_weights(stage_id),
+            bit_width, num_cols, dtype,
+        )
+
+        codes = algo.analyze_stage_batch(stage_id, observed, expected)
+        flagged = codes >= 0
+
+        # entries are sorted by fault, so the first flagged one classifies it
+        newly, first = np.unique(fault[flagged], return_index=True)
+        algo.observe_batch(stage_id, codes[flagged][first])
+        detect_stage[active[newly]] = stage_id
+
+    if verbose:
+        for k in range(num_faults):
+            state = "Detected" if detect_stage[k] else "Undetected"
+            print(f"→ {state} {describe_macro_fault(faults, k)}")
+
+    detected = detect_stage > 0
+    saf = faults["kind"] == KIND_SAF
+    bridge = faults["kind"] == KIND_BRIDGE
+
+    return report_fault_coverage(
+        num_faults, int(detected.sum()),
+        int(saf.sum()), int((detected & saf).sum()),
+        int(bridge.sum()), int((detected & bridge).sum()),
+        silent=silent,
+    )
@@ -1,89 +1,334 @@
+import time
+from itertools import islice
+
 from config.config import *
 from config.config import BRIDGE_TYPES_ACTIVE
+from main.checkpoint import CampaignCheckpoint
 from main.fault_classes import Fault
 from main.fault_coverage_calculator import calculate_fault_coverage
 from main.fault_injection import inject_fault
-'''
-from algorithms.weighted_sum_detector import WeightedSumDetector
-from algorithms.parity_based_detector import ParityBasedDetector
-from algorithms.majority_based_detector import MajorityBasedDetector
-from algorithms.five_stage_detection_algorithm import FiveStageDetectionAlgorithm
-from utils.weight_patterns.generator import WeightPatternGenerator
-'''
 
-def main_engine(bit_width, algo, verbose=True):
 
-    # -----------------------------
-    # Helper: weighted sum
-    # -----------------------------
-    def row_value(bits):
-        return sum((bits[i] << i) for i in range(bit_width))
+def iter_faults(bit_width, bridge_types=None, fault_mode=None):
+    """
+    Lazily yield the fault universe simulated by the engines:
+      - SA0/SA1 on every weight bit of R1 and R2
+      - one R1<->R2 input bridge per active bridge type
+      - R1<->R2 coupling faults (COUPLING / ALL modes only)
 
-    # -----------------------------
-    # Fault generation
-    # -----------------------------
-    fault_list = []
+    bridge_types and fault_mode default to BRIDGE_TYPES_ACTIVE / FAULT_MODE.
+    """
+    bridge_types = BRIDGE_TYPES_ACTIVE if bridge_types is None else bridge_types
+    fault_mode = FAULT_MODE if fault_mode is None else fault_mode
+    if fault_mode not in FAULT_MODES:
+        raise ValueError(f"Unknown fault_mode {fault_mode!r} (expected one of {FAULT_MODES})")
 
     # SAF faults
-    for row in (1, 2):
-        for bit in range(bit_width):
-            fault_list.append(Fault(FAULT_TYPE_SAF, (row, bit), 0))
-            fault_list.append(Fault(FAULT_TYPE_SAF, (row, bit), 1))
+    if fault_mode in ("SAF", "BOTH", "ALL"):
+        for row in (1, 2):
+            for bit in range(bit_width):
+                yield Fault(FAULT_TYPE_SAF, (row, bit), 0)
+                yield Fault(FAULT_TYPE_SAF, (row, bit), 1)
 
     # Bridging faults
-    for bt in BRIDGE_TYPES_ACTIVE:
-        fault_list.append(Fault(FAULT_TYPE_BRIDGE, i=0, j=1, bridge_type=bt))
+    if fault_mode in ("BRIDGE", "BOTH", "ALL"):
+        for bt in bridge_types:
+            yield Fault(FAULT_TYPE_BRIDGE, i=0, j=1, bridge_type=bt)
 
-    print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width})...")
+    # Coupling faults
+    if fault_mode in ("COUPLING", "ALL"):
+        yield from iter_coupling_faults(bit_width)
 
-    # -----------------------------
-    # Main simulation loop
-    # -----------------------------
-    total_stages = algo.get_required_stages()
 
-    for f in fault_list:
+def iter_coupling_faults(bit_width):
+    """
+    Lazily yield every R1<->R2 coupling fault: an aggressor bit of one row
+    whose write transition inverts a victim bit of the other row.
+    4 * bit_width^2 faults, ordered (aggr_row, aggr_bit, victim_bit, transition).
+    """
+    for aggr_row in (1, 2):
+        for aggr_bit in range(bit_width):
+            for victim_bit in range(bit_width):
+                for transition in ("0->1", "1->0"):
+                    yield Fault(FAULT_TYPE_COUPLING, aggr_row=aggr_row, aggr_bit=aggr_bit,
+                                victim_bit=victim_bit, transition=transition)
+
+
+def generate_fault_list(bit_width, bridge_types=None, fault_mode=None):
+    """The whole iter_faults() universe as a list."""
+    return list(iter_faults(bit_width, bridge_types, fault_mode))
+
+
+def weight_delta(f, stage, bit_width):
+    """
+    (row, delta) for a fault that alters one stored weight bit during a
+    stage: an SAF, or a COUPLING fault whose aggressor transition fires
+    (prev_bits / curr_bits set by the caller). delta is the change of that
+    row's value, 0 when the stage's weights are left intact.
+    """
+    values = stage["weight_values"]
+
+    if f.fault_type == FAULT_TYPE_SAF:
+        row, bit = f.index
+        forced = f.forced_value
+    else:
+        row, bit = 3 - f.aggr_row, f.victim_bit
+        edge = (f.prev_bits[f.aggr_bit], f.curr_bits[f.aggr_bit])
+        if edge != ((0, 1) if f.transition == "0->1" else (1, 0)):
+            return row, 0
+        forced = None
+
+    if not (1 <= row <= len(values)) or bit >= bit_width:
+        return row, 0
+
+    nominal = values[row - 1]
+    if forced is None:
+        forced = 1 - ((nominal >> bit) & 1)      # victim bit inverted
+    return row, ((nominal & ~(1 << bit)) | (forced << bit)) - nominal
+
+
+def golden_stage_outputs(f, stage, bit_width, inject=inject_fault):
+    """
+    Faulty stage outputs derived from a golden-table stage entry.
+
+    Only the terms a fault actually touches are recomputed:
+      - SAF / COUPLING: the faulty row's value, and only on patterns
+        driving that row
+      - BRIDGE: patterns whose inputs the bridge really changes
+    Everything else reuses the fault-free sums. Other fault types fall
+    back to the full inject_fault path.
+
+    inject: inject_fault, or a stand-in with its signature (e.g. the
+            profiler's counting wrapper).
+    """
+    in_patterns = stage["patterns"]
+    expected = stage["expected"]
+    values = stage["weight_values"]
+
+    if f.fault_type in (FAULT_TYPE_SAF, FAULT_TYPE_COUPLING):
+        row, delta = weight_delta(f, stage, bit_width)
+        if delta == 0:
+            return expected
+        return [e + in_bits[row - 1] * delta for in_bits, e in zip(in_patterns, expected)]
+
+    if f.fault_type == FAULT_TYPE_BRIDGE:
+        outputs = []
+        for in_bits, e in zip(in_patterns, expected):
+            in_f, _ = inject(in_bits, [], f, verbose=False)
+            if in_f == in_bits:
+                outputs.append(e)
+            else:
+                outputs.append(sum(x * v for x, v in zip(in_f, values)))
+        return outputs
+
+    return _stage_outputs(f, in_patterns, *stage["weights"], bit_width=bit_width, inject=inject)
+
+
+def row_value(bits, bit_width):
+    """Weighted sum of a row's weight bits (bit i carries 2^i)."""
+    return sum((bits[i] << i) for i in range(bit_width))
+
+
+def _stage_outputs(f, in_patterns, row1_nom, row2_nom, bit_width, inject=inject_fault):
+    """Faulty out_sum of each input pattern, injecting the fault into both rows."""
+
+    stage_outputs = []
+
+    # Hardware simulation for each input pattern
+    for in_bits in in_patterns:
+
+        # inject fault into each row
+        in_f1, w_f1 = inject(in_bits, row1_nom, f, row_id=1, verbose=False)
+        in_f2, w_f2 = inject(in_bits, row2_nom, f, row_id=2, verbose=False)
+
+        # compute weighted sum (hardware)
+        out_sum = (in_f1[0] * row_value(w_f1, bit_width)) + \
+                  (in_f2[1] * row_value(w_f2, bit_width))
+
+        # collect stage output
+        stage_outputs.append(out_sum)
 
-        detected = False
+    return stage_outputs
 
-        # Let the algorithm control stages
-        for stage_id in range(1, total_stages + 1):
 
+def stage_pattern_counts(algo, golden=None):
+    """stage_id -> number of input patterns, over algo's whole stage plan."""
+    if golden is not None:
+        return {stage_id: len(stage["patterns"]) for stage_id, stage in golden["stages"].items()}
+    return {
+        stage_id: len(algo.get_stage_patterns(stage_id))
+        for stage_id in range(1, algo.get_required_stages() + 1)
+    }
+
+
+def set_write_transition(f, prev_weights, row_weights, bit_width):
+    """
+    Point a COUPLING fault at its aggressor row's write for this stage:
+    prev_bits is the row content before the write (all zero before the
+    first stage), curr_bits the weights the stage writes.
+    """
+    row = f.aggr_row - 1
+    f.prev_bits = list(prev_weights[row]) if prev_weights else [0] * bit_width
+    f.curr_bits = list(row_weights[row])
+
+
+def simulate_fault(f, algo, bit_width, golden=None, profiler=None, inject=inject_fault):
+    """
+    Run the algorithm's stages on a single fault until one detects it.
+
+    With a golden table (main.golden_cache) the stage plan and fault-free
+    sums come from the table instead of being rebuilt for every fault.
+    inject is the fault injector used for the faulty outputs (main_engine
+    passes the profiler's counting wrapper of inject_fault).
+
+    Each stage rewrites both rows, so a COUPLING fault sees the transition
+    from the previous stage's weights to the current ones.
+
+    Sets f.detected / f.detect_pattern and returns the detecting stage_id
+    (0 if no stage detects the fault).
+    """
+    prev_weights = None
+
+    # Let the algorithm control stages
+    for stage_id in range(1, algo.get_required_stages() + 1):
+
+        if profiler is not None:
+            stage_start = time.perf_counter()
+
+        if golden is not None:
+            stage = golden["stages"][stage_id]
+            in_patterns = stage["patterns"]
+            row_weights = stage["weights"]
+        else:
             # Algorithm controls all patterns & weights
             in_patterns = algo.get_stage_patterns(stage_id)
-            row1_nom, row2_nom = algo.get_stage_weights(stage_id)
+            row_weights = algo.get_stage_weights(stage_id)
 
-            stage_outputs = []
+        if f.fault_type == FAULT_TYPE_COUPLING:
+            set_write_transition(f, prev_weights, row_weights, bit_width)
+            prev_weights = row_weights
 
-            # Hardware simulation for each input pattern
-            for in_bits in in_patterns:
+        if golden is not None:
+            stage_outputs = golden_stage_outputs(f, stage, bit_width, inject)
+        else:
+            row1_nom, row2_nom = row_weights
+            stage_outputs = _stage_outputs(f, in_patterns, row1_nom, row2_nom, bit_width, inject)
 
-                # inject fault into each row
-                in_f1, w_f1 = inject_fault(in_bits, row1_nom, f, row_id=1, verbose=False)
-                in_f2, w_f2 = inject_fault(in_bits, row2_nom, f, row_id=2, verbose=False)
+        # give all outputs to algorithm
+        result = algo.observe(stage_id, in_patterns, stage_outputs)
 
-                # compute weighted sum (hardware)
-                out_sum = (in_f1[0] * row_value(w_f1)) + \
-                          (in_f2[1] * row_value(w_f2))
+        if profiler is not None:
+            profiler.record_stage(stage_id, time.perf_counter() - stage_start)
 
-                # collect stage output
-                stage_outputs.append(out_sum)
+        if result["detected"]:
+            f.detected = True
+            f.detect_pattern = {
+                "stage": stage_id,
+                "patterns": in_patterns,
+                "fault_type": result["fault_type"],
+                "location": result["location"],
+            }
+            return stage_id
 
-            # give all outputs to algorithm
-            result = algo.observe(stage_id, in_patterns, stage_outputs)
+    return 0
 
-            if result["detected"]:
-                f.detected = True
-                f.detect_pattern = {"stage": stage_id, "patterns": in_patterns}
-                detected = True
-                break
 
-        if verbose:
-            if detected:
-                print(f"→ Detected {f}")
-            else:
-                print(f"→ Undetected {f}")
+def main_engine(bit_width, algo, verbose=True, golden=None, fault_list=None,
+                profiler=None, silent=False, writer=None, checkpoint=None, resume=False,
+                accumulator=None):
+    """
+    Reference fault campaign: one fault at a time through every stage.
+
+    golden:     optional table from main.golden_cache.get_golden_table(algo,
+                bit_width); fault-free terms are then reused across faults.
+    fault_list: optional list of Faults or FaultSet to simulate instead of
+                generate_fault_list(bit_width).
+    profiler:   optional main.profiler.SimulationProfiler; stage / fault-type
+                timings and inject_fault calls are recorded into it.
+    silent:     print nothing at all (overrides verbose), for high-throughput
+                runs that only need the returned coverage.
+    writer:     optional main.result_writer.ResultWriter receiving every
+                finished fault (the caller closes it).
+    checkpoint: optional path; progress, per-fault detection state and the
+                algorithm's counters are saved there every CHECKPOINT_INTERVAL
+                seconds and at the end.
+    resume:     continue from the checkpoint file if it exists (same
+                algorithm, bit_width and fault list). Profiler and writer
+                then only see the faults simulated in this run.
+    accumulator: optional CoverageAccumulator the finished fault list is
+                folded into, for per-row / per-bit / per-stage breakdowns;
+                the stage plan's pattern counts are recorded in it too.
+    """
+    verbose = verbose and not silent
+
+    # -----------------------------
+    # Fault generation
+    # -----------------------------
+    if fault_list is None:
+        fault_list = generate_fault_list(bit_width)
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width})...")
+
+    # -----------------------------
+    # Checkpoint / resume
+    # -----------------------------
+    start = 0
+    checkpointer = None
+    if checkpoint is not None:
+        checkpointer = CampaignCheckpoint(checkpoint, algo, bit_width, fault_list)
+        if resume:
+            start = checkpointer.restore(
+                fault_list,
+                lambda sid: golden["stages"][sid]["patterns"] if golden else algo.get_stage_patterns(sid),
+            )
+            if start and not silent:
+                print(f"Resuming from fault {start}/{len(fault_list)} ({checkpoint})")
+
+    # -----------------------------
+    # Main simulation loop
+    # -----------------------------
+    inject = inject_fault
+
+    if profiler is not None:
+        profiler.start(len(fault_list) - start, algo.get_required_stages())
+        inject = profiler.counted("inject_fault", inject_fault)
+
+    try:
+        for f in islice(fault_list, start, None):
+
+            if profiler is not None:
+                fault_start = time.perf_counter()
+
+            stage_id = simulate_fault(f, algo, bit_width, golden, profiler, inject)
+
+            if profiler is not None:
+                profiler.record_fault(f.fault_type, stage_id, time.perf_counter() - fault_start)
+
+            if writer is not None:
+                writer.add(f)
+
+            if checkpointer is not None:
+                checkpointer.record(f, stage_id)
+
+            if verbose:
+                if stage_id:
+                    print(f"→ Detected {f}")
+                else:
+                    print(f"→ Undetected {f}")
+    finally:
+        if profiler is not None:
+            profiler.finish()
+
+    if checkpointer is not None:
+        checkpointer.save()
 
     # -----------------------------
     # Fault coverage report
     # -----------------------------
-    return calculate_fault_coverage(fault_list)
\ No newline at end of file
+    if accumulator is None:
+        return calculate_fault_coverage(fault_list, silent=silent)
+    accumulator.record_stage_plan(stage_pattern_counts(algo, golden))
+    for f in fault_list:
+        accumulator.update(f)
+    return accumulator.report(silent)
@@ -0,0 +1,269 @@
+import itertools
+from math import comb
+
+from config.config import FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE
+from main.fault_injection import inject_fault
+from main.golden_cache import get_golden_table
+from main.main_engine import generate_fault_list, simulate_fault
+from main.parallel_engine import fresh_algorithm
+
+
+# ----------------------------------------------------------------------
+# Stage footprints
+#
+# touch: stages whose hardware the fault alters at all
+#        SAF     the stage writes the opposite of the stuck value
+#        BRIDGE  the bridge changes the inputs of some pattern
+# drive: stages whose outputs the fault alters on its own
+#        SAF     touch, and some pattern drives the faulty row
+#        BRIDGE  same as touch
+#
+# In a stage no other fault of a combination touches, the combination's
+# outputs are exactly the single fault's. Two SAFs only meet through the
+# outputs, so for an SAF pair the drive masks decide; as soon as a bridge
+# is involved the touch masks do (a bridge may drive a row the SAF sits on).
+# ----------------------------------------------------------------------
+def fault_masks(f, golden):
+    """(touch, drive) bitmasks over stages (bit s-1 = stage s)."""
+    touch = drive = 0
+    for stage_id, stage in golden["stages"].items():
+        bit = 1 << (stage_id - 1)
+
+        if f.fault_type == FAULT_TYPE_SAF:
+            row, k = f.index
+            if ((stage["weight_values"][row - 1] >> k) & 1) != f.forced_value:
+                touch |= bit
+                if any(in_bits[row - 1] for in_bits in stage["patterns"]):
+                    drive |= bit
+
+        elif f.fault_type == FAULT_TYPE_BRIDGE:
+            for in_bits in stage["patterns"]:
+                in_f, _ = inject_fault(in_bits, [], f)
+                if in_f != in_bits:
+                    touch |= bit
+                    drive |= bit
+                    break
+
+        else:
+            raise ValueError(f"Multi-fault simulation supports SAF and BRIDGE faults, not {f.fault_type}")
+
+    return touch, drive
+
+
+def stage_disjoint(key_a, key_b):
+    """True when two faults (given by their group keys) never share a stage."""
+    saf_a, touch_a, drive_a = key_a
+    saf_b, touch_b, drive_b = key_b
+    if saf_a and saf_b:
+        return not drive_a & drive_b
+    return not touch_a & touch_b
+
+
+def conflicting(combo):
+    """Two SAFs on the same weight cell cannot both be present."""
+    cells = [f.index for f in combo if f.fault_type == FAULT_TYPE_SAF]
+    return len(cells) != len(set(cells))
+
+
+# ----------------------------------------------------------------------
+# Simulation of one combination
+# ----------------------------------------------------------------------
+def combined_stage_outputs(combo, stage):
+    """
+    Stage outputs with all faults of `combo` applied together. Bridges
+    act on the inputs in combo order (bridges on one wire pair do not
+    commute), SAFs on the weights.
+    """
+    values = list(stage["weight_values"])
+    bridges = []
+    for f in combo:
+        if f.fault_type == FAULT_TYPE_SAF:
+            row, k = f.index
+            values[row - 1] = (values[row - 1] & ~(1 << k)) | (f.forced_value << k)
+        else:
+            bridges.append(f)
+
+    outputs = []
+    for in_bits in stage["patterns"]:
+        in_f = in_bits
+        for f in bridges:
+            in_f, _ = inject_fault(in_f, [], f)
+        outputs.append(sum(x * v for x, v in zip(in_f, values)))
+    return outputs
+
+
+def simulate_combination(combo, algo, golden):
+    """
+    Stage loop for a fault combination; stops at the first detecting stage.
+    Returns (stage_id, fault_type), (0, None) when undetected.
+    """
+    for stage_id in sorted(golden["stages"]):
+        stage = golden["stages"][stage_id]
+        result = algo.observe(stage_id, stage["patterns"], combined_stage_outputs(combo, stage))
+        if result["detected"]:
+            return stage_id, result["fault_type"]
+    return 0, None
+
+
+# ----------------------------------------------------------------------
+# Campaign
+# ----------------------------------------------------------------------
+def multi_fault_campaign(bit_width, algo, order=2, fault_list=None, golden=None, max_examples=10,
+                         silent=False):
+    """
+    Masking / aliasing of `algo` under combinations of `order` (2 or 3)
+    simultaneous SAF / BRIDGE faults.
+
+    Faults are grouped by their stage footprints. A combination whose
+    faults are pairwise stage-disjoint behaves, stage by stage, exactly like
+    one of its faults alone: it is detected at the earliest single-fault
+    detecting stage and can neither mask nor alias. Such combinations are
+    only counted (per group, without enumerating them); every other one is
+    simulated. Combinations putting two SAFs on one cell are excluded;
+    faults of a combination are applied in fault-list order.
+
+    masked:  undetected, although some fault of the combination is
+             detected on its own
+    aliased: detected, but classified as a fault type none of its faults
+             gets on its own
+
+    silent: print nothing (no header, no report).
+
+    Returns a dict of counts and rates plus a few masked examples.
+    """
+    if order not in (2, 3):
+        raise ValueError(f"order must be 2 or 3, got {order}")
+    if fault_list is None:
+        fault_list = generate_fault_list(bit_width)
+    golden = golden if golden is not None else get_golden_table(algo, bit_width)
+
+    if not silent:
+        print(f"\nMulti-fault campaign: '{algo.__class__.__name__}' (bit_width={bit_width}, order={order})...")
+
+    # -----------------------------
+    # Single-fault reference (fresh Fault state, scratch counters)
+    # -----------------------------
+    scratch = fresh_algorithm(algo)
+    single_stage = []
+    single_type = []
+    for f in fault_list:
+        saved = (f.detected, f.detect_pattern)
+        stage_id = simulate_fault(f, scratch, bit_width, golden)
+        single_stage.append(stage_id)
+        single_type.append(f.detect_pattern["fault_type"] if stage_id else None)
+        f.detected, f.detect_pattern = saved
+
+    # -----------------------------
+    # Footprint groups
+    # -----------------------------
+    groups = {}
+    for k, f in enumerate(fault_list):
+        key = (f.fault_type == FAULT_TYPE_SAF,) + fault_masks(f, golden)
+        groups.setdefault(key, []).append(k)
+    keys = list(groups)
+
+    def disjoint(group_ids):
+        for a, b in itertools.combinations(group_ids, 2):
+            if not stage_disjoint(keys[a], keys[b]):
+                return False
+        return True
+
+    def outcome_counts(members):
+        """[total, undetected] over all combinations of the given member lists."""
+        total = undetected = 1
+        for g, mult in members:
+            total *= comb(len(groups[keys[g]]), mult)
+            undetected *= comb(sum(1 for k in groups[keys[g]] if not single_stage[k]), mult)
+        return total, undetected
+
+    stats = {
+        "algorithm": algo.__class__.__name__,
+        "bit_width": bit_width,
+        "order": order,
+        "num_faults": len(fault_list),
+        "combinations": 0,
+        "pruned": 0,
+        "simulated": 0,
+        "detected": 0,
+        "masked": 0,
+        "aliased": 0,
+        "with_detectable_fault": 0,
+        "masked_examples": [],
+    }
+
+    pruned_total = pruned_undetected = 0
+    sim_algo = fresh_algorithm(algo)
+
+    for group_ids in itertools.combinations_with_replacement(range(len(keys)), order):
+        members = [(g, group_ids.count(g)) for g in sorted(set(group_ids))]
+
+        if disjoint(group_ids):
+            total, undetected = outcome_counts(members)
+            pruned_total += total
+            pruned_undetected += undetected
+            continue
+
+        per_group = [itertools.combinations(groups[keys[g]], mult) for g, mult in members]
+        for parts in itertools.product(*per_group):
+            idx = sorted(k for part in parts for k in part)
+            combo = [fault_list[k] for k in idx]
+            if conflicting(combo):
+                continue
+
+            stats["simulated"] += 1
+            stage_id, ftype = simulate_combination(combo, sim_algo, golden)
+            alone = [single_stage[k] for k in idx]
+
+            if any(alone):
+                stats["with_detectable_fault"] += 1
+            if stage_id:
+                stats["detected"] += 1
+                if ftype not in [single_type[k] for k in idx]:
+                    stats["aliased"] += 1
+            elif any(alone):
+                stats["masked"] += 1
+                if len(stats["masked_examples"]) < max_examples:
+                    stats["masked_examples"].append([repr(f) for f in combo])
+
+    # -----------------------------
+    # Conflicting combinations counted by the group arithmetic
+    # -----------------------------
+    group_of = {k: g for g, key in enumerate(keys) for k in groups[key]}
+    cells = {}
+    for k, f in enumerate(fault_list):
+        if f.fault_type == FAULT_TYPE_SAF:
+            cells.setdefault(f.index, []).append(k)
+
+    for same_cell in cells.values():
+        for pair in itertools.combinations(same_cell, 2):
+            others = [k for k in range(len(fault_list)) if k not in pair]
+            for rest in itertools.combinations(others, order - 2):
+                idx = list(pair) + list(rest)
+                if disjoint([group_of[k] for k in idx]):
+                    pruned_total -= 1
+                    if not any(single_stage[k] for k in idx):
+                        pruned_undetected -= 1
+
+    stats["pruned"] = pruned_total
+    stats["combinations"] = pruned_total + stats["simulated"]
+    stats["detected"] += pruned_total - pruned_undetected
+    stats["with_detectable_fault"] += pruned_total - pruned_undetected
+
+    stats["pruned_ratio"] = stats["pruned"] / stats["combinations"] if stats["combinations"] else 0.0
+    stats["masking_rate"] = (
+        stats["masked"] / stats["with_detectable_fault"] if stats["with_detectable_fault"] else 0.0
+    )
+    stats["aliasing_rate"] = stats["aliased"] / stats["detected"] if stats["detected"] else 0.0
+
+    if not silent:
+        report_multi_fault(stats)
+    return stats
+
+
+def report_multi_fault(stats):
+    print(f"  combinations : {stats['combinations']}  "
+          f"(pruned {stats['pruned']}, {stats['pruned_ratio'] * 100:.1f}%; simulated {stats['simulated']})")
+    print(f"  detected     : {stats['detected']}")
+    print(f"  masked       : {stats['masked']}  ({stats['masking_rate'] * 100:.2f}% of combinations "
+          f"with a detectable fault)")
+    print(f"  aliased      : {stats['aliased']}  ({stats['aliasing_rate'] * 100:.2f}% of detected)")
@@ -0,0 +1,103 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from main.fault_coverage_calculator import calculate_fault_coverage
+from main.main_engine import generate_fault_list, simulate_fault
+from main.vectorized_engine import apply_detect_stages
+
+SHARDS_PER_WORKER = 4     # a few shards per worker smooth out uneven stage counts
+
+
+def split_shards(num_faults, num_shards):
+    """Contiguous [start, stop) ranges covering num_faults, as even as possible."""
+    num_shards = max(1, min(num_shards, num_faults))
+    base, extra = divmod(num_faults, num_shards)
+    shards = []
+    start = 0
+    for k in range(num_shards):
+        stop = start + base + (1 if k < extra else 0)
+        shards.append((start, stop))
+        start = stop
+    return shards
+
+
+def fresh_algorithm(algo):
+    """Copy of `algo` with every detected_faults counter reset to 0."""
+    clone = copy.deepcopy(algo)
+    clone.detected_faults = {key: 0 for key in algo.detected_faults}
+    return clone
+
+
+def merge_counters(algo, counters):
+    """Add a worker's detected_faults counters into `algo`."""
+    for key, value in counters.items():
+        algo.detected_faults[key] = algo.detected_faults.get(key, 0) + value
+
+
+def _run_shard(job):
+    """
+    Worker: run the stage loop on one shard of the fault list.
+
+    Returns the detecting stage per fault (0 = undetected), the
+    algorithm's (fault_type, location) of each detected fault and the
+    counters the shard added to the algorithm.
+    """
+    algo, bit_width, faults, golden = job
+    stages = [simulate_fault(f, algo, bit_width, golden) for f in faults]
+    results = [
+        {"fault_type": f.detect_pattern.get("fault_type"), "location": f.detect_pattern.get("location")}
+        if stage_id else None
+        for f, stage_id in zip(faults, stages)
+    ]
+    return stages, results, algo.detected_faults
+
+
+def parallel_engine(bit_width, algo, verbose=True, workers=None, golden=None, fault_list=None,
+                    silent=False):
+    """
+    main_engine with the fault list sharded over a process pool.
+
+    Each worker gets a contiguous shard and a zeroed copy of `algo`, and
+    runs the unchanged per-fault stage loop. Shards are merged back in
+    order, so detected / detect_pattern (stage, patterns, fault type and
+    location), detected_faults and the coverage dict are identical to a
+    serial main_engine run.
+
+    golden:     optional golden table, shipped once per shard to the workers.
+    fault_list: optional list of Faults or FaultSet to simulate instead of
+                generate_fault_list(bit_width).
+    silent:     print nothing at all (overrides verbose), as in main_engine.
+    """
+    verbose = verbose and not silent
+    workers = workers or os.cpu_count() or 1
+    if fault_list is None:
+        fault_list = generate_fault_list(bit_width)
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width}, {workers} workers)...")
+
+    shards = split_shards(len(fault_list), workers * SHARDS_PER_WORKER)
+    jobs = [(fresh_algorithm(algo), bit_width, fault_list[start:stop], golden) for start, stop in shards]
+
+    if workers == 1:
+        results = map(_run_shard, jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_shard, jobs))
+
+    detect_stage = []
+    stage_results = []
+    for stages, shard_results, counters in results:
+        merge_counters(algo, counters)
+        detect_stage.extend(stages)
+        stage_results.extend(shard_results)
+
+    stage_patterns = {
+        stage_id: algo.get_stage_patterns(stage_id)
+        for stage_id in range(1, algo.get_required_stages() + 1)
+    }
+    result_index = [k if result else -1 for k, result in enumerate(stage_results)]
+    apply_detect_stages(fault_list, detect_stage, stage_patterns, verbose, result_index, stage_results)
+
+    return calculate_fault_coverage(fault_list, silent=silent)
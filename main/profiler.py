@@ -0,0 +1,136 @@
+import csv
+import json
+import sys
+import time
+
+
+class SimulationProfiler:
+    """
+    Opt-in instrumentation for main_engine (pass profiler=...).
+
+    Records:
+      - time and evaluations per stage
+      - faults, detections and time per fault type
+      - calls of wrapped hot-path helpers (inject_fault)
+      - early exits: faults detected before the last stage, and the
+        stage evaluations that saved
+    and prints rate-limited progress with an ETA to `stream`.
+    """
+
+    def __init__(self, progress_interval=2.0, stream=sys.stderr):
+        self.progress_interval = progress_interval
+        self.stream = stream
+
+        self.num_faults = 0
+        self.num_stages = 0
+        self.done = 0
+        self.seconds = 0.0
+
+        self.stage_seconds = {}
+        self.stage_evaluations = {}
+        self.type_seconds = {}
+        self.type_faults = {}
+        self.type_detected = {}
+        self.calls = {}
+        self.early_exits = {}
+        self.stages_skipped = 0
+
+        self._start = None
+        self._next_report = None
+
+    # ------------------------------------------------------------------
+    # Hooks called by the engine
+    # ------------------------------------------------------------------
+    def start(self, num_faults, num_stages):
+        self.num_faults = num_faults
+        self.num_stages = num_stages
+        self._start = time.perf_counter()
+        if self.progress_interval:
+            self._next_report = self._start + self.progress_interval
+
+    def counted(self, name, fn):
+        """fn wrapped so that every call is counted under `name`."""
+        self.calls.setdefault(name, 0)
+
+        def wrapper(*args, **kwargs):
+            self.calls[name] += 1
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    def record_stage(self, stage_id, seconds):
+        self.stage_seconds[stage_id] = self.stage_seconds.get(stage_id, 0.0) + seconds
+        self.stage_evaluations[stage_id] = self.stage_evaluations.get(stage_id, 0) + 1
+
+    def record_fault(self, fault_type, stage_id, seconds):
+        """One fault finished; stage_id is its detecting stage (0 = undetected)."""
+        self.type_seconds[fault_type] = self.type_seconds.get(fault_type, 0.0) + seconds
+        self.type_faults[fault_type] = self.type_faults.get(fault_type, 0) + 1
+        if stage_id:
+            self.type_detected[fault_type] = self.type_detected.get(fault_type, 0) + 1
+            if stage_id < self.num_stages:
+                self.early_exits[stage_id] = self.early_exits.get(stage_id, 0) + 1
+                self.stages_skipped += self.num_stages - stage_id
+
+        self.done += 1
+        if self._next_report is not None:
+            now = time.perf_counter()
+            if now >= self._next_report:
+                self._report_progress(now)
+                self._next_report = now + self.progress_interval
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self._start
+
+    def _report_progress(self, now):
+        elapsed = now - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.num_faults - self.done) / rate if rate > 0 else 0.0
+        percent = 100.0 * self.done / self.num_faults if self.num_faults else 100.0
+        print(f"[progress] {self.done}/{self.num_faults} ({percent:.1f}%) "
+              f"{rate:,.0f} faults/s, ETA {time.strftime('%H:%M:%S', time.gmtime(eta))}",
+              file=self.stream, flush=True)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def to_dict(self):
+        return {
+            "faults": self.done,
+            "seconds": self.seconds,
+            "faults_per_sec": self.done / self.seconds if self.seconds > 0 else None,
+            "stages": {
+                str(sid): {"evaluations": self.stage_evaluations[sid], "seconds": self.stage_seconds[sid]}
+                for sid in sorted(self.stage_evaluations)
+            },
+            "fault_types": {
+                ftype: {
+                    "faults": self.type_faults[ftype],
+                    "detected": self.type_detected.get(ftype, 0),
+                    "seconds": self.type_seconds[ftype],
+                }
+                for ftype in self.type_faults
+            },
+            "calls": dict(self.calls),
+            "early_exits": {str(sid): n for sid, n in sorted(self.early_exits.items())},
+            "stages_skipped": self.stages_skipped,
+        }
+
+    def write_json(self, path):
+        with open(path, "w") as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+
+    def write_csv(self, path):
+        """Flat (section, key, count, seconds) rows of to_dict()."""
+        profile = self.to_dict()
+        rows = [("total", "faults", profile["faults"], profile["seconds"])]
+        rows += [("stage", sid, s["evaluations"], s["seconds"]) for sid, s in profile["stages"].items()]
+        rows += [("fault_type", t, s["faults"], s["seconds"]) for t, s in profile["fault_types"].items()]
+        rows += [("calls", name, n, "") for name, n in profile["calls"].items()]
+        rows += [("early_exit", sid, n, "") for sid, n in profile["early_exits"].items()]
+        rows += [("early_exit", "stages_skipped", profile["stages_skipped"], "")]
+
+        with open(path, "w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(("section", "key", "count", "seconds"))
+            writer.writerows(rows)
@@ -0,0 +1,223 @@
+import csv
+import os
+import queue
+import threading
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+from config.config import SAVE_CSV_FILENAME, SAVE_NPY_FILENAME, RESULT_CHUNK_SIZE
+from main.fault_set import (
+    FAULT_DTYPE, FAULT_TYPES, KIND_SAF, KIND_BRIDGE, KIND_COUPLING, TRANSITIONS, fault_record
+)
+
+# Spooled record: FAULT_DTYPE plus what the algorithm reported for the
+# fault, its strings as indices into the writer's string tables
+RECORD_DTYPE = np.dtype(FAULT_DTYPE.descr + [
+    ("detected",   np.bool_),
+    ("fault_type", np.int32),   # algorithm's classification, e.g. "SA0"
+    ("location",   np.int32),   # algorithm's location, e.g. "R1 weight[3]"
+])
+
+TEXT_FIELDS = ("fault_type", "location")
+
+CSV_COLUMNS = ("fault_class", "fault", "detected", "detect_stage", "fault_type", "location")
+
+
+def result_dtype(fault_type_size, location_size):
+    """
+    dtype of the saved .npy: RECORD_DTYPE with the string indices replaced
+    by byte strings wide enough for the longest value written.
+    """
+    return np.dtype(FAULT_DTYPE.descr + [
+        ("detected",   np.bool_),
+        ("fault_type", f"S{max(fault_type_size, 1)}"),
+        ("location",   f"S{max(location_size, 1)}"),
+    ])
+
+
+def describe_records(records):
+    """
+    Fault.__repr__ text of every record, built from whole columns
+    (much cheaper than formatting one FaultView at a time).
+    """
+    kind, row, col, bit, forced, i, j, bridge_type, aggr_row, aggr_bit, victim_bit, transition = (
+        records[name].tolist() for name in (
+            "kind", "row", "col", "bit", "forced", "i", "j", "bridge_type",
+            "aggr_row", "aggr_bit", "victim_bit", "transition",
+        )
+    )
+    text = []
+    for k, code in enumerate(kind):
+        if code == KIND_SAF:
+            text.append(f"SAF(index=({row[k]}, {bit[k]}), forced={forced[k]})")
+        elif code == KIND_BRIDGE:
+            text.append(f"BRIDGE(i={i[k]}, j={j[k]}, type={bridge_type[k]})")
+        elif code == KIND_COUPLING:
+            text.append(f"COUPLING(aggr_row={aggr_row[k]}, aggr_bit={aggr_bit[k]}, "
+                        f"victim_bit={victim_bit[k]}, transition='{TRANSITIONS[transition[k]]}')")
+        else:
+            text.append(f"TREE(node=({row[k]}, {col[k]}), bit={bit[k]}, forced={forced[k]})")
+    return text
+
+
+def load_results(path=SAVE_NPY_FILENAME):
+    """Structured result_dtype() array of a .npy written by ResultWriter."""
+    return np.load(path)
+
+
+class ResultWriter:
+    """
+    Buffered per-fault result export.
+
+    add(f) turns a finished fault into a fixed-size record and buffers it.
+    Every chunk_size faults the chunk is queued to a background thread,
+    which appends it to the CSV and/or .npy output; at most max_pending
+    chunks wait in the queue, which bounds memory on very long runs.
+
+    The algorithm's fault type / location strings are interned in one
+    string table per field, so records stay fixed-size whatever their
+    length. Records are streamed to a ".part" file; close() writes the
+    .npy with its header (which needs the final length) and the strings
+    expanded into fields sized to the longest one.
+    """
+
+    def __init__(self, csv_path=SAVE_CSV_FILENAME, npy_path=SAVE_NPY_FILENAME,
+                 chunk_size=RESULT_CHUNK_SIZE, max_pending=4):
+        self.csv_path = csv_path
+        self.npy_path = npy_path
+        self.chunk_size = chunk_size
+        self.count = 0
+
+        self._buffer = []
+        self._strings = {name: [""] for name in TEXT_FIELDS}        # "" = not reported
+        self._string_index = {name: {"": 0} for name in TEXT_FIELDS}
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+
+        self._csv_file = None
+        self._csv_writer = None
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="")
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(CSV_COLUMNS)
+
+        self._npy_part = open(npy_path + ".part", "wb") if npy_path else None
+
+        self._thread = threading.Thread(target=self._drain, name="ResultWriter", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer side (simulation loop)
+    # ------------------------------------------------------------------
+    def add(self, f):
+        self._buffer.append(self.result_record(f))
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def result_record(self, f):
+        """RECORD_DTYPE record (as a tuple) of a simulated fault."""
+        pattern = f.detect_pattern or {}
+        return fault_record(f) + (
+            bool(f.detected),
+            self._intern("fault_type", pattern.get("fault_type")),
+            self._intern("location", pattern.get("location")),
+        )
+
+    def _intern(self, name, text):
+        """Index of `text` in the string table of field `name`, adding it when new."""
+        text = "" if text is None else str(text)
+        index = self._string_index[name].get(text)
+        if index is None:
+            index = self._string_index[name][text] = len(self._strings[name])
+            self._strings[name].append(text)
+        return index
+
+    def extend(self, fault_list):
+        for f in fault_list:
+            self.add(f)
+
+    def flush(self):
+        """Queue the buffered records for writing."""
+        if self._error is not None:
+            raise self._error
+        if self._buffer:
+            self._queue.put(self._buffer)
+            self.count += len(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        """Write everything still buffered, then finalise the files."""
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+
+        if self._csv_file is not None:
+            self._csv_file.close()
+
+        if self._npy_part is not None:
+            self._npy_part.close()
+            if self._error is None:
+                self._finish_npy()
+            os.remove(self.npy_path + ".part")
+
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Consumer side (background thread)
+    # ------------------------------------------------------------------
+    def _drain(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            if self._error is not None:
+                continue            # keep draining so the producer never blocks
+            try:
+                self._write_chunk(np.array(chunk, dtype=RECORD_DTYPE))
+            except Exception as exc:
+                self._error = exc
+
+    def _write_chunk(self, records):
+        if self._npy_part is not None:
+            records.tofile(self._npy_part)
+
+        if self._csv_writer is not None:
+            self._csv_writer.writerows(zip(
+                (FAULT_TYPES[k] for k in records["kind"].tolist()),
+                describe_records(records),
+                records["detected"].tolist(),
+                records["detect_stage"].tolist(),
+                [self._strings["fault_type"][k] for k in records["fault_type"].tolist()],
+                [self._strings["location"][k] for k in records["location"].tolist()],
+            ))
+
+    def _finish_npy(self):
+        encoded = {name: [text.encode() for text in self._strings[name]] for name in TEXT_FIELDS}
+        dtype = result_dtype(*(max(map(len, encoded[name])) for name in TEXT_FIELDS))
+        header = {
+            "descr": npy_format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": (self.count,),
+        }
+        table = {name: np.array(encoded[name], dtype=dtype[name]) for name in TEXT_FIELDS}
+
+        with open(self.npy_path, "wb") as out, open(self.npy_path + ".part", "rb") as body:
+            npy_format.write_array_header_1_0(out, header)
+            while True:
+                spooled = np.fromfile(body, dtype=RECORD_DTYPE, count=self.chunk_size)
+                if not len(spooled):
+                    break
+                records = np.empty(len(spooled), dtype=dtype)
+                for name in dtype.names:
+                    records[name] = table[name][spooled[name]] if name in TEXT_FIELDS else spooled[name]
+                records.tofile(out)
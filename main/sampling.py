@@ -0,0 +1,188 @@
+import random
+from math import sqrt
+from statistics import NormalDist
+
+from config.config import RANDOM_SEED, SAMPLE_BATCH_SIZE, SAMPLE_CONFIDENCE, SAMPLE_PRECISION
+from main.golden_cache import get_golden_table
+from main.main_engine import generate_fault_list, simulate_fault
+
+
+# ----------------------------------------------------------------------
+# Interval estimates
+# ----------------------------------------------------------------------
+def wilson_interval(detected, samples, population, z):
+    """
+    Wilson score interval of a detection rate from `samples` faults drawn
+    without replacement out of `population`. The finite-population
+    correction shrinks the interval to a point once every fault is drawn.
+
+    Returns (estimate, low, high).
+    """
+    if samples == 0:
+        return 0.0, 0.0, 1.0
+    p = detected / samples
+    if samples >= population:
+        return p, p, p
+
+    n = samples * (population - 1) / (population - samples)     # effective size after the fpc
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return p, max(0.0, centre - half), min(1.0, centre + half)
+
+
+def stratified_interval(strata, z):
+    """
+    Total coverage from per-class samples: sum_h W_h * p_h, with the
+    per-class Wilson half-widths combined as independent errors.
+    strata: list of (detected, samples, population).
+    """
+    universe = sum(population for _, _, population in strata)
+    estimate = variance = 0.0
+    for detected, samples, population in strata:
+        weight = population / universe
+        p, low, high = wilson_interval(detected, samples, population, z)
+        estimate += weight * p
+        variance += (weight * (high - low) / 2) ** 2
+    half = sqrt(variance)
+    return estimate, max(0.0, estimate - half), min(1.0, estimate + half)
+
+
+# ----------------------------------------------------------------------
+# Campaign
+# ----------------------------------------------------------------------
+def sample_order(strata, rng, stratified, batch_size):
+    """
+    Yield batches of fault indices, without replacement.
+
+    uniform:    one random permutation of the whole universe
+    stratified: every batch splits its draws between the fault classes in
+                proportion to their size (largest remainder)
+    """
+    if not stratified:
+        order = [k for members in strata.values() for k in members]
+        rng.shuffle(order)
+        for start in range(0, len(order), batch_size):
+            yield order[start:start + batch_size]
+        return
+
+    queues = {name: rng.sample(members, len(members)) for name, members in strata.items()}
+    universe = sum(len(members) for members in strata.values())
+    while any(queues.values()):
+        shares = {name: batch_size * len(strata[name]) / universe for name in queues}
+        take = {name: int(share) for name, share in shares.items()}
+        for name in sorted(shares, key=lambda n: take[n] - shares[n])[:batch_size - sum(take.values())]:
+            take[name] += 1
+
+        batch = []
+        for name, queue in queues.items():
+            n = min(max(take[name], 1 if queue else 0), len(queue))
+            batch += queue[:n]
+            del queue[:n]
+        yield batch
+
+
+def sampling_campaign(bit_width, algo, precision=SAMPLE_PRECISION, confidence=SAMPLE_CONFIDENCE,
+                      stratified=False, fault_list=None, golden=None, seed=RANDOM_SEED,
+                      batch_size=SAMPLE_BATCH_SIZE, max_samples=None, per_class=False, verbose=True):
+    """
+    Coverage estimate from a random sample of the main_engine universe.
+
+    Faults are drawn without replacement (uniformly, or stratified by fault
+    class) in batches and simulated exactly as main_engine does. After each
+    batch the confidence intervals are updated; the campaign stops once the
+    total coverage half-width is <= precision (with per_class=True: every
+    class's as well), when max_samples is reached, or when the universe is
+    exhausted (exact coverage).
+
+    seed: defaults to config.RANDOM_SEED; when that is None a seed is drawn
+          and reported so the run can be repeated.
+
+    Returns a dict:
+      total / per class: {"coverage", "low", "high", "samples", "population"}
+      samples, universe, seed, confidence, stopped
+    """
+    if fault_list is None:
+        fault_list = generate_fault_list(bit_width)
+    golden = golden if golden is not None else get_golden_table(algo, bit_width)
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    rng = random.Random(seed)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    strata = {}
+    for k, f in enumerate(fault_list):
+        strata.setdefault(f.fault_type, []).append(k)
+    counts = {name: [0, 0] for name in strata}     # fault class -> [samples, detected]
+
+    if verbose:
+        mode = "stratified" if stratified else "uniform"
+        print(f"\nSampling '{algo.__class__.__name__}' (bit_width={bit_width}, {mode}, seed={seed}): "
+              f"target ±{precision * 100:.2f}% at {confidence * 100:.0f}% confidence...")
+
+    def estimates():
+        result = {}
+        for name, members in strata.items():
+            samples, detected = counts[name]
+            p, low, high = wilson_interval(detected, samples, len(members), z)
+            result[name] = {"coverage": p, "low": low, "high": high,
+                            "samples": samples, "population": len(members)}
+        samples = sum(c[0] for c in counts.values())
+        if stratified:
+            p, low, high = stratified_interval(
+                [(counts[name][1], counts[name][0], len(members)) for name, members in strata.items()], z
+            )
+        else:
+            p, low, high = wilson_interval(sum(c[1] for c in counts.values()), samples, len(fault_list), z)
+        result["total"] = {"coverage": p, "low": low, "high": high,
+                           "samples": samples, "population": len(fault_list)}
+        return result
+
+    def precise(result):
+        keys = list(result) if per_class else ["total"]
+        return all((result[k]["high"] - result[k]["low"]) / 2 <= precision for k in keys)
+
+    stopped = "exhausted"
+    result = estimates()
+    for batch in sample_order(strata, rng, stratified, batch_size):
+        for k in batch:
+            f = fault_list[k]
+            simulate_fault(f, algo, bit_width, golden)
+            counts[f.fault_type][0] += 1
+            counts[f.fault_type][1] += bool(f.detected)
+
+        result = estimates()
+        samples = result["total"]["samples"]
+        if verbose:
+            t = result["total"]
+            print(f"  {samples} faults: {t['coverage'] * 100:.2f}% "
+                  f"[{t['low'] * 100:.2f}%, {t['high'] * 100:.2f}%]")
+        if samples >= len(fault_list):
+            break
+        if precise(result):
+            stopped = "precision"
+            break
+        if max_samples is not None and samples >= max_samples:
+            stopped = "max_samples"
+            break
+
+    result.update({
+        "samples": result["total"]["samples"],
+        "universe": len(fault_list),
+        "seed": seed,
+        "confidence": confidence,
+        "stopped": stopped,
+    })
+    if verbose:
+        report_sampled_coverage(result)
+    return result
+
+
+def report_sampled_coverage(result):
+    print(f"\n=== Sampled Fault Coverage ({result['samples']}/{result['universe']} faults, "
+          f"{result['confidence'] * 100:.0f}% CI, stopped: {result['stopped']}) ===")
+    for name, est in result.items():
+        if isinstance(est, dict):
+            print(f"  {name:<9}: {est['coverage'] * 100:6.2f}%  "
+                  f"[{est['low'] * 100:.2f}%, {est['high'] * 100:.2f}%]  "
+                  f"({est['samples']}/{est['population']})")
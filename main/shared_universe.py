@@ -0,0 +1,189 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from main.checkpoint import campaign_key
+from main.fault_coverage_calculator import report_fault_coverage
+from main.fault_set import FAULT_DTYPE, FaultSet, KIND_SAF, KIND_BRIDGE, KIND_COUPLING
+from main.main_engine import generate_fault_list, simulate_fault
+from main.parallel_engine import SHARDS_PER_WORKER, fresh_algorithm, merge_counters, split_shards
+
+# Per-fault outcome, written in place by the workers
+SHARED_RESULT_DTYPE = np.dtype([
+    ("done",         np.bool_),
+    ("detect_stage", np.int16),    # 0 = undetected
+    ("fault_type",   "S24"),       # algorithm's classification
+])
+
+FAULTS_FILE = "faults.npy"
+RESULTS_FILE = "results.npy"
+META_FILE = "meta.json"
+
+
+class SharedUniverse:
+    """
+    On-disk fault universe for multi-process campaigns.
+
+    A directory holding
+      faults.npy   FAULT_DTYPE records (never written after creation)
+      results.npy  SHARED_RESULT_DTYPE, one entry per fault
+      meta.json    size, campaign key and free-form campaign info
+    Both arrays are plain .npy files opened as memory maps, so a worker
+    maps just the pages of its slice and the parent reads the results
+    without any pickling or copying.
+    """
+
+    def __init__(self, path, faults, results, meta):
+        self.path = path
+        self.faults = faults          # FaultSet over a memory-mapped record array
+        self.results = results        # memory-mapped SHARED_RESULT_DTYPE array
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.results)
+
+    @classmethod
+    def create(cls, path, fault_list, **meta):
+        """Write a fault list (or FaultSet) as a new universe at `path`."""
+        os.makedirs(path, exist_ok=True)
+        source = fault_list if isinstance(fault_list, FaultSet) else FaultSet.from_faults(fault_list)
+
+        faults = open_memmap(os.path.join(path, FAULTS_FILE), mode="w+",
+                             dtype=FAULT_DTYPE, shape=(len(source),))
+        faults[:] = source.records
+        faults["detect_stage"] = 0
+        faults.flush()
+        del faults
+
+        results = open_memmap(os.path.join(path, RESULTS_FILE), mode="w+",
+                              dtype=SHARED_RESULT_DTYPE, shape=(len(source),))
+        results.flush()
+        del results
+
+        with open(os.path.join(path, META_FILE), "w") as fh:
+            json.dump({"num_faults": len(source), **meta}, fh)
+
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path, faults_mode="c", results_mode="r+"):
+        """
+        Map an existing universe. The fault records are mapped copy-on-write
+        by default, so simulate_fault can set detection state on its
+        FaultViews without touching the file.
+        """
+        with open(os.path.join(path, META_FILE)) as fh:
+            meta = json.load(fh)
+        faults = np.load(os.path.join(path, FAULTS_FILE), mmap_mode=faults_mode)
+        results = np.load(os.path.join(path, RESULTS_FILE), mmap_mode=results_mode)
+        return cls(path, FaultSet(faults), results, meta)
+
+    def pending(self):
+        """Indices of faults not simulated yet."""
+        return np.flatnonzero(~self.results["done"])
+
+    def coverage(self, silent=False):
+        """Coverage from the result array, same dict as calculate_fault_coverage."""
+        kind = self.faults.records["kind"]
+        detected = self.results["done"] & (self.results["detect_stage"] != 0)
+        totals = np.bincount(kind, minlength=3)
+        hits = np.bincount(kind[detected], minlength=3)
+        return report_fault_coverage(
+            len(kind), int(hits.sum()),
+            int(totals[KIND_SAF]), int(hits[KIND_SAF]),
+            int(totals[KIND_BRIDGE]), int(hits[KIND_BRIDGE]),
+            int(totals[KIND_COUPLING]), int(hits[KIND_COUPLING]),
+            silent=silent,
+        )
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+def _run_slice(job):
+    """
+    Worker: map the universe, simulate faults [start, stop) and write their
+    results in place. Only the algorithm's counters travel back.
+    """
+    path, start, stop, algo, bit_width, golden = job
+    universe = SharedUniverse.open(path)
+    results = universe.results
+
+    for k in range(start, stop):
+        if results["done"][k]:
+            continue
+        f = universe.faults[k]
+        stage_id = simulate_fault(f, algo, bit_width, golden)
+        results["detect_stage"][k] = stage_id
+        if stage_id:
+            results["fault_type"][k] = (f.detect_pattern.get("fault_type") or "").encode()
+        results["done"][k] = True
+
+    results.flush()
+    return algo.detected_faults
+
+
+def shared_engine(bit_width, algo, path, verbose=True, workers=None, golden=None, fault_list=None,
+                  silent=False):
+    """
+    parallel_engine over a SharedUniverse.
+
+    If `path` does not hold a universe yet, one is created from fault_list
+    (default: generate_fault_list(bit_width)). Workers receive only
+    (path, slice, algorithm, golden table), map the arrays themselves and
+    fill their slice of the result array; faults already marked done are
+    skipped, so an interrupted campaign continues where it stopped
+    (algo's counters then cover only the faults simulated in this call).
+
+    The universe records its campaign key (checkpoint.campaign_key: stage
+    plan, bit_width and fault records); reopening it for another
+    algorithm, bit_width or fault list raises ValueError.
+
+    silent: print nothing at all (overrides verbose), as in main_engine.
+
+    Returns the coverage dict.
+    """
+    verbose = verbose and not silent
+    workers = workers or os.cpu_count() or 1
+
+    if fault_list is not None and not isinstance(fault_list, FaultSet):
+        fault_list = FaultSet.from_faults(fault_list)
+
+    if os.path.exists(os.path.join(path, META_FILE)):
+        universe = SharedUniverse.open(path)
+        key = campaign_key(algo, bit_width, universe.faults)
+        if universe.meta.get("key") != key or (
+            fault_list is not None and campaign_key(algo, bit_width, fault_list) != key
+        ):
+            raise ValueError(f"Shared universe {path} belongs to a different campaign")
+    else:
+        if fault_list is None:
+            fault_list = FaultSet.from_faults(generate_fault_list(bit_width))
+        universe = SharedUniverse.create(path, fault_list, bit_width=bit_width,
+                                         key=campaign_key(algo, bit_width, fault_list))
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width}, "
+              f"{workers} workers, shared universe {path})...")
+
+    shards = split_shards(len(universe), workers * SHARDS_PER_WORKER)
+    jobs = [(path, start, stop, fresh_algorithm(algo), bit_width, golden) for start, stop in shards]
+
+    if workers == 1:
+        counters = map(_run_slice, jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counters = list(pool.map(_run_slice, jobs))
+
+    for worker_counters in counters:
+        merge_counters(algo, worker_counters)
+
+    if verbose:
+        detect_stage = universe.results["detect_stage"]
+        for k, f in enumerate(universe.faults):
+            print(f"→ {'Detected' if detect_stage[k] else 'Undetected'} {f}")
+
+    return universe.coverage(silent)
@@ -0,0 +1,61 @@
+from main.fault_coverage_calculator import CoverageAccumulator
+from main.main_engine import iter_faults, simulate_fault, stage_pattern_counts
+
+
+# ----------------------------------------------------------------------
+# Pipeline stages: generate -> simulate -> accumulate
+#
+# Each stage is a generator over the previous one, so only the fault in
+# flight is alive at any time.
+# ----------------------------------------------------------------------
+def simulate_stream(faults, algo, bit_width, golden=None):
+    """Simulate faults one by one as they arrive, yielding (fault, stage_id)."""
+    for f in faults:
+        yield f, simulate_fault(f, algo, bit_width, golden)
+
+
+def accumulate_stream(results, accumulator):
+    """Fold each finished fault into `accumulator`, passing results through."""
+    for f, stage_id in results:
+        accumulator.update(f)
+        yield f, stage_id
+
+
+def streaming_engine(bit_width, algo, verbose=True, golden=None, faults=None,
+                     accumulator=None, progress_every=0, on_progress=None, writer=None, silent=False):
+    """
+    main_engine without a fault list.
+
+    faults:         any iterable of faults (default: iter_faults(bit_width))
+    accumulator:    CoverageAccumulator to update (the stage plan's pattern
+                    counts are recorded in it); pass your own to read
+                    partial coverage from another thread or a callback
+    progress_every: call on_progress(accumulator) every N faults
+    writer:         optional ResultWriter receiving every finished fault
+    silent:         print nothing at all (overrides verbose), as in main_engine
+    """
+    verbose = verbose and not silent
+    accumulator = accumulator if accumulator is not None else CoverageAccumulator()
+    accumulator.record_stage_plan(stage_pattern_counts(algo, golden))
+    faults = iter_faults(bit_width) if faults is None else faults
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width}, streaming)...")
+
+    pipeline = accumulate_stream(simulate_stream(faults, algo, bit_width, golden), accumulator)
+
+    for f, stage_id in pipeline:
+
+        if writer is not None:
+            writer.add(f)
+
+        if verbose:
+            if stage_id:
+                print(f"→ Detected {f}")
+            else:
+                print(f"→ Undetected {f}")
+
+        if progress_every and on_progress and accumulator.total % progress_every == 0:
+            on_progress(accumulator)
+
+    return accumulator.report(silent)
@@ -0,0 +1,126 @@
+import contextlib
+import csv
+import importlib
+import io
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config.config import BRIDGE_TYPES_ACTIVE, FAULT_MODE, SWEEP_CSV_FILENAME
+from main.golden_cache import get_golden_table
+from main.main_engine import generate_fault_list
+
+# Engine name -> "module:function" of an engine taking (bit_width, algo,
+# verbose, golden, fault_list), imported when a configuration runs
+SWEEP_ENGINES = {
+    "main": "main.main_engine:main_engine",
+    "collapsed": "main.fault_collapsing:collapsed_engine",
+    "parallel": "main.parallel_engine:parallel_engine",
+}
+
+RESULT_COLUMNS = (
+    "algorithm", "bit_width", "fault_mode", "bridge_types", "engine", "num_faults",
+    "total_coverage", "saf_coverage", "bridge_coverage", "coupling_coverage",
+    "detected_faults", "seconds",
+)
+
+
+def parse_bridge_types(spec):
+    """'0-7' / '0,2,5-7' -> [0, 1, ...]."""
+    types = []
+    for part in spec.split(","):
+        if "-" in part:
+            lo, hi = part.split("-")
+            types.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            types.append(int(part))
+    return types
+
+
+def format_bridge_types(types):
+    """Inverse of parse_bridge_types, collapsing consecutive runs."""
+    runs = []
+    for _, group in itertools.groupby(enumerate(types), key=lambda p: p[1] - p[0]):
+        group = [t for _, t in group]
+        runs.append(str(group[0]) if len(group) == 1 else f"{group[0]}-{group[-1]}")
+    return ",".join(runs)
+
+
+def _run_config(job):
+    """Worker: one (algorithm, bit_width, fault_mode, bridge_types) configuration."""
+    config, algo, golden = job
+    module_name, _, engine_name = SWEEP_ENGINES[config["engine"]].partition(":")
+    engine = getattr(importlib.import_module(module_name), engine_name)
+    fault_list = generate_fault_list(config["bit_width"], config["bridge_types"], config["fault_mode"])
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):     # keep concurrent runs off the console
+        coverage = engine(config["bit_width"], algo, verbose=False, golden=golden, fault_list=fault_list)
+    seconds = time.perf_counter() - start
+
+    return {
+        **config,
+        "bridge_types": format_bridge_types(config["bridge_types"]),
+        "num_faults": len(fault_list),
+        "total_coverage": coverage["total"],
+        "saf_coverage": coverage["SAF"],
+        "bridge_coverage": coverage["BRIDGE"],
+        "coupling_coverage": coverage.get("COUPLING", ""),
+        "detected_faults": ";".join(f"{k}={v}" for k, v in algo.detected_faults.items()),
+        "seconds": round(seconds, 6),
+    }
+
+
+def write_results_csv(rows, path):
+    with open(path, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_sweep(algorithms, bit_widths, fault_modes=(FAULT_MODE,), bridge_type_sets=(BRIDGE_TYPES_ACTIVE,),
+              engine="main", workers=None, output=SWEEP_CSV_FILENAME):
+    """
+    Run every algorithm x bit_width x fault_mode x bridge_types configuration.
+
+    algorithms: {name: class taking bit_width}
+    The golden table (stage plan and fault-free sums) of each algorithm is
+    built once per width and shared by all of its configurations, which
+    run concurrently on `workers` processes (1 = in this process).
+    Results are written as one CSV table to `output` (None = not written)
+    and returned as a list of row dicts in sweep order.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = []
+
+    for name, algo_cls in algorithms.items():
+        for bit_width in bit_widths:
+            golden = get_golden_table(algo_cls(bit_width), bit_width)
+            for fault_mode, bridge_types in itertools.product(fault_modes, bridge_type_sets):
+                config = {
+                    "algorithm": name,
+                    "bit_width": bit_width,
+                    "fault_mode": fault_mode,
+                    "bridge_types": list(bridge_types),
+                    "engine": engine,
+                }
+                jobs.append((config, algo_cls(bit_width), golden))
+
+    print(f"\nSweep: {len(jobs)} configurations on {workers} workers...")
+
+    if workers == 1:
+        rows = list(map(_run_config, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_run_config, jobs))
+
+    for row in rows:
+        print(f"  {row['algorithm']:<16} w={row['bit_width']:<5} {row['fault_mode']:<8} "
+              f"bridges={row['bridge_types']:<8} {row['total_coverage']*100:6.2f}%  ({row['seconds']:.2f}s)")
+
+    if output:
+        write_results_csv(rows, output)
+        print(f"Results written to {output}")
+
+    return rows
@@ -0,0 +1,297 @@
+import numpy as np
+
+from config.config import FAULT_TYPE_SAF, FAULT_TYPE_BRIDGE
+from main.fault_classes import Fault
+from main.fault_coverage_calculator import calculate_fault_coverage
+from main.fault_injection import inject_fault
+from main.fault_set import FaultSet, KIND_SAF, KIND_BRIDGE
+from main.main_engine import generate_fault_list
+from utils.bit_ops import bits_to_int, sum_dtype
+
+FAULT_FIELDS = ("kind", "row", "bit", "forced", "i", "j", "bridge_type")
+
+
+def bridge_truth_table():
+    """
+    Lookup table [bridge_type, a, b] -> faulty (a, b), shape (8, 2, 2, 2).
+    Built by probing inject_fault so both engines share one definition.
+    """
+    table = np.zeros((8, 2, 2, 2), dtype=np.int64)
+    for bt in range(8):
+        probe = Fault(FAULT_TYPE_BRIDGE, i=0, j=1, bridge_type=bt)
+        for a in (0, 1):
+            for b in (0, 1):
+                faulty, _ = inject_fault([a, b], [], probe)
+                table[bt, a, b] = faulty
+    return table
+
+
+BRIDGE_TABLE = bridge_truth_table()
+
+
+# ----------------------------------------------------------------------
+# Fault list <-> arrays
+# ----------------------------------------------------------------------
+def encode_faults(fault_list):
+    """
+    Columnar (one int64 array per field) encoding of a fault list.
+
+      kind              KIND_SAF / KIND_BRIDGE
+      row, bit, forced  SAF location and stuck value
+      i, j, bridge_type BRIDGE inputs and type
+    Fields that do not apply to a fault are left at 0.
+    A FaultSet is already columnar and is converted without a Python loop.
+    """
+    if isinstance(fault_list, FaultSet):
+        if not np.isin(fault_list.records["kind"], (KIND_SAF, KIND_BRIDGE)).all():
+            raise ValueError("Cannot vectorize COUPLING faults")
+        return fault_list.columns(FAULT_FIELDS)
+
+    n = len(fault_list)
+    faults = {name: np.zeros(n, dtype=np.int64) for name in FAULT_FIELDS}
+
+    for k, f in enumerate(fault_list):
+        if f.fault_type == FAULT_TYPE_SAF:
+            faults["kind"][k] = KIND_SAF
+            faults["row"][k], faults["bit"][k] = f.index
+            faults["forced"][k] = f.forced_value
+        elif f.fault_type == FAULT_TYPE_BRIDGE:
+            if not 0 <= f.bridge_type < len(BRIDGE_TABLE):
+                raise ValueError(f"Unknown bridge_type: {f.bridge_type}")
+            faults["kind"][k] = KIND_BRIDGE
+            faults["i"][k], faults["j"][k] = f.i, f.j
+            faults["bridge_type"][k] = f.bridge_type
+        else:
+            raise ValueError(f"Cannot vectorize fault type {f.fault_type}")
+
+    return faults
+
+
+def select_faults(faults, idx):
+    """Subset of an encoded fault table."""
+    return {name: col[idx] for name, col in faults.items()}
+
+
+# ----------------------------------------------------------------------
+# Batched hardware model
+# ----------------------------------------------------------------------
+def simulate_stage_outputs(faults, in_patterns, row1_nom, row2_nom, bit_width):
+    """
+    Faulty out_sum for every fault x input pattern of one stage.
+
+    Mirrors main_engine:
+        out_sum = in_f1[0] * row_value(w_f1) + in_f2[1] * row_value(w_f2)
+    with the SAFs applied to the weight integers and the bridges applied
+    to the input bits through BRIDGE_TABLE.
+
+    Returns an (F, P) array (int64, or object for very wide weights).
+    """
+    dtype = sum_dtype(bit_width, 2)
+    n = len(faults["kind"])
+    patterns = np.asarray(in_patterns, dtype=np.int64)       # (P, 2)
+    num_patterns = len(patterns)
+
+    # -----------------------------
+    # Faulty weights, one value per fault and row
+    # -----------------------------
+    weights = np.empty((n, 2), dtype=dtype)
+    saf = faults["kind"] == KIND_SAF
+    bit_mask = np.left_shift(np.ones(n, dtype=dtype), faults["bit"].astype(dtype))
+    forced = faults["forced"].astype(dtype) * bit_mask
+
+    for col, nominal in enumerate((bits_to_int(row1_nom), bits_to_int(row2_nom))):
+        hit = saf & (faults["row"] == col + 1)
+        weights[:, col] = nominal
+        weights[hit, col] = (nominal & ~bit_mask[hit]) | forced[hit]
+
+    # -----------------------------
+    # Faulty inputs, one vector per fault and pattern
+    # -----------------------------
+    inputs = np.broadcast_to(patterns, (n,) + patterns.shape).copy()   # (F, P, 2)
+
+    bridge = np.flatnonzero(faults["kind"] == KIND_BRIDGE)
+    if bridge.size:
+        bi = faults["i"][bridge]
+        bj = faults["j"][bridge]
+        a = patterns[:, bi].T                                           # (Fb, P)
+        b = patterns[:, bj].T
+        faulty = BRIDGE_TABLE[faults["bridge_type"][bridge][:, None], a, b]
+
+        rows = bridge[:, None]
+        cols = np.arange(num_patterns)[None, :]
+        inputs[rows, cols, bi[:, None]] = faulty[..., 0]
+        inputs[rows, cols, bj[:, None]] = faulty[..., 1]
+
+    return inputs[..., 0] * weights[:, 0, None] + inputs[..., 1] * weights[:, 1, None]
+
+
+# ----------------------------------------------------------------------
+# Response grouping
+# ----------------------------------------------------------------------
+def group_responses(outputs):
+    """
+    Deduplicate the rows of an (F, P) output array.
+
+    Returns (responses, inverse): the distinct responses as lists of
+    Python ints and, per fault, the index of its response.
+    """
+    if outputs.dtype != object:
+        uniq, inverse = np.unique(outputs, axis=0, return_inverse=True)
+        return uniq.tolist(), inverse.reshape(-1)
+
+    index = {}
+    inverse = np.empty(len(outputs), dtype=np.int64)
+    for k, row in enumerate(map(tuple, outputs)):
+        inverse[k] = index.setdefault(row, len(index))
+    return [list(row) for row in index], inverse
+
+
+def classify_responses(algo, stage_id, in_patterns, outputs, results):
+    """
+    The algorithm's result dict for every row of an (F, P) array of
+    detected responses, via the side-effect free analyze_stage_output()
+    on each distinct row. The dicts are appended to `results`; returns
+    the (F,) index of each row's dict in it.
+    """
+    responses, inverse = group_responses(outputs)
+    base = len(results)
+    results.extend(algo.analyze_stage_output(stage_id, in_patterns, r) for r in responses)
+    return base + inverse
+
+
+def observe_group(algo, stage_id, in_patterns, outputs, count):
+    """
+    algo.observe() on behalf of `count` faults sharing one stage response.
+
+    The response is analysed once; whatever the algorithm added to its
+    detected_faults counters is then scaled up to `count` faults.
+    """
+    before = dict(algo.detected_faults)
+    result = algo.observe(stage_id, in_patterns, outputs)
+    scale_counters(algo, before, count)
+    return result
+
+
+def scale_counters(algo, before, count):
+    """
+    Multiply whatever was added to algo.detected_faults since the `before`
+    snapshot by `count`, as if `count` identical faults had been observed.
+    """
+    if count > 1:
+        for key, value in list(algo.detected_faults.items()):
+            delta = value - before.get(key, 0)
+            if delta:
+                algo.detected_faults[key] += delta * (count - 1)
+
+
+def apply_detect_stages(fault_list, detect_stage, stage_patterns, verbose=False,
+                        result_index=None, results=None):
+    """
+    Copy per-fault detecting stages (0 = undetected) back onto the Fault
+    objects, the way main_engine fills detected / detect_pattern.
+    A FaultSet only stores the stage, written in one array assignment.
+
+    result_index / results: the algorithm's classification of each
+    detected fault, as an index per fault into the list of distinct
+    observe() result dicts; its fault_type and location are stored in
+    detect_pattern like simulate_fault does.
+    """
+    if isinstance(fault_list, FaultSet):
+        fault_list.detect_stage[:] = detect_stage
+        if verbose:
+            for f in fault_list:
+                print(f"→ {'Detected' if f.detected else 'Undetected'} {f}")
+        return
+
+    if result_index is None:
+        result_index = np.full(len(fault_list), -1, dtype=np.int64)
+
+    for f, stage_id, r in zip(fault_list, np.asarray(detect_stage).tolist(), np.asarray(result_index).tolist()):
+        if stage_id:
+            result = results[r] if r >= 0 else {}
+            f.detected = True
+            f.detect_pattern = {
+                "stage": stage_id,
+                "patterns": stage_patterns[stage_id],
+                "fault_type": result.get("fault_type"),
+                "location": result.get("location"),
+            }
+
+        if verbose:
+            if f.detected:
+                print(f"→ Detected {f}")
+            else:
+                print(f"→ Undetected {f}")
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+def vectorized_engine(bit_width, algo, verbose=True, fault_list=None, silent=False):
+    """
+    Drop-in alternative to main_engine.
+
+    Same fault universe, stage loop and fault dropping, but every stage is
+    simulated for all still-undetected faults at once and the algorithm
+    analyses each distinct response only once.
+
+    fault_list: optional list of Faults or FaultSet to simulate instead of
+                generate_fault_list(bit_width).
+    silent:     print nothing at all (overrides verbose), as in main_engine.
+    """
+    verbose = verbose and not silent
+    if fault_list is None:
+        fault_list = generate_fault_list(bit_width)
+    faults = encode_faults(fault_list)
+
+    if not silent:
+        print(f"\nRunning algorithm '{algo.__class__.__name__}' (bit_width={bit_width}, vectorized)...")
+
+    detect_stage = np.zeros(len(fault_list), dtype=np.int64)    # 0 = undetected
+    result_index = np.full(len(fault_list), -1, dtype=np.int64)
+    results = []
+    stage_patterns = {}
+    # a FaultSet keeps only the detecting stage, so its faults are not classified
+    classify = not isinstance(fault_list, FaultSet)
+
+    for stage_id in range(1, algo.get_required_stages() + 1):
+
+        active = np.flatnonzero(detect_stage == 0)
+        if active.size == 0:
+            break
+
+        in_patterns = algo.get_stage_patterns(stage_id)
+        row1_nom, row2_nom = algo.get_stage_weights(stage_id)
+        stage_patterns[stage_id] = in_patterns
+
+        outputs = simulate_stage_outputs(
+            select_faults(faults, active), in_patterns, row1_nom, row2_nom, bit_width
+        )
+
+        if hasattr(algo, "detect_stage_batch"):
+            # detectors with a batched check analyse the whole stage at once
+            codes = algo.detect_stage_batch(stage_id, in_patterns, outputs)
+            hit = codes >= 0
+            algo.observe_batch(stage_id, codes[hit])
+            detect_stage[active[hit]] = stage_id
+            if classify and hit.any():
+                result_index[active[hit]] = classify_responses(algo, stage_id, in_patterns, outputs[hit], results)
+            continue
+
+        responses, inverse = group_responses(outputs)
+        counts = np.bincount(inverse, minlength=len(responses))
+        hit = np.zeros(len(responses), dtype=bool)
+        base = len(results)
+
+        for u, response in enumerate(responses):
+            result = observe_group(algo, stage_id, in_patterns, response, int(counts[u]))
+            results.append(result)
+            hit[u] = result["detected"]
+
+        detected = hit[inverse]
+        detect_stage[active[detected]] = stage_id
+        result_index[active[detected]] = base + inverse[detected]
+
+    apply_detect_stages(fault_list, detect_stage, stage_patterns, verbose, result_index, results)
+
+    return calculate_fault_coverage(fault_list, silent=silent)
@@ -1,30 +1,160 @@
+import argparse
+
+from config.config import (
+    BRIDGE_TYPES_ACTIVE, FAULT_MODE, FAULT_MODES, SAVE_CSV_FILENAME, SAVE_NPY_FILENAME, SWEEP_CSV_FILENAME
+)
+from main.fault_coverage_calculator import CoverageAccumulator
 from main.main_engine import main_engine
-from algorithms.five_stage_detection_algorithm import FiveStageDetectionAlgorithm
-from algorithms.weighted_sum_detector import WeightedSumDetector
-from algorithms.parity_based_detector import ParityBasedDetector
-from algorithms.majority_based_detector import MajorityBasedDetector
-from algorithms.four_stage_detection_algorithm import FourStageDetectionAlgorithm
+from main.profiler import SimulationProfiler
+from main.sampling import sampling_campaign
+from main.sweep import SWEEP_ENGINES, parse_bridge_types, format_bridge_types, run_sweep
+from algorithms import ALGORITHMS
 
-if __name__ == "__main__":
+# (flag, dest) of the options read only by batch mode / only by an interactive run
+SWEEP_OPTIONS = (
+    ("--algorithms", "algorithms"), ("--fault-modes", "fault_modes"), ("--bridge-types", "bridge_types"),
+    ("--engine", "engine"), ("--workers", "workers"), ("--output", "output"),
+)
+INTERACTIVE_OPTIONS = (
+    ("--profile", "profile"), ("--silent", "silent"), ("--checkpoint", "checkpoint"), ("--resume", "resume"),
+    ("--save", "save"), ("--sample", "sample"), ("--stratified", "stratified"), ("--breakdown", "breakdown"),
+    ("--act-bits", "act_bits"),
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Fault detection simulation. Without --widths, asks for one configuration interactively."
+    )
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS,
+                        help="algorithms to sweep (default: five_stage)")
+    parser.add_argument("--widths", nargs="+", type=int,
+                        help="weight bit widths to sweep; enables batch mode")
+    parser.add_argument("--fault-modes", nargs="+", choices=FAULT_MODES,
+                        help=f"fault universes to sweep (default: {FAULT_MODE})")
+    parser.add_argument("--bridge-types", nargs="+", type=parse_bridge_types, metavar="SPEC",
+                        help="bridge type sets to sweep, e.g. 0-7 0,1 4 "
+                             f"(default: {format_bridge_types(BRIDGE_TYPES_ACTIVE)})")
+    parser.add_argument("--engine", choices=SWEEP_ENGINES,
+                        help="engine of every sweep configuration (default: main)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="concurrent configurations (default: all cores)")
+    parser.add_argument("--output",
+                        help=f"results CSV (default: {SWEEP_CSV_FILENAME})")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="interactive run: record a stage / fault-type profile to PATH (.json or .csv)")
+    parser.add_argument("--silent", action="store_true",
+                        help="interactive run: no per-fault lines or coverage printout")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="interactive run: save progress to PATH periodically")
+    parser.add_argument("--resume", action="store_true",
+                        help="interactive run: continue from --checkpoint if it exists")
+    parser.add_argument("--save", action="store_true",
+                        help=f"interactive run: write per-fault results to {SAVE_CSV_FILENAME} "
+                             f"and {SAVE_NPY_FILENAME}")
+    parser.add_argument("--sample", type=float, metavar="PRECISION",
+                        help="interactive run: estimate coverage from a random fault sample, "
+                             "stopping at this CI half-width (e.g. 0.005)")
+    parser.add_argument("--stratified", action="store_true",
+                        help="with --sample: draw proportionally from each fault class")
+    parser.add_argument("--breakdown", action="store_true",
+                        help="interactive run: print coverage per row, per bit and per stage")
+    parser.add_argument("--act-bits", type=int, metavar="N",
+                        help="interactive run: N-bit activations fed bit-serially")
+    args = parser.parse_args()
+
+    # each mode refuses the options only the other one reads
+    if args.widths is None:
+        unused = [flag for flag, dest in SWEEP_OPTIONS if getattr(args, dest) is not None]
+        if unused:
+            parser.error(f"{', '.join(unused)} cannot be used without --widths (batch mode only)")
+    else:
+        unused = [flag for flag, dest in INTERACTIVE_OPTIONS if getattr(args, dest) not in (None, False)]
+        if unused:
+            parser.error(f"{', '.join(unused)} cannot be combined with --widths (interactive run only)")
+
+    # --sample and --act-bits run their own campaigns, without main_engine's extras
+    extras = {"--profile": args.profile, "--checkpoint": args.checkpoint, "--resume": args.resume,
+              "--save": args.save, "--breakdown": args.breakdown}
+    for flag, value in (("--sample", args.sample), ("--act-bits", args.act_bits)):
+        unsupported = [name for name, extra in extras.items() if extra]
+        if value is not None and unsupported:
+            parser.error(f"{flag} cannot be combined with {', '.join(unsupported)}")
+    if args.sample is not None and args.act_bits is not None:
+        parser.error("--sample cannot be combined with --act-bits")
+    if args.stratified and args.sample is None:
+        parser.error("--stratified requires --sample")
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+
+    # batch-mode defaults, applied once the options given have been checked
+    if args.algorithms is None:
+        args.algorithms = ["five_stage"]
+    if args.fault_modes is None:
+        args.fault_modes = [FAULT_MODE]
+    if args.bridge_types is None:
+        args.bridge_types = [BRIDGE_TYPES_ACTIVE]
+    if args.engine is None:
+        args.engine = "main"
+    if args.output is None:
+        args.output = SWEEP_CSV_FILENAME
+    return args
+
+
+def run_interactive(profile=None, silent=False, save=False, checkpoint=None, resume=False,
+                    sample=None, stratified=False, breakdown=False, act_bits=None):
     print("=== Fault Detection Simulation ===")
     bit_width = int(input("Enter weight bit width: "))
-    print("Algorithms: five_stage, four_stage, weighted_sum, parity_based, majority_based")
+    print(f"Algorithms: {', '.join(ALGORITHMS)}")
     algo_name = input("Select algorithm: ").strip()
 
-    if algo_name == "five_stage":
-        algo = FiveStageDetectionAlgorithm(bit_width)
-    elif algo_name == "four_stage":
-        algo = FourStageDetectionAlgorithm(bit_width)
-    elif algo_name == "weighted_sum":
-        algo = WeightedSumDetector(bit_width)
-    elif algo_name == "parity_based":
-        algo = ParityBasedDetector(bit_width)
-    elif algo_name == "majority_based":
-        algo = MajorityBasedDetector(bit_width)
-    else:
+    if algo_name not in ALGORITHMS:
         raise ValueError("Unknown algorithm")
+    algo = ALGORITHMS[algo_name](bit_width)
 
-    coverage = main_engine(bit_width, algo)
+    if sample is not None:
+        sampling_campaign(bit_width, algo, precision=sample, stratified=stratified,
+                          golden=ALGORITHMS.stage_plan(algo_name, bit_width), verbose=not silent)
+        print("\nDetected Faults (sampled):")
+        print(algo.detected_faults)
+        return
+
+    if act_bits is not None:
+        from main.bit_serial import bit_serial_engine
+
+        bit_serial_engine(bit_width, algo, act_bits, silent=silent,
+                          golden=ALGORITHMS.stage_plan(algo_name, bit_width))
+        print("\nDetected Faults (bit-serial):")
+        print(algo.detected_faults)
+        return
+
+    profiler = SimulationProfiler() if profile else None
+    writer = None
+    if save:
+        from main.result_writer import ResultWriter     # pulls in numpy; only when saving
+        writer = ResultWriter()
+    accumulator = CoverageAccumulator() if breakdown else None
+    golden = ALGORITHMS.stage_plan(algo_name, bit_width)
+    try:
+        coverage = main_engine(bit_width, algo, golden=golden,
+                               profiler=profiler, silent=silent, writer=writer,
+                               checkpoint=checkpoint, resume=resume, accumulator=accumulator)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        print(f"\nResults written to {writer.csv_path} and {writer.npy_path}")
+
+    if profiler is not None:
+        if profile.endswith(".csv"):
+            profiler.write_csv(profile)
+        else:
+            profiler.write_json(profile)
+        print(f"\nProfile written to {profile}")
+
+    if accumulator is not None:
+        accumulator.report_breakdown(golden)
 
     print("\nDetected Faults:")
     print(algo.detected_faults)
@@ -32,3 +162,21 @@ if __name__ == "__main__":
     print("\nCoverage Summary:")
     for k, v in coverage.items():
         print(f"  {k}: {v*100:.2f}%")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.widths is None:
+        run_interactive(args.profile, args.silent, args.save, args.checkpoint, args.resume,
+                        args.sample, args.stratified, args.breakdown, args.act_bits)
+    else:
+        run_sweep(
+            {name: ALGORITHMS[name] for name in args.algorithms},
+            args.widths,
+            fault_modes=args.fault_modes,
+            bridge_type_sets=args.bridge_types,
+            engine=args.engine,
+            workers=args.workers,
+            output=args.output,
+        )
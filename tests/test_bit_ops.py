@@ -0,0 +1,13 @@
+import numpy as np
+import pytest
+
+from utils.bit_ops import popcount
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.int32, np.int64, np.uint64])
+def test_popcount_lookup_table_matches_bitwise_count(dtype, monkeypatch):
+    values = np.random.default_rng(0).integers(0, np.iinfo(dtype).max, size=(5, 8), dtype=dtype)[:, ::2]
+    expected = [[bin(v).count("1") for v in row] for row in values.tolist()]
+
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    assert popcount(values).tolist() == expected
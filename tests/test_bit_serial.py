@@ -0,0 +1,95 @@
+import pytest
+
+from algorithms import ALGORITHMS, FiveStageDetectionAlgorithm
+from main.bit_serial import (
+    bit_serial_engine, bit_serial_plan, faulty_partial_sums, shift_accumulate, simulate_fault_bit_serial,
+)
+from main.fault_injection import inject_fault
+from main.fault_set import FaultSet
+from main.main_engine import generate_fault_list, main_engine, set_write_transition
+
+BIT_WIDTH = 8
+
+
+def run(engine, name, **kwargs):
+    algo = ALGORITHMS[name](BIT_WIDTH)
+    fault_list = generate_fault_list(BIT_WIDTH)
+    coverage = engine(BIT_WIDTH, algo, verbose=False, fault_list=fault_list, **kwargs)
+    stages = [f.detect_pattern["stage"] if f.detected else 0 for f in fault_list]
+    types = [f.detect_pattern["fault_type"] if f.detected else None for f in fault_list]
+    return coverage, algo.detected_faults, stages, types
+
+
+@pytest.mark.parametrize("act_bits", [1, 4])
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_full_scale_activations_match_main_engine(name, act_bits):
+    assert run(bit_serial_engine, name, act_bits=act_bits) == run(main_engine, name)
+
+
+class RandomActivations(FiveStageDetectionAlgorithm):
+    def get_stage_activations(self, stage_id, act_bits):
+        return [[(37 * stage_id + 11 * p + r) % (1 << act_bits) for r in range(2)] for p in range(4)]
+
+
+@pytest.mark.parametrize("bit_width", [6, 70])
+def test_accumulated_outputs_match_cycle_by_cycle(bit_width):
+    act_bits = 5
+    plan = bit_serial_plan(RandomActivations(bit_width), bit_width, act_bits)
+
+    # coupling universe grows with bit_width^2; keep it to the small width
+    fault_mode = "ALL" if bit_width < 16 else "BOTH"
+    for f in generate_fault_list(bit_width, fault_mode=fault_mode):
+        prev = None
+        for stage_id in sorted(plan["stages"]):
+            stage = plan["stages"][stage_id]
+            w1, w2 = stage["weights"]
+            if f.fault_type == "COUPLING":
+                set_write_transition(f, prev, stage["weights"], bit_width)
+                prev = stage["weights"]
+
+            reference = []
+            for acts in stage["activations"]:
+                out = 0
+                for c in range(act_bits):
+                    in_bits = [(a >> c) & 1 for a in acts]
+                    in1, r1 = inject_fault(in_bits, list(w1), f, row_id=1)
+                    in2, r2 = inject_fault(in_bits, list(w2), f, row_id=2)
+                    psum = in1[0] * sum(b << k for k, b in enumerate(r1)) + \
+                        in2[1] * sum(b << k for k, b in enumerate(r2))
+                    out += psum << c
+                reference.append(out)
+
+            psums = faulty_partial_sums(f, stage, bit_width)
+            assert shift_accumulate(psums).tolist() == reference
+
+
+class RandomWeightedSum(ALGORITHMS["weighted_sum"]):
+    def get_stage_activations(self, stage_id, act_bits):
+        return [[(37 * stage_id + 11 * p + r) % (1 << act_bits) for r in range(2)] for p in range(4)]
+
+
+@pytest.mark.parametrize("algo_class", [RandomActivations, RandomWeightedSum])
+@pytest.mark.parametrize("bit_width", [6, 70])
+def test_batched_cycles_match_fault_by_fault(algo_class, bit_width):
+    act_bits = 5
+    fault_mode = "ALL" if bit_width < 16 else "BOTH"
+
+    algo = algo_class(bit_width)
+    plan = bit_serial_plan(algo, bit_width, act_bits)
+    expected = generate_fault_list(bit_width, fault_mode=fault_mode)
+    for f in expected:
+        simulate_fault_bit_serial(f, algo, bit_width, plan)
+
+    batch_algo = algo_class(bit_width)
+    fault_list = generate_fault_list(bit_width, fault_mode=fault_mode)
+    bit_serial_engine(bit_width, batch_algo, act_bits, silent=True, fault_list=fault_list)
+
+    assert batch_algo.detected_faults == algo.detected_faults
+    assert [f.detect_pattern if f.detected else None for f in fault_list] == \
+        [f.detect_pattern if f.detected else None for f in expected]
+
+    # FaultSet.generate is the SAF + bridge prefix of the ALL universe
+    fault_set = FaultSet.generate(bit_width)
+    bit_serial_engine(bit_width, algo_class(bit_width), act_bits, silent=True, fault_list=fault_set)
+    assert fault_set.detect_stage.tolist() == \
+        [f.detect_pattern["stage"] if f.detected else 0 for f in expected[:len(fault_set)]]
@@ -0,0 +1,26 @@
+import pytest
+
+from algorithms import FiveStageDetectionAlgorithm
+from main.compaction import compact_stages, compacted_algorithm_class
+from main.main_engine import main_engine
+from main.vectorized_engine import vectorized_engine
+
+
+@pytest.mark.parametrize("bit_width", [4, 8, 16])
+def test_compacted_counters_match_reference(bit_width):
+    result = compact_stages(bit_width, FiveStageDetectionAlgorithm(bit_width))
+    compacted = compacted_algorithm_class(result["stages"], bit_width)(bit_width)
+    reference = FiveStageDetectionAlgorithm(bit_width)
+
+    assert main_engine(bit_width, compacted, silent=True) == main_engine(bit_width, reference, silent=True)
+    assert compacted.detected_faults == reference.detected_faults
+    assert result["cost"] < result["reference_cost"]
+
+
+def test_batch_classification_matches_scalar():
+    bit_width = 8
+    cls = compacted_algorithm_class(compact_stages(bit_width)["stages"], bit_width)
+    scalar, batch = cls(bit_width), cls(bit_width)
+    main_engine(bit_width, scalar, silent=True)
+    vectorized_engine(bit_width, batch, verbose=False)
+    assert scalar.detected_faults == batch.detected_faults
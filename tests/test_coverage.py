@@ -0,0 +1,32 @@
+import pytest
+
+from algorithms import ALGORITHMS
+from main.fault_coverage_calculator import CoverageAccumulator
+from main.fault_set import FaultSet
+from main.main_engine import main_engine
+from main.streaming_engine import streaming_engine
+
+BIT_WIDTH = 8
+
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_curve_counts_every_stage_of_the_plan(name):
+    golden = ALGORITHMS.stage_plan(name, BIT_WIDTH)
+    expected = sum(len(stage["patterns"]) for stage in golden["stages"].values())
+
+    accumulator = CoverageAccumulator()
+    main_engine(BIT_WIDTH, ALGORITHMS[name](BIT_WIDTH), silent=True, accumulator=accumulator,
+                fault_list=FaultSet.generate(BIT_WIDTH))
+    assert accumulator.curve() == accumulator.curve(golden)
+    assert accumulator.curve()[-1]["patterns"] == expected
+
+    streamed = CoverageAccumulator()
+    streaming_engine(BIT_WIDTH, ALGORITHMS[name](BIT_WIDTH), silent=True, accumulator=streamed)
+    assert streamed.curve() == accumulator.curve(golden)
+
+
+def test_curve_without_a_stage_plan_is_refused():
+    accumulator = CoverageAccumulator()
+    accumulator.add("SAF", True, stage=1)
+    with pytest.raises(ValueError):
+        accumulator.curve()
@@ -0,0 +1,66 @@
+import pytest
+
+from algorithms import ALGORITHMS
+from main.adder_tree import adder_tree_engine, generate_tree_fault_list
+from main.bit_parallel_engine import bit_parallel_engine
+from main.coupling_engine import coupling_engine
+from main.fault_set import FaultSet
+from main.main_engine import generate_fault_list, iter_coupling_faults, main_engine
+from main.parallel_engine import parallel_engine
+from main.vectorized_engine import vectorized_engine
+
+BIT_WIDTH = 8
+
+
+def detections(fault_list):
+    return [
+        (f.detect_pattern["stage"], f.detect_pattern["fault_type"], f.detect_pattern["location"])
+        if f.detected else None
+        for f in fault_list
+    ]
+
+
+def run(engine, name, fault_list, **kwargs):
+    algo = ALGORITHMS[name](BIT_WIDTH)
+    coverage = engine(BIT_WIDTH, algo, verbose=False, fault_list=fault_list, **kwargs)
+    return coverage, algo.detected_faults, detections(fault_list)
+
+
+@pytest.mark.parametrize("engine", [vectorized_engine, bit_parallel_engine])
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_batch_engines_match_main_engine(engine, name):
+    expected = run(main_engine, name, generate_fault_list(BIT_WIDTH))
+    assert run(engine, name, generate_fault_list(BIT_WIDTH)) == expected
+
+
+@pytest.mark.parametrize("name", ["five_stage", "four_stage"])
+def test_coupling_engine_matches_main_engine(name):
+    _, counters, expected = run(main_engine, name, list(iter_coupling_faults(BIT_WIDTH)))
+    _, batch_counters, found = run(coupling_engine, name, list(iter_coupling_faults(BIT_WIDTH)))
+    assert (batch_counters, found) == (counters, expected)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_engine_matches_main_engine(workers):
+    fault_list = generate_fault_list(BIT_WIDTH, fault_mode="ALL")
+    expected = run(main_engine, "five_stage", generate_fault_list(BIT_WIDTH, fault_mode="ALL"))
+    assert run(parallel_engine, "five_stage", fault_list, workers=workers) == expected
+
+
+def test_parallel_engine_fault_set():
+    fault_list = generate_fault_list(BIT_WIDTH)
+    coverage = main_engine(BIT_WIDTH, ALGORITHMS["four_stage"](BIT_WIDTH), verbose=False, fault_list=fault_list)
+
+    fault_set = FaultSet.generate(BIT_WIDTH)
+    algo = ALGORITHMS["four_stage"](BIT_WIDTH)
+    assert parallel_engine(BIT_WIDTH, algo, silent=True, fault_list=fault_set, workers=2) == coverage
+    assert fault_set.detect_stage.tolist() == [f.detect_pattern["stage"] if f.detected else 0 for f in fault_list]
+
+
+def test_adder_tree_engine_silent_reports_levels(capsys):
+    fault_list = generate_tree_fault_list(BIT_WIDTH)
+    coverage = adder_tree_engine(BIT_WIDTH, ALGORITHMS["five_stage"](BIT_WIDTH), fault_list=fault_list, silent=True)
+
+    assert capsys.readouterr().out == ""
+    assert set(coverage) == {"total"} | {f"L{f.node[0]}" for f in fault_list}
+    assert coverage["total"] == sum(f.detected for f in fault_list) / len(fault_list)
@@ -0,0 +1,32 @@
+import main.fault_dictionary as fault_dictionary
+from algorithms import ALGORITHMS
+from main.fault_dictionary import FaultDictionary
+from main.main_engine import generate_fault_list, golden_stage_outputs
+
+BIT_WIDTH = 4
+
+
+def observed_sums(f, golden):
+    """Per-stage sums of a die carrying SAF / bridge fault f."""
+    return [list(golden_stage_outputs(f, golden["stages"][s], BIT_WIDTH)) for s in sorted(golden["stages"])]
+
+
+def test_colliding_hashes_keep_classes_apart(tmp_path, monkeypatch):
+    monkeypatch.setattr(fault_dictionary, "signature_hash", lambda key: 7)
+    algo = ALGORITHMS["five_stage"](BIT_WIDTH)
+    dictionary = FaultDictionary.build(algo, BIT_WIDTH)
+    assert len(dictionary) > 1
+
+    path = str(tmp_path / "dictionary.npz")
+    dictionary.save(path)
+    loaded = FaultDictionary.load(path)
+
+    fault_list = generate_fault_list(BIT_WIDTH)
+    observed = [observed_sums(f, dictionary.golden) for f in fault_list]
+    for d in (dictionary, loaded):
+        batch = d.diagnose_batch(observed)
+        for k, (obs, candidates) in enumerate(zip(observed, batch)):
+            single = d.candidate_indices(obs)
+            assert k in single.tolist()
+            assert candidates.tolist() == single.tolist()
+            assert len(single) < len(fault_list)
@@ -0,0 +1,29 @@
+import main.fault_injection
+import main.main_engine as engine_module
+from algorithms import ALGORITHMS
+from main.main_engine import main_engine
+from main.profiler import SimulationProfiler
+
+BIT_WIDTH = 8
+
+
+class GlobalCheckingProfiler(SimulationProfiler):
+    """Records whether the module-level inject_fault was swapped during the run."""
+
+    def counted(self, name, fn):
+        wrapper = super().counted(name, fn)
+        self.rebound = []
+
+        def checked(*args, **kwargs):
+            self.rebound.append(engine_module.inject_fault is not main.fault_injection.inject_fault)
+            return wrapper(*args, **kwargs)
+
+        return checked
+
+
+def test_profiler_counts_without_rebinding_inject_fault():
+    profiler = GlobalCheckingProfiler(progress_interval=0)
+    main_engine(BIT_WIDTH, ALGORITHMS["five_stage"](BIT_WIDTH), silent=True, profiler=profiler)
+
+    assert profiler.calls["inject_fault"] == len(profiler.rebound) > 0
+    assert not any(profiler.rebound)
@@ -0,0 +1,28 @@
+from main.fault_classes import Fault
+from main.fault_set import FaultSet
+from main.result_writer import ResultWriter, load_results
+
+
+def tree_fault(location):
+    f = Fault("TREE", forced_value=1, node=(2, 3), node_bit=5)
+    f.detected = True
+    f.detect_pattern = {"stage": 1, "fault_type": "TREE_SA1", "location": location}
+    return f
+
+
+def test_long_strings_are_kept(tmp_path):
+    locations = ["", "L" * 300, "short"]
+    npy = str(tmp_path / "results.npy")
+    with ResultWriter(str(tmp_path / "results.csv"), npy, chunk_size=2) as writer:
+        writer.extend(tree_fault(location) for location in locations)
+
+    records = load_results(npy)
+    assert records.dtype["location"].itemsize == 300
+    assert [x.decode() for x in records["location"]] == locations
+    assert [x.decode() for x in records["fault_type"]] == ["TREE_SA1"] * 3
+
+
+def test_tree_faults_round_trip_through_fault_set():
+    f = FaultSet.from_faults([tree_fault("L0")]).to_faults()[0]
+    assert (f.fault_type, f.node, f.node_bit, f.forced_value) == ("TREE", (2, 3), 5, 1)
+    assert f.detect_pattern == {"stage": 1}
@@ -0,0 +1,21 @@
+import pytest
+
+from algorithms import ALGORITHMS
+from main.shared_universe import shared_engine
+
+BIT_WIDTH = 8
+
+
+def test_reopen_same_campaign_skips_done_faults(tmp_path):
+    path = str(tmp_path / "universe")
+    first = shared_engine(BIT_WIDTH, ALGORITHMS["five_stage"](BIT_WIDTH), path, verbose=False, workers=1)
+    again = shared_engine(BIT_WIDTH, ALGORITHMS["five_stage"](BIT_WIDTH), path, verbose=False, workers=1)
+    assert again == first
+
+
+@pytest.mark.parametrize("name, bit_width", [("majority_based", BIT_WIDTH), ("five_stage", 16)])
+def test_reopen_other_campaign_raises(tmp_path, name, bit_width):
+    path = str(tmp_path / "universe")
+    shared_engine(BIT_WIDTH, ALGORITHMS["five_stage"](BIT_WIDTH), path, verbose=False, workers=1)
+    with pytest.raises(ValueError):
+        shared_engine(bit_width, ALGORITHMS[name](bit_width), path, verbose=False, workers=1)
@@ -0,0 +1,77 @@
+# utils/bit_ops.py
+#
+# numpy is imported by the array helpers only, so the scalar helpers (and
+# the golden cache / main_engine built on them) load without it.
+
+
+def bits_to_int(bits):
+    """
+    Weighted value of an LSB-first bit vector (bit i carries 2^i),
+    same convention as main_engine's row_value().
+    """
+    return sum(b << i for i, b in enumerate(bits))
+
+
+def sum_dtype(bit_width, num_terms=2):
+    """
+    NumPy dtype able to hold a sum of `num_terms` bit_width-bit values.
+
+    int64 while the sum cannot overflow, otherwise object (Python ints),
+    which keeps 64-bit weights exact at the cost of some speed.
+    """
+    import numpy as np
+
+    if bit_width + max(num_terms - 1, 0).bit_length() <= 62:
+        return np.int64
+    return object
+
+
+_BYTE_POPCOUNT = None
+
+
+def popcount(values):
+    """
+    Number of set bits of every (non-negative) entry of an integer array.
+
+    np.bitwise_count where NumPy has it (>= 2.0), otherwise a per-byte
+    lookup table.
+    """
+    import numpy as np
+
+    global _BYTE_POPCOUNT
+
+    values = np.asarray(values)
+    if values.dtype == object:
+        return np.array([bin(v).count("1") for v in values.tolist()], dtype=np.int64).reshape(values.shape)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.int64)
+
+    if _BYTE_POPCOUNT is None:
+        _BYTE_POPCOUNT = np.array([bin(b).count("1") for b in range(256)], dtype=np.int64)
+    as_bytes = np.ascontiguousarray(values).view(np.uint8).reshape(values.shape + (values.dtype.itemsize,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1)
+
+
+def bit_length(values):
+    """int.bit_length() of every (non-negative) entry of an integer array."""
+    import numpy as np
+
+    values = np.asarray(values)
+    if values.dtype == object:
+        return np.array([v.bit_length() for v in values.tolist()], dtype=np.int64).reshape(values.shape)
+
+    length = np.zeros(values.shape, dtype=np.int64)
+    rest = values.astype(np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = rest >= (1 << shift)
+        rest = np.where(big, rest >> shift, rest)
+        length += shift * big
+    return length + (rest > 0)
+
+
+_BIT_CHARS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def int_to_bits(value, bit_width):
+    """LSB-first bit vector of a non-negative bit_width-bit integer (inverse of bits_to_int)."""
+    return list(f"{value:0{bit_width}b}"[::-1].encode().translate(_BIT_CHARS))
@@ -1,4 +1,4 @@
 from .base_patterns import all_one, all_zero
 from .clear_one_patterns import clear_one, explicit_last_zero
 from .one_hot_patterns import one_hot
-from .generator import WeightPatternGenerator
+from .generator import WeightPatternGenerator, PATTERN_GROUPS, DEFAULT_GROUPS, iter_group
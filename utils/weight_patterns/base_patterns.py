@@ -5,3 +5,11 @@ def all_zero(bit_width):
 
 def all_one(bit_width):
     return [[1] * bit_width]
+
+
+# Lazy forms: packed LSB-first words (bit i = 2^i), see generator.PATTERN_GROUPS
+def iter_all_zero(bit_width):
+    yield 0
+
+def iter_all_one(bit_width):
+    yield (1 << bit_width) - 1
@@ -0,0 +1,11 @@
+# utils/weight_patterns/checkerboard_patterns.py
+
+def iter_checkerboard(bit_width):
+    """
+    Alternating bits and their inverse:
+      bit_width=4 → 1010, 0101
+    """
+    full = (1 << bit_width) - 1
+    even = int("01" * bit_width, 2) & full      # bits 0, 2, 4, ...
+    yield even
+    yield full ^ even
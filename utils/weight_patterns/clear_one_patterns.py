@@ -20,3 +20,15 @@ def explicit_last_zero(bit_width):
     arr = [1] * bit_width
     arr[-1] = 0
     return [arr]
+
+
+def iter_clear_one(bit_width):
+    """Lazy clear_one as packed words: all-ones with bit i cleared."""
+    full = (1 << bit_width) - 1
+    for i in range(bit_width):
+        yield full ^ (1 << i)
+
+
+def iter_explicit_last_zero(bit_width):
+    """Lazy explicit_last_zero as a packed word (last list position = bit bit_width-1)."""
+    yield ((1 << bit_width) - 1) ^ (1 << (bit_width - 1))
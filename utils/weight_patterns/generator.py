@@ -1,29 +1,75 @@
+from config.config import PATTERN_MEMO_LIMIT
+from utils.bit_ops import int_to_bits
+from .base_patterns import iter_all_zero, iter_all_one
+from .one_hot_patterns import iter_one_hot
+from .clear_one_patterns import iter_clear_one, iter_explicit_last_zero
+from .checkerboard_patterns import iter_checkerboard
+from .march_patterns import iter_march
+from .walking_patterns import iter_walking_pairs
+from .random_patterns import iter_random
 
-from .base_patterns import all_zero, all_one
-from .one_hot_patterns import one_hot
-from .clear_one_patterns import clear_one, explicit_last_zero
+# Pattern groups: name -> fn(bit_width) yielding packed LSB-first words
+PATTERN_GROUPS = {
+    "all_zero": iter_all_zero,
+    "all_one": iter_all_one,
+    "one_hot": iter_one_hot,
+    "clear_one": iter_clear_one,
+    "explicit_last_zero": iter_explicit_last_zero,
+    "checkerboard": iter_checkerboard,
+    "march": iter_march,
+    "walking_pairs": iter_walking_pairs,
+    "random": iter_random,
+}
+
+# Groups enabled when none are given
+DEFAULT_GROUPS = ("all_zero", "all_one", "one_hot", "clear_one", "explicit_last_zero")
+
+_memo = {}      # (group, bit_width) -> tuple of words
+
+
+def iter_group(group, bit_width):
+    """
+    Words of one group. A group of at most PATTERN_MEMO_LIMIT words is
+    kept after its first full pass and replayed from memory afterwards;
+    larger groups are regenerated on every pass.
+    """
+    key = (group, bit_width)
+    if key in _memo:
+        yield from _memo[key]
+        return
+
+    words = []
+    for word in PATTERN_GROUPS[group](bit_width):
+        if words is not None:
+            words.append(word)
+            if len(words) > PATTERN_MEMO_LIMIT:
+                words = None
+        yield word
+
+    if words is not None:
+        _memo[key] = tuple(words)
 
 
 class WeightPatternGenerator:
     """
     Modular directed pattern generator for flexible bit_width.
     Each pattern group is isolated into its own module.
+
+    Groups are iterated lazily and deduplicated on their packed integer
+    words, so patterns can be streamed (iter_values / iteration) without
+    holding them all; generate() still returns the full list.
     """
 
     def __init__(self, bit_width, enable_groups=None):
         self.bit_width = bit_width
 
         # Available groups
-        self.available_groups = {
-            "all_zero": all_zero,
-            "all_one": all_one,
-            "one_hot": one_hot,
-            "clear_one": clear_one,
-            "explicit_last_zero": explicit_last_zero,
-        }
+        self.available_groups = PATTERN_GROUPS
 
-        # Default: enable all groups
-        self.enabled = enable_groups or list(self.available_groups.keys())
+        self.enabled = list(enable_groups or DEFAULT_GROUPS)
+        for group in self.enabled:
+            if group not in self.available_groups:
+                raise ValueError(f"Pattern group '{group}' not found.")
 
     def enable(self, group):
         if group not in self.available_groups:
@@ -34,18 +80,19 @@ class WeightPatternGenerator:
         if group in self.enabled:
             self.enabled.remove(group)
 
-    def generate(self):
-        patterns = []
-
+    def iter_values(self):
+        """Distinct packed words of the enabled groups, in group order."""
+        seen = set()
         for group_name in self.enabled:
-            generator_fn = self.available_groups[group_name]
-            group_patterns = generator_fn(self.bit_width)
-            patterns.extend(group_patterns)
+            for word in iter_group(group_name, self.bit_width):
+                if word not in seen:
+                    seen.add(word)
+                    yield word
 
-        # Remove duplicates while preserving order
-        unique = []
-        for p in patterns:
-            if p not in unique:
-                unique.append(p)
+    def __iter__(self):
+        """Distinct patterns as LSB-first bit lists."""
+        for word in self.iter_values():
+            yield int_to_bits(word, self.bit_width)
 
-        return unique
+    def generate(self):
+        return list(self)
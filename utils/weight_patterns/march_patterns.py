@@ -0,0 +1,15 @@
+# utils/weight_patterns/march_patterns.py
+
+def iter_march(bit_width):
+    """
+    March-style fill and drain, one write per element:
+      fill   1000, 1100, 1110, 1111
+      drain  0111, 0011, 0001, 0000
+    (bit 0 first, as the list patterns). Every bit sees a 0->1 and a 1->0 transition with its
+    neighbours in both states.
+    """
+    full = (1 << bit_width) - 1
+    for i in range(1, bit_width + 1):
+        yield (1 << i) - 1
+    for i in range(1, bit_width + 1):
+        yield full ^ ((1 << i) - 1)
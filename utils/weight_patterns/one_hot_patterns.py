@@ -7,3 +7,9 @@ def one_hot(bit_width):
         arr[i] = 1
         patterns.append(arr)
     return patterns
+
+
+def iter_one_hot(bit_width):
+    """Lazy one_hot as packed words: 1 << i."""
+    for i in range(bit_width):
+        yield 1 << i
@@ -0,0 +1,11 @@
+# utils/weight_patterns/random_patterns.py
+import random
+
+from config.config import RANDOM_SEED, RANDOM_PATTERN_COUNT
+
+
+def iter_random(bit_width, count=RANDOM_PATTERN_COUNT, seed=RANDOM_SEED):
+    """`count` uniformly random words, reproducible when seed is set."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield rng.getrandbits(bit_width)
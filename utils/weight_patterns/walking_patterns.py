@@ -0,0 +1,13 @@
+# utils/weight_patterns/walking_patterns.py
+
+def iter_walking_pairs(bit_width):
+    """
+    Two adjacent ones walked across a zero background, then two adjacent
+    zeros walked across a one background:
+      bit_width=4 → 1100, 0110, 0011, 0011, 1001, 1100
+    """
+    full = (1 << bit_width) - 1
+    for i in range(bit_width - 1):
+        yield 0b11 << i
+    for i in range(bit_width - 1):
+        yield full ^ (0b11 << i)